@@ -1,38 +1,80 @@
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import Cookie, Depends, HTTPException, status
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.metrics import JWT_DECODE_SECONDS
 from app.models import User
+from app.tracing import span
+from .principal import Principal, principal_cache
+from .revocation import token_denylist
 from .security import JWTSettings, decode_token
-from ..db import get_session
+from ..db import get_async_session, get_read_session
 
 
+# Trust email/role claims signed into the access token instead of looking them up.
+# Role and email changes then only take effect when the token is next refreshed.
+TRUST_TOKEN_CLAIMS = os.getenv("PRINCIPAL_FROM_CLAIMS", "false").lower() in ("1", "true", "yes")
+
+
+@lru_cache(maxsize=1)
 def get_jwt_settings() -> JWTSettings:
-    secret = os.getenv("JWT_SECRET", "dev-secret")
-    return JWTSettings(secret_key=secret)
+    return JWTSettings.from_env()
 
 
-def get_current_user(
-    session: Session = Depends(get_session),
-    settings: JWTSettings = Depends(get_jwt_settings),
-    access_token: Optional[str] = Cookie(default=None, alias="access_token"),
-):
+async def load_principal(session: AsyncSession, user_id: str) -> Optional[Principal]:
+    """The user's principal from the cache, or from the database on a miss; ``None`` if the user is gone."""
+    principal = await principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    row = (
+        await session.execute(select(User.id, User.email, User.role).where(User.id == user_id))
+    ).one_or_none()
+    if not row:
+        return None
+    principal = Principal(id=str(row.id), email=row.email, role=row.role)
+    await principal_cache.set(principal)
+    return principal
+
+
+async def _authenticate(session: AsyncSession, settings: JWTSettings, access_token: Optional[str]) -> Principal:
     if not access_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
-    payload = decode_token(settings, access_token)
+    with span("jwt_decode", JWT_DECODE_SECONDS.observe):
+        payload = decode_token(settings, access_token)
     if not payload or payload.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if token_denylist.is_revoked(payload):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token revoked")
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    user = session.execute(select(User).where(User.id == user_id)).scalar_one_or_none()
-    if not user:
+    if TRUST_TOKEN_CLAIMS and "email" in payload and "role" in payload:
+        return Principal(id=user_id, email=payload["email"], role=payload["role"])
+
+    principal = await load_principal(session, user_id)
+    if principal is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    return principal
 
 
+async def get_current_user(
+    session: AsyncSession = Depends(get_async_session),
+    settings: JWTSettings = Depends(get_jwt_settings),
+    access_token: Optional[str] = Cookie(default=None, alias="access_token"),
+) -> Principal:
+    return await _authenticate(session, settings, access_token)
+
+
+async def get_current_reader(
+    session: AsyncSession = Depends(get_read_session),
+    settings: JWTSettings = Depends(get_jwt_settings),
+    access_token: Optional[str] = Cookie(default=None, alias="access_token"),
+) -> Principal:
+    """``get_current_user`` for read-only routes: a principal cache miss is looked up on a replica."""
+    return await _authenticate(session, settings, access_token)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from app.metrics import Histogram
+from app.tracing import record_span
+from . import security
+
+
+# Upper bounds (seconds) of the hash latency histogram
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class HashPoolMetrics:
+    def __init__(self) -> None:
+        self.queue_depth = 0
+        self.rejected = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "latency_seconds": self.latency.snapshot(),
+        }
+
+
+class HashPool:
+    """Process pool for bcrypt work with a bounded admission queue.
+
+    At most ``workers + max_queue`` hashes are in flight; anything beyond
+    that is rejected with 503 instead of queueing behind the burst.
+    """
+
+    def __init__(self, *, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.metrics = HashPoolMetrics()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=security.warm_password_backend,
+            )
+        return self._executor
+
+    def warm(self) -> None:
+        """Spawn the workers now, in the background, instead of on the first logins."""
+        executor = self.start()
+        for _ in range(self.workers):
+            executor.submit(time.sleep, 0)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.metrics.queue_depth >= self.workers + self.max_queue:
+            self.metrics.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Password hashing is overloaded, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+        executor = self.start()
+        self.metrics.queue_depth += 1
+        wall, started = time.time(), time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            seconds = time.perf_counter() - started
+            self.metrics.queue_depth -= 1
+            self.metrics.latency.observe(seconds)
+            record_span(fn.__name__, wall, seconds)
+
+
+def _pool_workers() -> int:
+    return int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+
+
+def _pool_max_queue() -> int:
+    return int(os.getenv("PASSWORD_HASH_MAX_QUEUE", str(_pool_workers() * 4)))
+
+
+hash_pool = HashPool(workers=_pool_workers(), max_queue=_pool_max_queue())
+
+
+async def hash_password_async(password: str) -> str:
+    return await hash_pool.run(security.hash_password, password)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await hash_pool.run(security.verify_password, password, password_hash)
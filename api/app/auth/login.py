@@ -1,11 +1,14 @@
+from uuid import UUID, uuid4
+
 from pydantic import BaseModel, EmailStr
-from fastapi import APIRouter, Depends, HTTPException, Response, status, Request
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status, Request
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User
-from app.db import get_session
-from .security import JWTSettings, create_access_token, create_refresh_token, verify_password
+from app.db import AsyncSessionLocal, get_async_session
+from .security import JWTSettings, create_session_tokens, needs_rehash
+from .hashing import hash_password_async, verify_password_async
 from .deps import get_jwt_settings
 from .ratelimit import limiter
 
@@ -18,25 +21,43 @@ class LoginBody(BaseModel):
     password: str
 
 
+async def _rehash_password(user_id: UUID, password: str, old_hash: str) -> None:
+    try:
+        new_hash = await hash_password_async(password)
+    except HTTPException:
+        # Pool is saturated; the next login will try again
+        return
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(User)
+            .where(User.id == user_id, User.password_hash == old_hash)
+            .values(password_hash=new_hash)
+        )
+        await session.commit()
+
+
 @router.post("/login")
 @limiter.limit("5/minute")
-def login(
+async def login(
     request: Request,
     body: LoginBody,
     response: Response,
-    session: Session = Depends(get_session),
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session),
     settings: JWTSettings = Depends(get_jwt_settings),
 ):
-    user = session.execute(select(User).where(User.email.ilike(body.email))).scalar_one_or_none()
-    if not user or not verify_password(body.password, user.password_hash):
+    user = (await session.execute(select(User).where(User.email.ilike(body.email)))).scalar_one_or_none()
+    if not user or not await verify_password_async(body.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    access = create_access_token(settings, str(user.id))
-    refresh = create_refresh_token(settings, str(user.id))
+    if needs_rehash(user.password_hash):
+        background_tasks.add_task(_rehash_password, user.id, body.password, user.password_hash)
+    # Every token from this login, refreshed ones included, carries the session id so logout can revoke them all
+    access, refresh = create_session_tokens(
+        settings, str(user.id), email=user.email, role=user.role, session_id=str(uuid4())
+    )
     # HttpOnly cookies
     # In Codespaces (https), cookies must be Secure and SameSite=None for cross-site
     secure = True
     response.set_cookie("access_token", access, httponly=True, samesite="none", secure=secure)
     response.set_cookie("refresh_token", refresh, httponly=True, samesite="none", secure=secure)
     return {"ok": True}
-
-
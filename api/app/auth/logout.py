@@ -1,13 +1,44 @@
-from fastapi import APIRouter, Response, status
+import time
+from typing import Dict, Optional, Tuple
+
+from fastapi import APIRouter, Cookie, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from .security import JWTSettings, decode_token
+from .deps import get_jwt_settings
+from .revocation import revoke, token_denylist
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-def logout(response: Response):
+async def logout(
+    response: Response,
+    session: AsyncSession = Depends(get_async_session),
+    settings: JWTSettings = Depends(get_jwt_settings),
+    access_token: Optional[str] = Cookie(default=None, alias="access_token"),
+    refresh_token: Optional[str] = Cookie(default=None, alias="refresh_token"),
+):
+    # Revoke the session when the tokens name one, which also covers tokens refreshed from it
+    revocations: Dict[str, Tuple[str, str, float]] = {}
+    session_expires = time.time() + settings.refresh_token_expire_days * 86400
+    for token in filter(None, (access_token, refresh_token)):
+        payload = decode_token(settings, token)
+        if not payload or not payload.get("sub"):
+            continue
+        if payload.get("sid"):
+            revocations[payload["sid"]] = ("session", payload["sub"], session_expires)
+        elif payload.get("jti"):
+            revocations[payload["jti"]] = ("token", payload["sub"], payload["exp"])
+    if revocations:
+        for revoked_id, (kind, user_id, expires_at) in revocations.items():
+            await revoke(session, revoked_id, kind=kind, user_id=user_id, expires_at=expires_at)
+        await session.commit()
+        for revoked_id, (_, _, expires_at) in revocations.items():
+            token_denylist.add(revoked_id, expires_at)
+
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
     return Response(status_code=status.HTTP_204_NO_CONTENT)
-
-
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends
 
-from .deps import get_current_user
+from .deps import get_current_reader
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.get("/me")
-def me(user = Depends(get_current_user)):
+async def me(user = Depends(get_current_reader)):
     return {"id": str(user.id), "email": user.email, "role": user.role}
 
 
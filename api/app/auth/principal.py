@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional
+
+from app.cache import CacheBackend, InMemoryBackend, RedisBackend, TTLCache
+
+
+class Principal:
+    """The authenticated caller: just the user columns auth needs, no ORM state."""
+
+    __slots__ = ("id", "email", "role")
+
+    def __init__(self, *, id: str, email: str, role: str) -> None:
+        self.id = id
+        self.email = email
+        self.role = role
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "email": self.email, "role": self.role}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Principal":
+        return cls(id=data["id"], email=data["email"], role=data["role"])
+
+
+class PrincipalCache:
+    """Two-tier principal lookup cache keyed by user id.
+
+    The local tier absorbs repeat requests inside one worker; the optional
+    shared tier lets workers reuse each other's lookups. Writers that change
+    a user's email or role, or delete the user, must call ``invalidate``.
+    """
+
+    def __init__(
+        self,
+        *,
+        local_ttl: float,
+        local_maxsize: int,
+        shared: Optional[CacheBackend] = None,
+        shared_ttl: float = 300.0,
+    ) -> None:
+        self.enabled = local_ttl > 0
+        self.local = TTLCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"principal:{user_id}"
+
+    async def get(self, user_id: str) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+        principal = self.local.get(user_id)
+        if principal is not None:
+            return principal
+        if self.shared is not None:
+            data = await self.shared.get(self._key(user_id))
+            if data is not None:
+                self.shared_hits += 1
+                principal = Principal.from_dict(data)
+                self.local.set(user_id, principal)
+                return principal
+        self.misses += 1
+        return None
+
+    async def set(self, principal: Principal) -> None:
+        if not self.enabled:
+            return
+        self.local.set(principal.id, principal)
+        if self.shared is not None:
+            await self.shared.set(self._key(principal.id), principal.to_dict(), self.shared_ttl)
+
+    async def invalidate(self, user_id: str) -> None:
+        self.local.delete(str(user_id))
+        if self.shared is not None:
+            await self.shared.delete(self._key(str(user_id)))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "local_hits": self.local.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "local_size": len(self.local),
+        }
+
+
+def _shared_backend() -> Optional[CacheBackend]:
+    backend = os.getenv("PRINCIPAL_CACHE_BACKEND", "none")
+    if backend == "redis":
+        return RedisBackend(os.getenv("REDIS_URL", "redis://redis:6379"))
+    if backend == "memory":
+        return InMemoryBackend()
+    return None
+
+
+principal_cache = PrincipalCache(
+    local_ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", "30")),
+    local_maxsize=int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000")),
+    shared=_shared_backend(),
+    shared_ttl=float(os.getenv("PRINCIPAL_CACHE_SHARED_TTL", "300")),
+)
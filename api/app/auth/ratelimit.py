@@ -1,7 +1,32 @@
+import os
+
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 
-limiter = Limiter(key_func=get_remote_address)
+# memory:// keeps counters per process, so with several workers each one enforces its own limit.
+# Point RATELIMIT_STORAGE_URI at Redis (redis://host:6379/0) to share them; the moving-window
+# strategy is then checked and counted atomically by one Lua script, a single round trip per hit.
+RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
+RATELIMIT_STRATEGY = os.getenv("RATELIMIT_STRATEGY", "moving-window")
+# Load tests turn limits off; they would otherwise cap login and refresh at 5/minute per client
+RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+
+def build_limiter(
+    *,
+    storage_uri: str = RATELIMIT_STORAGE_URI,
+    strategy: str = RATELIMIT_STRATEGY,
+    enabled: bool = RATELIMIT_ENABLED,
+) -> Limiter:
+    return Limiter(
+        key_func=get_remote_address,
+        storage_uri=storage_uri,
+        strategy=strategy,
+        enabled=enabled,
+        # If the shared store is unreachable, fall back to per-process limits rather than failing requests
+        in_memory_fallback_enabled=not storage_uri.startswith("memory://"),
+    )
 
 
+limiter = build_limiter()
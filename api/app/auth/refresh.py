@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import time
 from typing import Optional
 
 from fastapi import APIRouter, Cookie, Depends, HTTPException, Response, status, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from .security import JWTSettings, create_access_token, decode_token
-from .deps import get_jwt_settings
+from app.db import get_async_session
+from .security import JWTSettings, create_session_tokens, decode_token
+from .deps import get_jwt_settings, load_principal
 from .ratelimit import limiter
+from .revocation import revoke, token_denylist
 
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -14,22 +18,48 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/refresh")
 @limiter.limit("5/minute")
-def refresh(
+async def refresh(
     request: Request,
     response: Response,
+    session: AsyncSession = Depends(get_async_session),
     settings: JWTSettings = Depends(get_jwt_settings),
     refresh_token: Optional[str] = Cookie(default=None, alias="refresh_token"),
 ):
     if not refresh_token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing refresh token")
     payload = decode_token(settings, refresh_token)
-    if not payload or payload.get("type") != "refresh":
+    # Tokens without a jti or sid predate rotation and can't be revoked, so they must log in again
+    if not payload or payload.get("type") != "refresh" or not payload.get("jti") or not payload.get("sid"):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
     subject = payload.get("sub")
     if not subject:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    new_access = create_access_token(settings, subject)
-    response.set_cookie("access_token", new_access, httponly=True, samesite="none", secure=True)
-    return {"ok": True}
+    session_id = payload["sid"]
+    if token_denylist.is_revoked({"sid": session_id}):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token revoked")
 
+    # Each refresh token is good for one rotation. A jti already in the denylist was rotated
+    # before; otherwise the insert decides, across all workers
+    reused = token_denylist.is_revoked({"jti": payload["jti"]}) or not await revoke(
+        session, payload["jti"], kind="token", user_id=subject, expires_at=payload["exp"]
+    )
+    if reused:
+        # A used token came back: whoever holds the newer one may not be the user, so end the whole session
+        session_expires = time.time() + settings.refresh_token_expire_days * 86400
+        await revoke(session, session_id, kind="session", user_id=subject, expires_at=session_expires)
+        await session.commit()
+        token_denylist.add(session_id, session_expires)
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token reuse detected")
+    # Same claims as at login, so PRINCIPAL_FROM_CLAIMS keeps working after a refresh
+    principal = await load_principal(session, subject)
+    if principal is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    await session.commit()
+    token_denylist.add(payload["jti"], payload["exp"])
 
+    new_access, new_refresh = create_session_tokens(
+        settings, subject, email=principal.email, role=principal.role, session_id=session_id
+    )
+    response.set_cookie("access_token", new_access, httponly=True, samesite="none", secure=True)
+    response.set_cookie("refresh_token", new_refresh, httponly=True, samesite="none", secure=True)
+    return {"ok": True}
@@ -1,11 +1,14 @@
+from uuid import uuid4
+
 from pydantic import BaseModel, EmailStr, Field
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User, RoleEnum
-from app.db import get_session
-from .security import hash_password
+from app.db import get_async_session
+from .hashing import hash_password_async
 from .ratelimit import limiter
 
 
@@ -19,13 +22,19 @@ class RegisterBody(BaseModel):
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
 @limiter.limit("5/minute")
-def register(request: Request, body: RegisterBody, session: Session = Depends(get_session)):
-    existing = session.execute(select(User).where(User.email.ilike(body.email))).scalar_one_or_none()
-    if existing:
+async def register(request: Request, body: RegisterBody, session: AsyncSession = Depends(get_async_session)):
+    password_hash = await hash_password_async(body.password)
+    # One round trip: users_email_unique_ci on lower(email) decides whether the address is taken
+    user_id = (
+        await session.execute(
+            insert(User)
+            .values(id=uuid4(), email=body.email, password_hash=password_hash, role=RoleEnum.USER)
+            .on_conflict_do_nothing(index_elements=[func.lower(User.email)])
+            .returning(User.id)
+        )
+    ).scalar_one_or_none()
+    if user_id is None:
+        await session.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already in use")
-    user = User(email=body.email, password_hash=hash_password(body.password), role=RoleEnum.USER)
-    session.add(user)
-    session.commit()
-    return {"id": str(user.id), "email": user.email, "role": user.role}
-
-
+    await session.commit()
+    return {"id": str(user_id), "email": body.email, "role": RoleEnum.USER}
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import AsyncSessionLocal
+from app.metrics import REVOKED_TOKENS
+from app.models import RevokedToken
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenDenylist:
+    """Revoked token (``jti``) and session (``sid``) ids, kept in memory until they expire.
+
+    ``is_revoked`` is at most two dict lookups, so every authenticated request
+    can be checked without a query. The ``revoked_tokens`` table is the source
+    of truth; ``RevocationSync`` copies new rows in, and ``prune`` drops ids
+    once nothing carrying them can still pass signature and ``exp`` checks.
+    """
+
+    def __init__(self) -> None:
+        self._expires: Dict[str, float] = {}
+        self._expiry: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def add(self, revoked_id: str, expires_at: float) -> None:
+        if expires_at <= time.time() or self._expires.get(revoked_id, 0.0) >= expires_at:
+            return
+        self._expires[revoked_id] = expires_at
+        heapq.heappush(self._expiry, (expires_at, revoked_id))
+
+    def is_revoked(self, payload: Mapping[str, Any]) -> bool:
+        jti = payload.get("jti")
+        sid = payload.get("sid")
+        return (jti is not None and jti in self._expires) or (sid is not None and sid in self._expires)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        pruned = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, revoked_id = heapq.heappop(self._expiry)
+            # A later add for the same id left a newer heap entry behind
+            if self._expires.get(revoked_id) == expires_at:
+                del self._expires[revoked_id]
+                pruned += 1
+        return pruned
+
+
+async def revoke(
+    session: AsyncSession, revoked_id: str, *, kind: str, user_id: Optional[str], expires_at: float
+) -> bool:
+    """Record a revocation in ``session``; False if ``revoked_id`` was already revoked.
+
+    Callers add the id to ``token_denylist`` once the transaction commits.
+    """
+    inserted = await session.execute(
+        insert(RevokedToken)
+        .values(
+            id=revoked_id,
+            kind=kind,
+            user_id=user_id,
+            expires_at=datetime.fromtimestamp(expires_at, timezone.utc),
+        )
+        .on_conflict_do_nothing(index_elements=[RevokedToken.id])
+        .returning(RevokedToken.id)
+    )
+    return inserted.scalar_one_or_none() is not None
+
+
+class RevocationSync:
+    """Copies ``revoked_tokens`` into a denylist every ``interval`` seconds.
+
+    The first pass loads every live row; later passes read only rows revoked
+    since the previous pass, less ``overlap`` seconds so revocations whose
+    transaction committed late are not missed. Every ``purge_interval``
+    seconds expired rows are deleted, ``purge_batch`` at a time.
+    """
+
+    def __init__(
+        self,
+        denylist: TokenDenylist,
+        *,
+        interval: float,
+        overlap: float,
+        purge_interval: float,
+        purge_batch: int,
+    ) -> None:
+        self.denylist = denylist
+        self.interval = interval
+        self.overlap = timedelta(seconds=overlap)
+        self.purge_interval = purge_interval
+        self.purge_batch = purge_batch
+        self._since: Optional[datetime] = None
+        self._purged_at = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    async def sync(self) -> int:
+        """Pull new revocations into the denylist; returns how many rows were read."""
+        async with AsyncSessionLocal() as session:
+            # now() is fixed for the transaction, so it matches the snapshot the rows come from
+            synced_at = (await session.execute(text("SELECT now()"))).scalar_one()
+            query = "SELECT id, expires_at FROM revoked_tokens WHERE expires_at > now()"
+            if self._since is not None:
+                query += " AND revoked_at > :since"
+            rows = (await session.execute(text(query), {"since": self._since})).all()
+        for row in rows:
+            self.denylist.add(str(row.id), row.expires_at.timestamp())
+        self._since = synced_at - self.overlap
+        self.denylist.prune()
+        REVOKED_TOKENS.set(len(self.denylist))
+        return len(rows)
+
+    async def purge(self) -> int:
+        async with AsyncSessionLocal() as session:
+            deleted = await session.execute(
+                text(
+                    "DELETE FROM revoked_tokens WHERE id IN ("
+                    " SELECT id FROM revoked_tokens WHERE expires_at < now()"
+                    " ORDER BY expires_at LIMIT :limit FOR UPDATE SKIP LOCKED)"
+                ),
+                {"limit": self.purge_batch},
+            )
+            await session.commit()
+        return deleted.rowcount
+
+    async def refresh(self) -> None:
+        try:
+            await self.sync()
+            if time.monotonic() - self._purged_at >= self.purge_interval:
+                while await self.purge() == self.purge_batch:
+                    pass
+                self._purged_at = time.monotonic()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Anything escaping here would end the sync loop and freeze this worker's denylist
+            logger.exception("Syncing revoked tokens failed")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.refresh()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+token_denylist = TokenDenylist()
+revocation_sync = RevocationSync(
+    token_denylist,
+    interval=float(os.getenv("REVOCATION_SYNC_INTERVAL", "1")),
+    overlap=float(os.getenv("REVOCATION_SYNC_OVERLAP", "10")),
+    purge_interval=float(os.getenv("REVOCATION_PURGE_INTERVAL", "300")),
+    purge_batch=int(os.getenv("REVOCATION_PURGE_BATCH", "1000")),
+)
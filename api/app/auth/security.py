@@ -1,16 +1,107 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Protocol, Tuple
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from app.cache import TTLCache
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+_pwd_context: Any = None
+
+
+def get_pwd_context() -> Any:
+    """The bcrypt CryptContext, built on first use rather than at import."""
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+
+def warm_password_backend() -> None:
+    # passlib picks and self-tests the bcrypt backend on first use; pay for it at startup
+    get_pwd_context().handler().get_backend()
+
+
+class JWTBackend(Protocol):
+    def encode(self, payload: Dict[str, Any], key: str, algorithm: str, kid: str) -> str: ...
+
+    def unverified_kid(self, token: str) -> Optional[str]: ...
+
+    def decode(self, token: str, key: str, algorithm: str) -> Optional[Dict[str, Any]]: ...
+
+
+class JoseBackend:
+    def __init__(self) -> None:
+        from jose import JWTError, jwt
+
+        self._jwt = jwt
+        self._error = JWTError
+
+    def encode(self, payload: Dict[str, Any], key: str, algorithm: str, kid: str) -> str:
+        return self._jwt.encode(payload, key, algorithm=algorithm, headers={"kid": kid})
+
+    def unverified_kid(self, token: str) -> Optional[str]:
+        try:
+            return self._jwt.get_unverified_header(token).get("kid")
+        except self._error as exc:
+            raise ValueError("malformed token") from exc
+
+    def decode(self, token: str, key: str, algorithm: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._error:
+            return None
+
+
+class PyJWTBackend:
+    """PyJWT-based backend; noticeably cheaper per call than python-jose for HMAC tokens."""
+
+    def __init__(self) -> None:
+        import jwt  # optional dependency, only needed when JWT_BACKEND=pyjwt
+
+        self._jwt = jwt
+
+    def encode(self, payload: Dict[str, Any], key: str, algorithm: str, kid: str) -> str:
+        return self._jwt.encode(payload, key, algorithm=algorithm, headers={"kid": kid})
+
+    def unverified_kid(self, token: str) -> Optional[str]:
+        try:
+            return self._jwt.get_unverified_header(token).get("kid")
+        except self._jwt.PyJWTError as exc:
+            raise ValueError("malformed token") from exc
+
+    def decode(self, token: str, key: str, algorithm: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._jwt.PyJWTError:
+            return None
+
+
+JWT_BACKENDS = {"jose": JoseBackend, "pyjwt": PyJWTBackend}
+
+
+def _parse_keys(raw: str) -> Dict[str, str]:
+    keys: Dict[str, str] = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        kid, _, secret = item.partition(":")
+        keys[kid] = secret
+    return keys
 
 
 class JWTSettings:
+    """Signing configuration, resolved once and shared for the process lifetime.
+
+    Tokens are signed with ``secret_key`` under ``kid``. ``verification_keys``
+    holds retired keys (kid -> secret) that are still accepted until the
+    tokens they signed expire, which is how keys are rotated.
+    """
+
     def __init__(
         self,
         *,
@@ -18,44 +109,104 @@ class JWTSettings:
         algorithm: str = "HS256",
         access_token_expire_minutes: int = 15,
         refresh_token_expire_days: int = 7,
+        kid: str = "default",
+        verification_keys: Optional[Dict[str, str]] = None,
+        backend: str = "jose",
+        token_cache_size: int = 10000,
     ) -> None:
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.access_token_expire_minutes = access_token_expire_minutes
         self.refresh_token_expire_days = refresh_token_expire_days
+        self.kid = kid
+        self.keys = {**(verification_keys or {}), kid: secret_key}
+        self.backend: JWTBackend = JWT_BACKENDS[backend]()
+        # Verified payloads keyed by token digest; each entry lives until the token's exp
+        self.token_cache = TTLCache(maxsize=token_cache_size, ttl=0)
+
+    @classmethod
+    def from_env(cls) -> "JWTSettings":
+        return cls(
+            secret_key=os.getenv("JWT_SECRET", "dev-secret"),
+            kid=os.getenv("JWT_KID", "default"),
+            verification_keys=_parse_keys(os.getenv("JWT_PREVIOUS_KEYS", "")),
+            backend=os.getenv("JWT_BACKEND", "jose"),
+            token_cache_size=int(os.getenv("JWT_CACHE_SIZE", "10000")),
+        )
+
+    def key_for(self, kid: Optional[str]) -> Optional[str]:
+        # Tokens issued before kids were introduced carry no header; they were signed with the active secret
+        if kid is None:
+            return self.secret_key
+        return self.keys.get(kid)
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    return get_pwd_context().verify(password, password_hash)
+
 
+def needs_rehash(password_hash: str) -> bool:
+    return get_pwd_context().needs_update(password_hash)
 
-def _create_token(settings: JWTSettings, subject: str, expires_delta: timedelta, token_type: str) -> str:
+
+def _create_token(
+    settings: JWTSettings,
+    subject: str,
+    expires_delta: timedelta,
+    token_type: str,
+    claims: Optional[Dict[str, Any]] = None,
+) -> str:
     now = datetime.now(timezone.utc)
     payload: Dict[str, Any] = {
+        **(claims or {}),
         "sub": subject,
         "iat": int(now.timestamp()),
         "exp": int((now + expires_delta).timestamp()),
         "type": token_type,
+        # Lets this one token be revoked
+        "jti": str(uuid.uuid4()),
     }
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+    return settings.backend.encode(payload, settings.secret_key, settings.algorithm, settings.kid)
+
 
+def create_access_token(settings: JWTSettings, subject: str, claims: Optional[Dict[str, Any]] = None) -> str:
+    return _create_token(settings, subject, timedelta(minutes=settings.access_token_expire_minutes), "access", claims)
 
-def create_access_token(settings: JWTSettings, subject: str) -> str:
-    return _create_token(settings, subject, timedelta(minutes=settings.access_token_expire_minutes), "access")
 
+def create_refresh_token(settings: JWTSettings, subject: str, claims: Optional[Dict[str, Any]] = None) -> str:
+    return _create_token(settings, subject, timedelta(days=settings.refresh_token_expire_days), "refresh", claims)
 
-def create_refresh_token(settings: JWTSettings, subject: str) -> str:
-    return _create_token(settings, subject, timedelta(days=settings.refresh_token_expire_days), "refresh")
+
+def create_session_tokens(
+    settings: JWTSettings, subject: str, *, email: str, role: str, session_id: str
+) -> Tuple[str, str]:
+    """The access and refresh token pair for a login session, as issued by login and by every refresh."""
+    access = create_access_token(settings, subject, claims={"email": email, "role": role, "sid": session_id})
+    refresh = create_refresh_token(settings, subject, claims={"sid": session_id})
+    return access, refresh
 
 
 def decode_token(settings: JWTSettings, token: str) -> Optional[Dict[str, Any]]:
+    """Verify ``token`` and return its claims, or None if it is not valid.
+
+    Successful verifications are memoized until the token expires, so the
+    returned dict is shared between callers and must not be mutated.
+    """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = settings.token_cache.get(cache_key)
+    if payload is not None:
+        return payload
     try:
-        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-    except JWTError:
+        key = settings.key_for(settings.backend.unverified_kid(token))
+    except ValueError:
         return None
-
-
+    if key is None:
+        return None
+    payload = settings.backend.decode(token, key, settings.algorithm)
+    if payload is not None and isinstance(payload.get("exp"), (int, float)):
+        settings.token_cache.set(cache_key, payload, ttl=payload["exp"] - time.time())
+    return payload
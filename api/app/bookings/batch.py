@@ -0,0 +1,56 @@
+from typing import List, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from app.auth.deps import get_current_user
+from app.auth.principal import Principal
+from app.events.service import invalidate_availability
+from app.jobs.queue import enqueue_many
+from .jobs import BOOKING_CONFIRMED
+from .service import reserve_batch
+
+
+router = APIRouter(prefix="/bookings", tags=["bookings"])
+
+MAX_BATCH_ITEMS = 1000
+
+
+class BatchItem(BaseModel):
+    event_id: UUID
+    seats: int = Field(default=1, ge=1)
+
+
+class BatchBody(BaseModel):
+    mode: Literal["all_or_nothing", "best_effort"] = "all_or_nothing"
+    items: List[BatchItem] = Field(min_length=1, max_length=MAX_BATCH_ITEMS)
+
+
+@router.post(":batch")
+async def create_bookings_batch(
+    body: BatchBody,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    all_or_nothing = body.mode == "all_or_nothing"
+    results = await reserve_batch(
+        session,
+        user_id=UUID(user.id),
+        items=[(item.event_id, item.seats) for item in body.items],
+        all_or_nothing=all_or_nothing,
+    )
+    await enqueue_many(
+        session,
+        BOOKING_CONFIRMED,
+        [{"booking_id": result["booking_id"]} for result in results if result["status"] == "booked"],
+    )
+    await session.commit()
+    booked = sum(1 for result in results if result["status"] == "booked")
+    if booked:
+        invalidate_availability({item.event_id for item in body.items})
+    if all_or_nothing and booked < len(results):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail={"mode": body.mode, "results": results})
+    return {"mode": body.mode, "booked": booked, "results": results}
@@ -0,0 +1,33 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from app.auth.deps import get_current_user
+from app.auth.principal import Principal
+from app.events.service import invalidate_availability
+from app.jobs.queue import enqueue
+from app.waitlist.service import promote_waitlist
+from .jobs import BOOKING_CANCELED
+from .service import cancel_booking
+
+
+router = APIRouter(prefix="/bookings", tags=["bookings"])
+
+
+@router.post("/{booking_id}:cancel")
+async def cancel_booking_endpoint(
+    booking_id: UUID,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    event_id = await cancel_booking(session, booking_id=booking_id, user_id=UUID(user.id))
+    if event_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Active booking not found")
+    # The freed seats go to the waitlist in the same transaction, so no one else can grab them first
+    promoted = await promote_waitlist(session, [event_id])
+    await enqueue(session, BOOKING_CANCELED, {"booking_id": booking_id})
+    await session.commit()
+    invalidate_availability([event_id])
+    return {"id": str(booking_id), "event_id": str(event_id), "status": "canceled", "waitlist_promoted": len(promoted)}
@@ -0,0 +1,42 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from app.auth.deps import get_current_user
+from app.auth.principal import Principal
+from app.events.service import invalidate_availability
+from app.jobs.queue import enqueue
+from .jobs import BOOKING_CONFIRMED
+from .service import CapacityExceeded, EventNotBookable, reserve_seats
+
+
+router = APIRouter(prefix="/bookings", tags=["bookings"])
+
+
+class BookingBody(BaseModel):
+    event_id: UUID
+    seats: int = Field(default=1, ge=1)
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def create_booking(
+    body: BookingBody,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        booking_id = await reserve_seats(session, event_id=body.event_id, user_id=UUID(user.id), seats=body.seats)
+    except EventNotBookable:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    except CapacityExceeded:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Not enough seats available")
+    # Committed with the booking; the worker sends the confirmation out of band
+    await enqueue(session, BOOKING_CONFIRMED, {"booking_id": booking_id})
+    await session.commit()
+    invalidate_availability([body.event_id])
+    return {"id": str(booking_id), "event_id": str(body.event_id), "seats": body.seats, "status": "active"}
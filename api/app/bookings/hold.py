@@ -0,0 +1,62 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from app.auth.deps import get_current_user
+from app.auth.principal import Principal
+from app.events.service import invalidate_availability
+from app.jobs.queue import enqueue
+from .create import BookingBody
+from .jobs import BOOKING_CONFIRMED
+from .service import CapacityExceeded, EventNotBookable, HoldExpired, confirm_hold, hold_seats
+from .sweeper import HOLD_TTL_SECONDS
+
+
+router = APIRouter(prefix="/bookings", tags=["bookings"])
+
+
+@router.post(":hold", status_code=status.HTTP_201_CREATED)
+async def create_hold(
+    body: BookingBody,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        booking_id, expires_at = await hold_seats(
+            session, event_id=body.event_id, user_id=UUID(user.id), seats=body.seats, ttl=HOLD_TTL_SECONDS
+        )
+    except EventNotBookable:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    except CapacityExceeded:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Not enough seats available")
+    await session.commit()
+    invalidate_availability([body.event_id])
+    return {
+        "id": str(booking_id),
+        "event_id": str(body.event_id),
+        "seats": body.seats,
+        "status": "held",
+        "expires_at": expires_at,
+    }
+
+
+@router.post("/{booking_id}:confirm")
+async def confirm_booking_hold(
+    booking_id: UUID,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        event_id = await confirm_hold(session, booking_id=booking_id, user_id=UUID(user.id))
+    except HoldExpired:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Hold has expired")
+    if event_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Hold not found or already released")
+    await enqueue(session, BOOKING_CONFIRMED, {"booking_id": booking_id})
+    await session.commit()
+    return {"id": str(booking_id), "event_id": str(event_id), "status": "active"}
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.jobs.queue import handler
+
+
+logger = logging.getLogger(__name__)
+
+BOOKING_CONFIRMED = "booking.confirmed"
+BOOKING_CANCELED = "booking.canceled"
+WAITLIST_PROMOTED = "waitlist.promoted"
+
+_BOOKING_SQL = text(
+    """
+    SELECT b.seats, b.status, u.email, e.title, e.starts_at
+      FROM bookings b
+      JOIN users u ON u.id = b.user_id
+      JOIN events e ON e.id = b.event_id
+     WHERE b.id = :booking_id
+    """
+)
+
+
+# No mail provider is configured yet; the log lines stand in for the messages
+
+
+@handler(BOOKING_CONFIRMED)
+async def send_booking_confirmation(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    row = (await session.execute(_BOOKING_SQL, {"booking_id": payload["booking_id"]})).first()
+    # Canceled or deleted before we got to it: nothing to confirm
+    if row is None or row.status != "active":
+        return
+    logger.info(
+        "Booking confirmation to %s: %s seat(s) for %r on %s", row.email, row.seats, row.title, row.starts_at
+    )
+
+
+@handler(BOOKING_CANCELED)
+async def send_cancellation_notice(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    row = (await session.execute(_BOOKING_SQL, {"booking_id": payload["booking_id"]})).first()
+    if row is None:
+        return
+    logger.info("Cancellation notice to %s: %s seat(s) for %r", row.email, row.seats, row.title)
+
+
+@handler(WAITLIST_PROMOTED)
+async def send_promotion_notice(session: AsyncSession, payload: Dict[str, Any]) -> None:
+    row = (await session.execute(_BOOKING_SQL, {"booking_id": payload["booking_id"]})).first()
+    if row is None or row.status != "active":
+        return
+    logger.info(
+        "Waitlist promotion to %s: %s seat(s) for %r on %s are now booked",
+        row.email,
+        row.seats,
+        row.title,
+        row.starts_at,
+    )
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# Raised by events_seats_booked_chk when a booking write would exceed capacity
+CHECK_VIOLATION = "23514"
+
+
+class CapacityExceeded(Exception):
+    def __init__(self, event_id: UUID) -> None:
+        super().__init__(f"Capacity exceeded for event {event_id}")
+        self.event_id = event_id
+
+
+class EventNotBookable(Exception):
+    def __init__(self, event_id: UUID) -> None:
+        super().__init__(f"Event {event_id} does not exist or is not published")
+        self.event_id = event_id
+
+
+class HoldExpired(Exception):
+    def __init__(self, booking_id: UUID) -> None:
+        super().__init__(f"Hold {booking_id} has expired")
+        self.booking_id = booking_id
+
+
+def is_check_violation(exc: DBAPIError) -> bool:
+    return getattr(exc.orig, "pgcode", None) == CHECK_VIOLATION
+
+
+_RESERVE_SQL = text(
+    """
+    INSERT INTO bookings (id, event_id, user_id, seats, status)
+    SELECT CAST(:booking_id AS uuid), e.id, CAST(:user_id AS uuid), CAST(:seats AS int), 'active'
+      FROM events e
+     WHERE e.id = :event_id
+       AND e.status = 'published'
+    RETURNING id
+    """
+)
+
+
+async def _insert_booking(session: AsyncSession, statement: Any, params: Dict[str, Any]) -> Any:
+    try:
+        result = await session.execute(statement, params)
+    except DBAPIError as exc:
+        if is_check_violation(exc):
+            raise CapacityExceeded(params["event_id"]) from exc
+        raise
+    row = result.first()
+    if row is None:
+        raise EventNotBookable(params["event_id"])
+    return row
+
+
+async def reserve_seats(session: AsyncSession, *, event_id: UUID, user_id: UUID, seats: int) -> UUID:
+    """Book ``seats`` on a published event in the caller's transaction and return the booking id.
+
+    This is one INSERT round trip: the statement trigger moves
+    ``events.seats_booked`` with a single UPDATE, so concurrent bookings only
+    contend for the duration of that UPDATE rather than for a lock plus a SUM
+    over the event's bookings. The caller commits, or rolls back on error.
+    """
+    booking_id = uuid4()
+    await _insert_booking(
+        session,
+        _RESERVE_SQL,
+        {"booking_id": booking_id, "event_id": event_id, "user_id": user_id, "seats": seats},
+    )
+    return booking_id
+
+
+_HOLD_SQL = text(
+    """
+    INSERT INTO bookings (id, event_id, user_id, seats, status, expires_at)
+    SELECT CAST(:booking_id AS uuid), e.id, CAST(:user_id AS uuid), CAST(:seats AS int), 'held',
+           now() + make_interval(secs => :ttl)
+      FROM events e
+     WHERE e.id = :event_id
+       AND e.status = 'published'
+    RETURNING expires_at
+    """
+)
+
+
+async def hold_seats(
+    session: AsyncSession, *, event_id: UUID, user_id: UUID, seats: int, ttl: float
+) -> Tuple[UUID, datetime]:
+    """Like ``reserve_seats``, but the seats are only held for ``ttl`` seconds.
+
+    Returns the booking id and when the hold expires. Until then the seats
+    count against capacity; ``confirm_hold`` turns the hold into an active
+    booking and the hold sweeper releases it otherwise.
+    """
+    booking_id = uuid4()
+    row = await _insert_booking(
+        session,
+        _HOLD_SQL,
+        {"booking_id": booking_id, "event_id": event_id, "user_id": user_id, "seats": seats, "ttl": ttl},
+    )
+    return booking_id, row.expires_at
+
+
+# Admits items per event in request order, each one if it fits the seats left
+# after the items admitted before it. Event rows are locked in id order first, so concurrent
+# batches touching the same events queue up instead of deadlocking.
+_RESERVE_BATCH_SQL = text(
+    """
+    WITH RECURSIVE req AS (
+        SELECT *
+          FROM unnest(CAST(:idx AS int[]), CAST(:ids AS uuid[]), CAST(:event_ids AS uuid[]), CAST(:seats AS int[]))
+               AS r(idx, booking_id, event_id, seats)
+    ), ev AS (
+        SELECT id, capacity - seats_booked AS available
+          FROM events
+         WHERE id IN (SELECT event_id FROM req)
+           AND status = 'published'
+         ORDER BY id
+           FOR UPDATE
+    ), ordered AS (
+        SELECT req.*,
+               ev.id IS NOT NULL AS found,
+               ev.available,
+               row_number() OVER (PARTITION BY req.event_id ORDER BY req.idx) AS n
+          FROM req
+          LEFT JOIN ev ON ev.id = req.event_id
+    ), walk AS (
+        -- Walk each event's items in order, taking seats only for items that fit,
+        -- so a rejected item doesn't use up capacity a later, smaller one could have
+        SELECT idx, event_id, n,
+               found AND seats <= available AS fits,
+               CASE WHEN found AND seats <= available THEN available - seats ELSE available END AS remaining
+          FROM ordered
+         WHERE n = 1
+        UNION ALL
+        SELECT o.idx, o.event_id, o.n,
+               o.found AND o.seats <= w.remaining,
+               CASE WHEN o.found AND o.seats <= w.remaining THEN w.remaining - o.seats ELSE w.remaining END
+          FROM walk w
+          JOIN ordered o ON o.event_id = w.event_id AND o.n = w.n + 1
+    ), decided AS (
+        SELECT o.idx, o.booking_id, o.event_id, o.seats, o.found, w.fits, bool_and(w.fits) OVER () AS all_fit
+          FROM ordered o
+          JOIN walk w ON w.idx = o.idx
+    ), ins AS (
+        INSERT INTO bookings (id, event_id, user_id, seats, status)
+        SELECT booking_id, event_id, CAST(:user_id AS uuid), seats, 'active'
+          FROM decided
+         WHERE fits AND (all_fit OR NOT CAST(:all_or_nothing AS boolean))
+        RETURNING id
+    )
+    SELECT d.idx, d.found, d.fits, ins.id AS booking_id
+      FROM decided d
+      LEFT JOIN ins ON ins.id = d.booking_id
+     ORDER BY d.idx
+    """
+)
+
+
+async def reserve_batch(
+    session: AsyncSession,
+    *,
+    user_id: UUID,
+    items: Sequence[Tuple[UUID, int]],
+    all_or_nothing: bool,
+) -> List[Dict[str, Any]]:
+    """Book many ``(event_id, seats)`` pairs with one statement in the caller's transaction.
+
+    Returns one result per item, in order. In all-or-nothing mode nothing is
+    inserted unless every item fits; in best-effort mode every item that fits
+    is booked.
+    """
+    params = {
+        "idx": list(range(len(items))),
+        "ids": [uuid4() for _ in items],
+        "event_ids": [event_id for event_id, _ in items],
+        "seats": [seats for _, seats in items],
+        "user_id": user_id,
+        "all_or_nothing": all_or_nothing,
+    }
+    rows = (await session.execute(_RESERVE_BATCH_SQL, params)).all()
+    results = []
+    for row in rows:
+        event_id, seats = items[row.idx]
+        if row.booking_id is not None:
+            status, reason = "booked", None
+        elif not row.found:
+            status, reason = "rejected", "event_not_bookable"
+        elif not row.fits:
+            status, reason = "rejected", "capacity_exceeded"
+        else:
+            status, reason = "rejected", "batch_aborted"
+        results.append(
+            {
+                "index": row.idx,
+                "event_id": str(event_id),
+                "seats": seats,
+                "status": status,
+                "booking_id": str(row.booking_id) if row.booking_id else None,
+                "reason": reason,
+            }
+        )
+    return results
+
+
+async def cancel_booking(session: AsyncSession, *, booking_id: UUID, user_id: UUID) -> Optional[UUID]:
+    """Cancel the user's active or held booking in the caller's transaction and return its event id.
+
+    Returns ``None`` if there is no such booking. The seats go back to
+    the event through the counter trigger; filling them from the waitlist is
+    up to the caller.
+    """
+    result = await session.execute(
+        text(
+            "UPDATE bookings SET status = 'canceled' "
+            "WHERE id = :booking_id AND user_id = :user_id AND status IN ('active', 'held') "
+            "RETURNING event_id"
+        ),
+        {"booking_id": booking_id, "user_id": user_id},
+    )
+    return result.scalar_one_or_none()
+
+
+async def confirm_hold(session: AsyncSession, *, booking_id: UUID, user_id: UUID) -> Optional[UUID]:
+    """Turn the user's unexpired hold into an active booking and return its event id.
+
+    One UPDATE by primary key: held seats already count against capacity, so
+    the event row is not touched. Returns ``None`` if there is no such hold and
+    raises ``HoldExpired`` if it ran out before the sweeper got to it.
+    """
+    result = await session.execute(
+        text(
+            "UPDATE bookings SET status = 'active', expires_at = NULL "
+            "WHERE id = :booking_id AND user_id = :user_id AND status = 'held' AND expires_at > now() "
+            "RETURNING event_id"
+        ),
+        {"booking_id": booking_id, "user_id": user_id},
+    )
+    event_id = result.scalar_one_or_none()
+    if event_id is None:
+        expired = await session.execute(
+            text("SELECT 1 FROM bookings WHERE id = :booking_id AND user_id = :user_id AND status = 'held'"),
+            {"booking_id": booking_id, "user_id": user_id},
+        )
+        if expired.first() is not None:
+            raise HoldExpired(booking_id)
+    return event_id
+
+
+# Oldest expired holds first, straight off ix_bookings_held_expires_at; SKIP
+# LOCKED lets sweepers in several processes split the work. The statement
+# trigger gives the seats back with one UPDATE per event for the whole batch.
+_SWEEP_SQL = text(
+    """
+    DELETE FROM bookings
+     WHERE id IN (
+            SELECT id
+              FROM bookings
+             WHERE status = 'held'
+               AND expires_at <= now()
+             ORDER BY expires_at
+             LIMIT :limit
+               FOR UPDATE SKIP LOCKED
+           )
+    RETURNING event_id, seats
+    """
+)
+
+
+async def release_expired_holds(session: AsyncSession, *, limit: int) -> List[Tuple[UUID, int]]:
+    """Delete up to ``limit`` expired holds in the caller's transaction; returns their ``(event_id, seats)``."""
+    rows = (await session.execute(_SWEEP_SQL, {"limit": limit})).all()
+    return [(row.event_id, row.seats) for row in rows]
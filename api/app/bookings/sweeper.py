@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from app.db import AsyncSessionLocal
+from app.events.service import invalidate_availability
+from app.metrics import HOLDS_EXPIRED
+from app.waitlist.service import promote_waitlist
+from .service import release_expired_holds
+
+
+logger = logging.getLogger(__name__)
+
+
+class HoldSweeper:
+    """Releases expired seat holds every ``interval`` seconds, ``batch_size`` per transaction.
+
+    Each pass reads only expired holds off the partial expiry index, so its
+    cost follows the number of holds released, not the size of ``bookings``.
+    Released seats go to the events' waitlists in the same transaction.
+    """
+
+    def __init__(self, *, interval: float, batch_size: int) -> None:
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> int:
+        """Release one batch; returns how many holds were released."""
+        async with AsyncSessionLocal() as session:
+            released = await release_expired_holds(session, limit=self.batch_size)
+            event_ids = {event_id for event_id, _ in released}
+            await promote_waitlist(session, event_ids)
+            await session.commit()
+        if released:
+            invalidate_availability(event_ids)
+            HOLDS_EXPIRED.inc(len(released))
+        return len(released)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Keep going while there's a backlog; otherwise wait for the next tick
+                while await self.sweep() == self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Anything escaping here would end the sweeper and leave expired holds taking seats
+                logger.exception("Releasing expired holds failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+HOLD_TTL_SECONDS = float(os.getenv("BOOKING_HOLD_SECONDS", "600"))
+
+hold_sweeper = HoldSweeper(
+    interval=float(os.getenv("HOLD_SWEEP_INTERVAL", "1")),
+    batch_size=int(os.getenv("HOLD_SWEEP_BATCH", "1000")),
+)
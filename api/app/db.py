@@ -1,9 +1,22 @@
+import asyncio
+import itertools
+import logging
 import os
-from contextlib import contextmanager
-from typing import Generator
+import time
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional, Tuple
+from uuid import uuid4
 
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+from app.metrics import Histogram, instrument_engine
+
+
+logger = logging.getLogger(__name__)
 
 
 def _get_database_url() -> str:
@@ -13,11 +26,319 @@ def _get_database_url() -> str:
     )
 
 
-engine = create_engine(_get_database_url(), pool_pre_ping=True, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+def _get_async_database_url(url: Optional[str] = None) -> str:
+    # Same DATABASE_URL, swapped onto the asyncpg driver
+    parsed = make_url(url or _get_database_url())
+    return parsed.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def _get_replica_urls() -> List[str]:
+    return [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Seconds to wait for a free connection before failing the request with 503
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "2"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = _env_flag("DB_POOL_PRE_PING", "true")
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+IDLE_IN_TRANSACTION_TIMEOUT_MS = int(os.getenv("DB_IDLE_IN_TRANSACTION_TIMEOUT_MS", "10000"))
+# Behind PgBouncer-style transaction pooling: no client-side pool, no named prepared
+# statement reuse, and timeouts set on the database role instead of per connection
+EXTERNAL_POOLER = _env_flag("DB_EXTERNAL_POOLER", "false")
+# After a write, the client's reads go to the primary for this long (0 turns it off)
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+PRIMARY_PIN_COOKIE = "db_primary"
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram()
+        self.timeouts = 0
+
+    def snapshot(self, pool: Any) -> Dict[str, Any]:
+        return {
+            "checkout_wait_seconds": self.checkout_wait.snapshot(),
+            "timeouts": self.timeouts,
+            "in_use": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+            "overflow": max(0, pool.overflow()) if hasattr(pool, "overflow") else 0,
+            "size": pool.size() if hasattr(pool, "size") else 0,
+        }
+
+
+sync_pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics
+
+    def _do_get(self):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.checkout_wait.observe(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics = sync_pool_metrics
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics = async_pool_metrics
+
+
+def _async_pool_class(metrics: PoolMetrics) -> Any:
+    return type("InstrumentedAsyncQueuePool", (InstrumentedAsyncQueuePool,), {"metrics": metrics})
+
+
+def _pool_kwargs(poolclass: Any) -> Dict[str, Any]:
+    if EXTERNAL_POOLER:
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": poolclass,
+        "pool_size": POOL_SIZE,
+        "max_overflow": POOL_MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING,
+    }
+
+
+def _sync_connect_args() -> Dict[str, Any]:
+    if EXTERNAL_POOLER:
+        return {}
+    return {
+        "options": f"-c statement_timeout={STATEMENT_TIMEOUT_MS}"
+        f" -c idle_in_transaction_session_timeout={IDLE_IN_TRANSACTION_TIMEOUT_MS}"
+    }
+
+
+def _async_connect_args() -> Dict[str, Any]:
+    if EXTERNAL_POOLER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "server_settings": {
+            "statement_timeout": str(STATEMENT_TIMEOUT_MS),
+            "idle_in_transaction_session_timeout": str(IDLE_IN_TRANSACTION_TIMEOUT_MS),
+        }
+    }
+
+
+# Engines are built on first use (normally in the app's lifespan startup), so
+# importing this module stays cheap and loads neither DB driver
+_engine: Optional[Engine] = None
+_async_engine: Optional[AsyncEngine] = None
+SessionLocal = sessionmaker(autoflush=False, autocommit=False, future=True)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        _engine = create_engine(
+            _get_database_url(),
+            future=True,
+            connect_args=_sync_connect_args(),
+            **_pool_kwargs(InstrumentedQueuePool),
+        )
+        instrument_engine(_engine)
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            _get_async_database_url(),
+            connect_args=_async_connect_args(),
+            **_pool_kwargs(InstrumentedAsyncQueuePool),
+        )
+        instrument_engine(_async_engine.sync_engine)
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+
+class ReplicaSet:
+    """Read replicas of the primary, handed out round-robin among the healthy ones.
+
+    ``check`` pings every replica and measures its replay lag; a replica that
+    fails the ping or lags more than ``max_lag`` seconds gets no reads until a
+    later check passes. Until the first check, and whenever none is healthy,
+    ``pick`` returns None and reads go to the primary.
+    """
+
+    def __init__(self, urls: List[str], *, interval: float, max_lag: float, timeout: float) -> None:
+        self.urls = urls
+        self.interval = interval
+        self.max_lag = max_lag
+        self.timeout = timeout
+        self.metrics = [PoolMetrics() for _ in urls]
+        self._engines: List[AsyncEngine] = []
+        self._healthy: Tuple[AsyncEngine, ...] = ()
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def engines(self) -> List[AsyncEngine]:
+        if not self._engines and self.urls:
+            for url, metrics in zip(self.urls, self.metrics):
+                engine = create_async_engine(
+                    _get_async_database_url(url),
+                    connect_args=_async_connect_args(),
+                    **_pool_kwargs(_async_pool_class(metrics)),
+                )
+                instrument_engine(engine.sync_engine)
+                self._engines.append(engine)
+        return self._engines
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool snapshots of the replicas whose engines exist; never creates one."""
+        return {
+            f"replica{i}": metrics.snapshot(engine.sync_engine.pool)
+            for i, (engine, metrics) in enumerate(zip(self._engines, self.metrics))
+        }
+
+    def pick(self) -> Optional[AsyncEngine]:
+        healthy = self._healthy
+        if not healthy:
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    async def _lag(self, engine: AsyncEngine) -> float:
+        async with engine.connect() as conn:
+            lag = await conn.execute(
+                text(
+                    # A replica that has replayed everything it received is current, however
+                    # old its last replayed transaction; a plain database is never behind
+                    "SELECT CASE WHEN NOT pg_is_in_recovery()"
+                    " OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+                    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                )
+            )
+            return float(lag.scalar_one())
+
+    async def _is_healthy(self, index: int, engine: AsyncEngine) -> bool:
+        try:
+            lag = await asyncio.wait_for(self._lag(engine), self.timeout)
+        except (OSError, asyncio.TimeoutError, exc.DBAPIError, exc.TimeoutError) as error:
+            logger.warning("Replica %d failed its health check: %s", index, error)
+            return False
+        if lag > self.max_lag:
+            logger.warning("Replica %d is %.1fs behind, above the %.1fs limit", index, lag, self.max_lag)
+            return False
+        return True
+
+    async def check(self) -> int:
+        """Refresh which replicas take reads; returns how many do."""
+        engines = self.engines()
+        results = await asyncio.gather(*(self._is_healthy(i, engine) for i, engine in enumerate(engines)))
+        self._healthy = tuple(engine for engine, healthy in zip(engines, results) if healthy)
+        return len(self._healthy)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    def start(self) -> None:
+        if self._task is None and self.urls:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def dispose(self) -> None:
+        self._healthy = ()
+        for engine in self._engines:
+            await engine.dispose()
+        self._engines = []
+
+
+replicas = ReplicaSet(
+    _get_replica_urls(),
+    interval=float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "2")),
+    max_lag=float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5")),
+    timeout=float(os.getenv("DB_REPLICA_TIMEOUT", "1")),
+)
+
+
+class ReadYourWritesMiddleware:
+    """Marks clients that just wrote, so ``get_read_session`` keeps them on the primary.
+
+    Every successful non-GET request sets a cookie that expires after
+    ``seconds``; the cookie, not worker state, carries the pin, so it holds
+    whichever worker serves the client's next read.
+    """
+
+    SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+    def __init__(self, app: Any, *, seconds: int) -> None:
+        self.app = app
+        self.cookie = (
+            f"{PRIMARY_PIN_COOKIE}=1; Max-Age={seconds}; Path=/; HttpOnly; Secure; SameSite=None".encode()
+        )
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_pinned(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", self.cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_pinned)
+
+
+async def dispose_engines() -> None:
+    global _engine, _async_engine
+    await replicas.dispose()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+
+
+def __getattr__(name: str) -> Any:
+    # Keeps ``from app.db import engine, async_engine`` working
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def pool_stats() -> Dict[str, Any]:
+    stats = {}
+    if _engine is not None:
+        stats["sync"] = sync_pool_metrics.snapshot(_engine.pool)
+    if _async_engine is not None:
+        stats["async"] = async_pool_metrics.snapshot(_async_engine.sync_engine.pool)
+    stats.update(replicas.pool_stats())
+    return stats
 
 
 def get_session() -> Generator[Session, None, None]:
+    get_engine()
     session = SessionLocal()
     try:
         yield session
@@ -25,3 +346,20 @@ def get_session() -> Generator[Session, None, None]:
         session.close()
 
 
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """A session for read-only handlers: on a replica when one is healthy, else on the primary.
+
+    Clients that wrote within ``READ_YOUR_WRITES_SECONDS`` stay on the primary,
+    so they always see their own writes. Never write through this session.
+    """
+    engine = None if PRIMARY_PIN_COOKIE in request.cookies else replicas.pick()
+    if engine is None:
+        engine = get_async_engine()
+    async with AsyncSessionLocal(bind=engine) as session:
+        yield session
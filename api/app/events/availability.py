@@ -0,0 +1,80 @@
+import json
+from typing import Any, AsyncIterator, Dict
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_read_session
+from .notifier import Subscriber, availability_hub
+from .service import get_availability
+
+
+router = APIRouter(tags=["events"])
+
+MAX_AVAILABILITY_IDS = 100
+HEARTBEAT_SECONDS = 15.0
+
+
+def _sse(state: Dict[str, Any], delta: int) -> str:
+    return f"event: availability\ndata: {json.dumps({**state, 'delta': delta})}\n\n"
+
+
+@router.get("/events/{event_id}/availability")
+async def event_availability(event_id: UUID, session: AsyncSession = Depends(get_read_session)):
+    availability = (await get_availability(session, [event_id])).get(event_id)
+    if availability is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    return availability
+
+
+@router.get("/availability")
+async def batch_availability(
+    ids: str = Query(description="Comma-separated event ids"),
+    session: AsyncSession = Depends(get_read_session),
+):
+    try:
+        event_ids = list(dict.fromkeys(UUID(raw.strip()) for raw in ids.split(",") if raw.strip()))
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ids must be UUIDs")
+    if not event_ids or len(event_ids) > MAX_AVAILABILITY_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Pass between 1 and {MAX_AVAILABILITY_IDS} ids"
+        )
+    found = await get_availability(session, event_ids)
+    return ORJSONResponse({"data": [found[event_id] for event_id in event_ids if event_id in found]})
+
+
+@router.get("/events/{event_id}/availability/stream")
+async def event_availability_stream(
+    event_id: UUID,
+    request: Request,
+    session: AsyncSession = Depends(get_read_session),
+):
+    initial = (await get_availability(session, [event_id])).get(event_id)
+    if initial is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    # Don't hold a pooled connection for the lifetime of the stream
+    await session.close()
+    subscriber: Subscriber = availability_hub.subscribe(event_id)
+
+    async def stream() -> AsyncIterator[str]:
+        last_booked = initial["seats_booked"]
+        try:
+            yield _sse(initial, 0)
+            while not await request.is_disconnected():
+                state = await subscriber.next(HEARTBEAT_SECONDS)
+                if state is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(state, state["seats_booked"] - last_booked)
+                last_booked = state["seats_booked"]
+        finally:
+            availability_hub.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
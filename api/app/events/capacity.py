@@ -0,0 +1,56 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from app.auth.deps import get_current_user
+from app.auth.principal import Principal
+from app.bookings.service import is_check_violation
+from app.waitlist.service import lock_events, promote_waitlist
+from .service import invalidate_availability
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+class CapacityBody(BaseModel):
+    capacity: int = Field(ge=0)
+
+
+@router.put("/{event_id}/capacity")
+async def set_event_capacity(
+    event_id: UUID,
+    body: CapacityBody,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    if user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    await lock_events(session, [event_id])
+    try:
+        row = (
+            await session.execute(
+                text("UPDATE events SET capacity = :capacity WHERE id = :id RETURNING seats_booked"),
+                {"id": event_id, "capacity": body.capacity},
+            )
+        ).first()
+    except DBAPIError as exc:
+        await session.rollback()
+        if is_check_violation(exc):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Capacity is below the seats already booked")
+        raise
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    promoted = await promote_waitlist(session, [event_id])
+    await session.commit()
+    invalidate_availability([event_id])
+    return {
+        "id": str(event_id),
+        "capacity": body.capacity,
+        "seats_booked": row.seats_booked + sum(item["seats"] for item in promoted),
+        "waitlist_promoted": len(promoted),
+    }
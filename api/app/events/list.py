@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_read_session
+from .service import DEFAULT_EVENT_FIELDS, EVENT_FIELDS, EventFilters, InvalidCursor, count_events, list_events_page
+
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+# Documents the response shape. Rows come straight from typed columns, so the
+# handler hands them to orjson as they are instead of validating them again.
+class EventOut(BaseModel):
+    id: UUID
+    starts_at: datetime
+    title: Optional[str] = None
+    description: Optional[str] = None
+    ends_at: Optional[datetime] = None
+    location: Optional[str] = None
+    capacity: Optional[int] = None
+    seats_booked: Optional[int] = None
+    status: Optional[str] = None
+    created_by: Optional[UUID] = None
+    resource_id: Optional[UUID] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class PaginationOut(BaseModel):
+    limit: int
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+    total_is_estimate: Optional[bool] = None
+
+
+class EventPage(BaseModel):
+    data: List[EventOut]
+    pagination: PaginationOut
+
+
+@router.get("", response_model=EventPage)
+async def list_events(
+    session: AsyncSession = Depends(get_read_session),
+    status_: Optional[Literal["draft", "published", "canceled"]] = Query(default=None, alias="status"),
+    starts_from: Optional[datetime] = None,
+    starts_to: Optional[datetime] = None,
+    resource_id: Optional[UUID] = None,
+    created_by: Optional[UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=100),
+    fields: Optional[str] = None,
+    total: Literal["none", "estimate", "exact"] = "none",
+):
+    selected = DEFAULT_EVENT_FIELDS
+    if fields:
+        selected = tuple(name.strip() for name in fields.split(",") if name.strip())
+        unknown = set(selected) - set(EVENT_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+
+    filters = EventFilters(
+        status=status_,
+        starts_from=starts_from,
+        starts_to=starts_to,
+        resource_id=resource_id,
+        created_by=created_by,
+    )
+    try:
+        data, next_cursor = await list_events_page(session, filters, limit=limit, cursor=cursor, fields=selected)
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    pagination = {"limit": limit, "next_cursor": next_cursor}
+    if total != "none":
+        pagination["total"] = await count_events(session, filters, estimate=total == "estimate")
+        pagination["total_is_estimate"] = total == "estimate"
+    return ORJSONResponse({"data": data, "pagination": pagination})
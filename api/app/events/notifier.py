@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy.engine import make_url
+
+from app.db import _get_database_url
+from .service import availability_cache
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "event_availability"
+
+
+class Subscriber:
+    """One stream's view of an event: only the newest state is kept, so slow readers never queue."""
+
+    def __init__(self, event_id: UUID) -> None:
+        self.event_id = event_id
+        self.latest: Optional[Dict[str, Any]] = None
+        self._ready = asyncio.Event()
+
+    def push(self, state: Dict[str, Any]) -> None:
+        self.latest = state
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        return self.latest
+
+
+class AvailabilityHub:
+    """Fans seat-count changes out to in-process subscribers.
+
+    Changes are coalesced: an event that changes many times within
+    ``interval`` seconds is pushed to its subscribers once, with its latest
+    state. Changes come from ``publish``, which the LISTEN connection (or a
+    test) calls.
+    """
+
+    def __init__(self, *, interval: float) -> None:
+        self.interval = interval
+        self._subscribers: Dict[UUID, Set[Subscriber]] = {}
+        self._pending: Dict[UUID, Dict[str, Any]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    def subscribe(self, event_id: UUID) -> Subscriber:
+        subscriber = Subscriber(event_id)
+        self._subscribers.setdefault(event_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.event_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.event_id]
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, event_id: UUID, capacity: int, seats_booked: int) -> None:
+        state = {
+            "event_id": str(event_id),
+            "capacity": capacity,
+            "seats_booked": seats_booked,
+            "seats_available": capacity - seats_booked,
+        }
+        # Also keeps other workers' availability caches fresh without waiting for their TTL
+        cached = availability_cache.get(event_id)
+        if cached is not None:
+            availability_cache.set(event_id, {**cached, **state})
+        if event_id in self._subscribers:
+            self._pending[event_id] = state
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for event_id, state in pending.items():
+            for subscriber in self._subscribers.get(event_id, ()):
+                subscriber.push(state)
+
+    async def _flush_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.flush()
+
+    def start(self) -> None:
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_forever())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+
+
+class PostgresListener:
+    """The process's single LISTEN connection, feeding NOTIFY payloads into the hub.
+
+    Whatever ends the connection, it is reopened after ``reconnect_delay``
+    seconds, doubling on each consecutive failure up to ``max_reconnect_delay``.
+    """
+
+    def __init__(
+        self,
+        hub: AvailabilityHub,
+        dsn: str,
+        *,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        connect: Optional[Callable[[str], Awaitable[Any]]] = None,
+    ) -> None:
+        self.hub = hub
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self._connect = connect
+        self._task: Optional[asyncio.Task] = None
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            self.hub.publish(UUID(data["event_id"]), int(data["capacity"]), int(data["seats_booked"]))
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed %s payload: %r", channel, payload)
+
+    async def _run(self) -> None:
+        if self._connect is None:
+            import asyncpg
+
+            self._connect = asyncpg.connect
+        delay = self.reconnect_delay
+        while True:
+            closed = asyncio.Event()
+            try:
+                connection = await self._connect(self.dsn)
+                try:
+                    connection.add_termination_listener(lambda _: closed.set())
+                    await connection.add_listener(CHANNEL, self._on_notify)
+                    # Anything that changed while we were disconnected was missed
+                    availability_cache.clear()
+                    delay = self.reconnect_delay
+                    await closed.wait()
+                finally:
+                    await connection.close()
+                logger.warning("LISTEN %s connection closed; reconnecting", CHANNEL)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Any failure here would otherwise end availability pushes for this process for good
+                logger.warning("LISTEN %s connection failed: %r", CHANNEL, exc)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
+                continue
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def _listen_dsn() -> str:
+    return make_url(_get_database_url()).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+availability_hub = AvailabilityHub(interval=float(os.getenv("AVAILABILITY_STREAM_INTERVAL", "0.5")))
+availability_listener = PostgresListener(availability_hub, _listen_dsn())
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.models import Event
+
+
+# Columns a client may request with ``fields=``; id and starts_at always come back for the cursor
+EVENT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "starts_at",
+    "ends_at",
+    "location",
+    "capacity",
+    "seats_booked",
+    "status",
+    "created_by",
+    "resource_id",
+    "created_at",
+    "updated_at",
+)
+DEFAULT_EVENT_FIELDS = tuple(name for name in EVENT_FIELDS if name != "description")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(starts_at: datetime, event_id: UUID) -> str:
+    raw = json.dumps([starts_at.isoformat(), str(event_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        starts_at, event_id = json.loads(raw)
+        return datetime.fromisoformat(starts_at), UUID(event_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid cursor") from exc
+
+
+class EventFilters:
+    def __init__(
+        self,
+        *,
+        status: Optional[str] = None,
+        starts_from: Optional[datetime] = None,
+        starts_to: Optional[datetime] = None,
+        resource_id: Optional[UUID] = None,
+        created_by: Optional[UUID] = None,
+    ) -> None:
+        self.status = status
+        self.starts_from = starts_from
+        self.starts_to = starts_to
+        self.resource_id = resource_id
+        self.created_by = created_by
+
+    def apply(self, stmt: Select) -> Select:
+        if self.status is not None:
+            stmt = stmt.where(Event.status == self.status)
+        if self.starts_from is not None:
+            stmt = stmt.where(Event.starts_at >= self.starts_from)
+        if self.starts_to is not None:
+            stmt = stmt.where(Event.starts_at < self.starts_to)
+        if self.resource_id is not None:
+            stmt = stmt.where(Event.resource_id == self.resource_id)
+        if self.created_by is not None:
+            stmt = stmt.where(Event.created_by == self.created_by)
+        return stmt
+
+
+async def count_events(session: AsyncSession, filters: EventFilters, *, estimate: bool) -> int:
+    stmt = filters.apply(select(func.count()).select_from(Event))
+    if not estimate:
+        return (await session.execute(stmt)).scalar_one()
+    # The planner's row estimate for the filtered scan: no table scan, good enough for page counts
+    conn = await session.connection()
+    compiled = filters.apply(select(Event.id)).compile(dialect=conn.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup) if compiled.positional else compiled.params
+    plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def list_events_page(
+    session: AsyncSession,
+    filters: EventFilters,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    fields: Sequence[str] = DEFAULT_EVENT_FIELDS,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return one page of events ordered by ``(starts_at, id)`` and the cursor of the next page.
+
+    Keyset pagination: each page seeks past the last ``(starts_at, id)`` seen,
+    so the cost of a page does not grow with its depth the way OFFSET does.
+    """
+    columns = [getattr(Event, name) for name in dict.fromkeys(("id", "starts_at", *fields))]
+    stmt = filters.apply(select(*columns))
+    if cursor:
+        after_starts_at, after_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Event.starts_at, Event.id) > tuple_(after_starts_at, after_id))
+    stmt = stmt.order_by(Event.starts_at, Event.id).limit(limit + 1)
+
+    rows = (await session.execute(stmt)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].starts_at, rows[-1].id)
+    return [dict(row._mapping) for row in rows], next_cursor
+
+
+# Seat availability read model: events.capacity - events.seats_booked, which the
+# booking triggers keep current, behind a short-lived per-process cache.
+availability_cache = TTLCache(
+    maxsize=int(os.getenv("AVAILABILITY_CACHE_SIZE", "50000")),
+    ttl=float(os.getenv("AVAILABILITY_CACHE_TTL", "1.0")),
+)
+
+
+def invalidate_availability(event_ids: Iterable[UUID]) -> None:
+    for event_id in event_ids:
+        availability_cache.delete(event_id)
+
+
+async def get_availability(session: AsyncSession, event_ids: Sequence[UUID]) -> Dict[UUID, Dict[str, Any]]:
+    """Seat availability for ``event_ids``; unknown ids are left out of the result.
+
+    Reads only the events row, never bookings.
+    """
+    found: Dict[UUID, Dict[str, Any]] = {}
+    missing = []
+    for event_id in event_ids:
+        cached = availability_cache.get(event_id)
+        if cached is not None:
+            found[event_id] = cached
+        else:
+            missing.append(event_id)
+    if missing:
+        stmt = select(Event.id, Event.status, Event.capacity, Event.seats_booked).where(Event.id.in_(missing))
+        for row in await session.execute(stmt):
+            availability = {
+                "event_id": str(row.id),
+                "status": row.status,
+                "capacity": row.capacity,
+                "seats_booked": row.seats_booked,
+                "seats_available": row.capacity - row.seats_booked,
+            }
+            availability_cache.set(row.id, availability)
+            found[row.id] = availability
+    return found
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.health import ReadinessProbe
+
+
+ALL_METHODS = "DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"
+MAX_CACHED_PREFLIGHTS = 1024
+
+
+def _json_body(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+class FastPathMiddleware:
+    """Thin ASGI front layer for probe and preflight traffic.
+
+    ``/health``, ``/`` and ``/ready`` and CORS preflights are answered here,
+    before CORS, rate limiting, metrics and routing run. Preflight answers
+    mirror Starlette's CORSMiddleware configured with ``allow_methods=["*"]``,
+    ``allow_headers=["*"]`` and credentials, and are cached per origin and
+    requested headers.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        *,
+        allow_origins: Sequence[str],
+        allow_origin_regex: Optional[str],
+        max_age: int,
+        readiness: ReadinessProbe,
+    ) -> None:
+        self.app = app
+        self.allow_origins = frozenset(allow_origins)
+        self.allow_origin_regex = re.compile(allow_origin_regex) if allow_origin_regex else None
+        self.max_age = str(max_age).encode()
+        self.readiness = readiness
+        self._static = {
+            "/health": _json_body({"status": "ok", "service": "api"}),
+            "/": _json_body({"message": "Welcome to Booking API"}),
+        }
+        self._preflights: Dict[Tuple[bytes, bytes], Tuple[int, List[Tuple[bytes, bytes]], bytes]] = {}
+
+    def is_allowed_origin(self, origin: str) -> bool:
+        if origin in self.allow_origins:
+            return True
+        return self.allow_origin_regex is not None and self.allow_origin_regex.fullmatch(origin) is not None
+
+    def _preflight(self, origin: bytes, requested_headers: bytes) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+        key = (origin, requested_headers)
+        cached = self._preflights.get(key)
+        if cached is not None:
+            return cached
+        headers = [
+            (b"vary", b"Origin"),
+            (b"access-control-allow-methods", ALL_METHODS.encode()),
+            (b"access-control-max-age", self.max_age),
+            (b"access-control-allow-credentials", b"true"),
+        ]
+        if requested_headers:
+            headers.append((b"access-control-allow-headers", requested_headers))
+        if self.is_allowed_origin(origin.decode("latin-1")):
+            headers.append((b"access-control-allow-origin", origin))
+            response = (200, headers, b"OK")
+        else:
+            response = (400, headers, b"Disallowed CORS origin")
+        if len(self._preflights) >= MAX_CACHED_PREFLIGHTS:
+            self._preflights.clear()
+        self._preflights[key] = response
+        return response
+
+    @staticmethod
+    async def _respond(
+        send: Callable, status: int, headers: List[Tuple[bytes, bytes]], body: bytes, head: bool = False
+    ) -> None:
+        headers = [*headers, (b"content-length", str(len(body)).encode())]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if head else body})
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method, path = scope["method"], scope["path"]
+        if method in ("GET", "HEAD"):
+            body = self._static.get(path)
+            if body is not None:
+                await self._respond(send, 200, [(b"content-type", b"application/json")], body, method == "HEAD")
+                return
+            if path == "/ready":
+                ready = await self.readiness.is_ready()
+                body = _json_body({"status": "ready" if ready else "unavailable"})
+                await self._respond(
+                    send, 200 if ready else 503, [(b"content-type", b"application/json")], body, method == "HEAD"
+                )
+                return
+        elif method == "OPTIONS":
+            origin = requested_method = None
+            requested_headers = b""
+            for name, value in scope["headers"]:
+                if name == b"origin":
+                    origin = value
+                elif name == b"access-control-request-method":
+                    requested_method = value
+                elif name == b"access-control-request-headers":
+                    requested_headers = value
+            if origin is not None and requested_method is not None:
+                status, headers, body = self._preflight(origin, requested_headers)
+                await self._respond(send, status, [*headers, (b"content-type", b"text/plain; charset=utf-8")], body)
+                return
+
+        await self.app(scope, receive, send)
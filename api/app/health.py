@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Callable, Optional
+
+from sqlalchemy import text
+
+
+class ReadinessProbe:
+    """Answers "can this worker reach the database?" from a briefly cached check.
+
+    The check borrows an already-pooled connection, so frequent probes neither
+    open new connections nor stack up behind each other.
+    """
+
+    def __init__(self, get_engine: Callable[[], Any], *, cache_seconds: float = 2.0, timeout: float = 1.0) -> None:
+        self.get_engine = get_engine
+        self.cache_seconds = cache_seconds
+        self.timeout = timeout
+        self._ready = False
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _select_one(self) -> None:
+        async with self.get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _ping(self) -> bool:
+        try:
+            await asyncio.wait_for(self._select_one(), self.timeout)
+            return True
+        except Exception:
+            return False
+
+    async def is_ready(self) -> bool:
+        if time.monotonic() - self._checked_at < self.cache_seconds:
+            return self._ready
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another probe may have refreshed the result while we waited
+            if time.monotonic() - self._checked_at >= self.cache_seconds:
+                self._ready = await self._ping()
+                self._checked_at = time.monotonic()
+        return self._ready
@@ -0,0 +1,401 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from starlette.requests import cookie_parser
+
+
+logger = logging.getLogger(__name__)
+
+HEADER = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+# The request was never carried out, so a retry must run it again rather than replay this
+UNSTORED_STATUSES = frozenset({401, 408, 429})
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    fingerprint: bytes
+    # None while the first request with the key is still running
+    status_code: Optional[int]
+    content_type: Optional[str]
+    body: bytes
+
+    @property
+    def pending(self) -> bool:
+        return self.status_code is None
+
+
+class IdempotencyStore(Protocol):
+    async def claim(self, key: bytes, fingerprint: bytes, lease: float) -> Optional[StoredResponse]:
+        """Take ``key`` for ``lease`` seconds and return None, or return what is already stored for it.
+
+        A key whose lease or retention has run out can be taken again.
+        """
+        ...
+
+    async def save(
+        self, key: bytes, *, status_code: int, content_type: Optional[str], body: bytes, ttl: float
+    ) -> None: ...
+
+    async def release(self, key: bytes) -> None:
+        """Give up a claimed key without a response, so the next retry runs the request."""
+        ...
+
+    async def purge_expired(self, limit: int) -> int: ...
+
+
+class MemoryIdempotencyStore:
+    """Process-local store, for tests and single-worker runs."""
+
+    def __init__(self) -> None:
+        self._records: Dict[bytes, Tuple[float, StoredResponse]] = {}
+
+    async def claim(self, key: bytes, fingerprint: bytes, lease: float) -> Optional[StoredResponse]:
+        now = time.monotonic()
+        entry = self._records.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        self._records[key] = (now + lease, StoredResponse(fingerprint, None, None, b""))
+        return None
+
+    async def save(
+        self, key: bytes, *, status_code: int, content_type: Optional[str], body: bytes, ttl: float
+    ) -> None:
+        entry = self._records.get(key)
+        if entry is not None:
+            stored = StoredResponse(entry[1].fingerprint, status_code, content_type, body)
+            self._records[key] = (time.monotonic() + ttl, stored)
+
+    async def release(self, key: bytes) -> None:
+        entry = self._records.get(key)
+        if entry is not None and entry[1].pending:
+            del self._records[key]
+
+    async def purge_expired(self, limit: int) -> int:
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._records.items() if expires_at <= now][:limit]
+        for key in expired:
+            del self._records[key]
+        return len(expired)
+
+
+# Inserts the key, or takes over one whose lease or retention ran out; a live
+# key is left alone and returns no row
+_CLAIM_SQL = text(
+    """
+    INSERT INTO idempotency_keys (key_hash, fingerprint, expires_at)
+    VALUES (:key_hash, :fingerprint, now() + make_interval(secs => :lease))
+    ON CONFLICT (key_hash) DO UPDATE
+       SET fingerprint = EXCLUDED.fingerprint,
+           status_code = NULL,
+           content_type = NULL,
+           response_body = NULL,
+           created_at = now(),
+           expires_at = EXCLUDED.expires_at
+     WHERE idempotency_keys.expires_at <= now()
+    RETURNING key_hash
+    """
+)
+
+_PURGE_SQL = text(
+    """
+    DELETE FROM idempotency_keys
+     WHERE key_hash IN (
+            SELECT key_hash
+              FROM idempotency_keys
+             WHERE expires_at <= now()
+             LIMIT :limit
+               FOR UPDATE SKIP LOCKED
+           )
+    """
+)
+
+
+class PostgresIdempotencyStore:
+    """Store shared by every worker process, in the idempotency_keys table.
+
+    Claiming a new key is one INSERT; only duplicates pay a second round trip
+    to read the stored row.
+    """
+
+    async def claim(self, key: bytes, fingerprint: bytes, lease: float) -> Optional[StoredResponse]:
+        from app.db import get_async_engine
+
+        while True:
+            async with get_async_engine().begin() as conn:
+                claimed = await conn.execute(
+                    _CLAIM_SQL, {"key_hash": key, "fingerprint": fingerprint, "lease": lease}
+                )
+                if claimed.first() is not None:
+                    return None
+                row = (
+                    await conn.execute(
+                        text(
+                            "SELECT fingerprint, status_code, content_type, response_body "
+                            "FROM idempotency_keys WHERE key_hash = :key_hash"
+                        ),
+                        {"key_hash": key},
+                    )
+                ).first()
+            # Otherwise it was purged between the two statements; try again
+            if row is not None:
+                return StoredResponse(row.fingerprint, row.status_code, row.content_type, row.response_body or b"")
+
+    async def save(
+        self, key: bytes, *, status_code: int, content_type: Optional[str], body: bytes, ttl: float
+    ) -> None:
+        from app.db import get_async_engine
+
+        async with get_async_engine().begin() as conn:
+            await conn.execute(
+                text(
+                    "UPDATE idempotency_keys SET status_code = :status_code, content_type = :content_type, "
+                    "response_body = :body, expires_at = now() + make_interval(secs => :ttl) "
+                    "WHERE key_hash = :key_hash AND status_code IS NULL"
+                ),
+                {"key_hash": key, "status_code": status_code, "content_type": content_type, "body": body, "ttl": ttl},
+            )
+
+    async def release(self, key: bytes) -> None:
+        from app.db import get_async_engine
+
+        async with get_async_engine().begin() as conn:
+            await conn.execute(
+                text("DELETE FROM idempotency_keys WHERE key_hash = :key_hash AND status_code IS NULL"),
+                {"key_hash": key},
+            )
+
+    async def purge_expired(self, limit: int) -> int:
+        from app.db import get_async_engine
+
+        async with get_async_engine().begin() as conn:
+            return (await conn.execute(_PURGE_SQL, {"limit": limit})).rowcount
+
+
+def _json_response(
+    status_code: int, detail: str, extra_headers: Iterable[Tuple[bytes, bytes]] = ()
+) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    body = json.dumps({"detail": detail}).encode()
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()), *extra_headers]
+    return status_code, headers, body
+
+
+class IdempotencyMiddleware:
+    """Makes ``routes`` safe to retry with an ``Idempotency-Key`` header.
+
+    The first request with a key runs and its response is stored for ``ttl``
+    seconds; later requests with the same key and caller get that response
+    back with ``Idempotent-Replayed: true``. Duplicates arriving while the
+    first is still running wait for it, up to ``wait`` seconds, instead of
+    running again. Reusing a key for a different request is rejected with 422.
+    Requests without the header are passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        *,
+        store: IdempotencyStore,
+        routes: Iterable[Tuple[str, str]],
+        ttl: float,
+        lease: float,
+        wait: float,
+    ) -> None:
+        self.app = app
+        self.store = store
+        self.routes = frozenset(routes)
+        self.ttl = ttl
+        self.lease = lease
+        self.wait = wait
+        # Keys this process is running right now, so local duplicates wake up as soon as it's done
+        self._running: Dict[bytes, asyncio.Event] = {}
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or (scope["method"], scope["path"]) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        raw_key = headers.get(HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await self._respond(
+                send, *_json_response(400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters")
+            )
+            return
+
+        body = await self._read_body(receive)
+        key = hashlib.sha256(self._caller(headers) + b"\0" + raw_key).digest()
+        fingerprint = hashlib.sha256(
+            b"\0".join((scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body))
+        ).digest()
+
+        deadline = time.monotonic() + self.wait
+        poll = 0.05
+        while True:
+            stored = await self.store.claim(key, fingerprint, self.lease)
+            if stored is None:
+                break
+            if stored.fingerprint != fingerprint:
+                await self._respond(
+                    send, *_json_response(422, "Idempotency-Key was already used for a different request")
+                )
+                return
+            if not stored.pending:
+                await self._replay(send, stored)
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                await self._respond(
+                    send,
+                    *_json_response(
+                        409, "A request with this Idempotency-Key is still in progress", [(b"retry-after", b"1")]
+                    ),
+                )
+                return
+            running = self._running.get(key)
+            if running is not None:
+                try:
+                    await asyncio.wait_for(running.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                # Running in another process: poll, backing off
+                await asyncio.sleep(min(poll, remaining))
+                poll = min(poll * 2, 0.5)
+
+        done = self._running[key] = asyncio.Event()
+        try:
+            await self._execute(scope, receive, send, key, body)
+        finally:
+            if self._running.get(key) is done:
+                del self._running[key]
+            done.set()
+
+    async def _execute(self, scope: Dict[str, Any], receive: Any, send: Any, key: bytes, body: bytes) -> None:
+        status_code = 500
+        content_type: Optional[str] = None
+        chunks: List[bytes] = []
+        replayed_body = False
+
+        async def receive_body() -> Dict[str, Any]:
+            nonlocal replayed_body
+            if not replayed_body:
+                replayed_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture(message: Dict[str, Any]) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-type":
+                        content_type = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        except BaseException:
+            await self._release(key)
+            raise
+        if status_code >= 500 or status_code in UNSTORED_STATUSES:
+            await self._release(key)
+            return
+        try:
+            await self.store.save(
+                key, status_code=status_code, content_type=content_type, body=b"".join(chunks), ttl=self.ttl
+            )
+        except (OSError, DBAPIError, PoolTimeoutError) as exc:
+            # The response already went out; a retry after the lease runs out will run again
+            logger.warning("Could not store idempotent response: %s", exc)
+
+    async def _release(self, key: bytes) -> None:
+        try:
+            await self.store.release(key)
+        except (OSError, DBAPIError, PoolTimeoutError) as exc:
+            logger.warning("Could not release idempotency key: %s", exc)
+
+    @staticmethod
+    def _caller(headers: Dict[bytes, bytes]) -> bytes:
+        # Keys are per user; requests without a valid session (registration) share one namespace
+        cookie = headers.get(b"cookie")
+        token = cookie_parser(cookie.decode("latin-1")).get("access_token") if cookie else None
+        if token:
+            from app.auth.deps import get_jwt_settings
+            from app.auth.security import decode_token
+
+            payload = decode_token(get_jwt_settings(), token)
+            if payload and payload.get("type") == "access" and payload.get("sub"):
+                return f"user:{payload['sub']}".encode()
+        return b"anonymous"
+
+    @staticmethod
+    async def _read_body(receive: Any) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    @staticmethod
+    async def _respond(send: Any, status_code: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _replay(self, send: Any, stored: StoredResponse) -> None:
+        headers = [(b"content-length", str(len(stored.body)).encode()), (b"idempotent-replayed", b"true")]
+        if stored.content_type:
+            headers.append((b"content-type", stored.content_type.encode("latin-1")))
+        await self._respond(send, stored.status_code or 200, headers, stored.body)
+
+
+class IdempotencyPurger:
+    """Deletes expired keys every ``interval`` seconds, ``batch_size`` per statement."""
+
+    def __init__(self, store: IdempotencyStore, *, interval: float, batch_size: int) -> None:
+        self.store = store
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                while await self.store.purge_expired(self.batch_size) == self.batch_size:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Anything escaping here would end the purger and let expired keys pile up
+                logger.exception("Purging idempotency keys failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+def make_store(backend: str) -> IdempotencyStore:
+    if backend == "memory":
+        return MemoryIdempotencyStore()
+    return PostgresIdempotencyStore()
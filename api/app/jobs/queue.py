@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+Handler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[None]]
+
+# kind -> coroutine run by the worker, in a transaction that also deletes the job
+handlers: Dict[str, Handler] = {}
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    def register(func: Handler) -> Handler:
+        handlers[kind] = func
+        return func
+
+    return register
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+_ENQUEUE_SQL = text(
+    """
+    INSERT INTO jobs (kind, payload, max_attempts, run_after)
+    SELECT :kind, CAST(p AS jsonb), COALESCE(:max_attempts, 10), now() + make_interval(secs => :delay)
+      FROM unnest(CAST(:payloads AS text[])) AS p
+    """
+)
+
+
+async def enqueue_many(
+    session: AsyncSession,
+    kind: str,
+    payloads: Iterable[Dict[str, Any]],
+    *,
+    delay: float = 0.0,
+    max_attempts: Optional[int] = None,
+) -> None:
+    """Queue one ``kind`` job per payload in the caller's transaction, with one INSERT.
+
+    The jobs become visible to workers only if that transaction commits, so a
+    side-effect is never run for a change that was rolled back, nor lost for
+    one that was committed.
+    """
+    encoded = [orjson.dumps(payload).decode() for payload in payloads]
+    if encoded:
+        await session.execute(
+            _ENQUEUE_SQL,
+            {"kind": kind, "payloads": encoded, "delay": delay, "max_attempts": max_attempts},
+        )
+
+
+async def enqueue(
+    session: AsyncSession,
+    kind: str,
+    payload: Dict[str, Any],
+    *,
+    delay: float = 0.0,
+    max_attempts: Optional[int] = None,
+) -> None:
+    await enqueue_many(session, kind, [payload], delay=delay, max_attempts=max_attempts)
+
+
+# Claiming a job leases it: run_after moves to the lease expiry, so a job whose
+# worker died is picked up again once the lease runs out. SKIP LOCKED lets
+# concurrent workers claim disjoint batches without waiting on each other.
+_CLAIM_SQL = text(
+    """
+    WITH next AS (
+        SELECT id
+          FROM jobs
+         WHERE status IN ('queued', 'running')
+           AND run_after <= now()
+         ORDER BY run_after, id
+         LIMIT :limit
+           FOR UPDATE SKIP LOCKED
+    )
+    UPDATE jobs j
+       SET status = 'running',
+           attempts = j.attempts + 1,
+           run_after = now() + make_interval(secs => :lease),
+           updated_at = now()
+      FROM next
+     WHERE j.id = next.id
+    RETURNING j.id, j.kind, j.payload::text AS payload, j.attempts, j.max_attempts
+    """
+)
+
+
+async def claim(session: AsyncSession, *, limit: int, lease: float) -> List[ClaimedJob]:
+    """Lease up to ``limit`` due jobs. The caller commits right away to release the row locks."""
+    rows = (await session.execute(_CLAIM_SQL, {"limit": limit, "lease": lease})).all()
+    return [
+        ClaimedJob(
+            id=row.id,
+            kind=row.kind,
+            payload=orjson.loads(row.payload),
+            attempts=row.attempts,
+            max_attempts=row.max_attempts,
+        )
+        for row in rows
+    ]
+
+
+async def complete(session: AsyncSession, job_id: int) -> None:
+    await session.execute(text("DELETE FROM jobs WHERE id = :id"), {"id": job_id})
+
+
+async def retry(session: AsyncSession, job_id: int, *, delay: float, error: str) -> None:
+    await session.execute(
+        text(
+            "UPDATE jobs SET status = 'queued', run_after = now() + make_interval(secs => :delay), "
+            "last_error = :error, updated_at = now() WHERE id = :id"
+        ),
+        {"id": job_id, "delay": delay, "error": error},
+    )
+
+
+async def fail(session: AsyncSession, job_id: int, *, error: str) -> None:
+    await session.execute(
+        text("UPDATE jobs SET status = 'failed', last_error = :error, updated_at = now() WHERE id = :id"),
+        {"id": job_id, "error": error},
+    )
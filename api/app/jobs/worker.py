@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import time
+from typing import List, Optional, Set
+
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+
+from app.db import AsyncSessionLocal, get_async_engine
+from app.metrics import JOB_SECONDS, JOBS
+from .queue import ClaimedJob, claim, complete, fail, handlers, retry
+
+# Modules whose handlers the worker runs
+import app.bookings.jobs  # noqa: F401
+
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Runs queued jobs on asyncio tasks, at most ``concurrency`` at a time.
+
+    Due jobs are claimed in batches with ``FOR UPDATE SKIP LOCKED``, so any
+    number of workers, in this process or others, can share the queue. A job
+    that raises is retried with exponential backoff and jitter until it has
+    used ``max_attempts``, then left as ``failed``.
+    """
+
+    def __init__(
+        self,
+        *,
+        concurrency: int,
+        batch_size: int,
+        poll_interval: float,
+        lease: float,
+        backoff_base: float,
+        backoff_max: float,
+    ) -> None:
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._running: Set[asyncio.Task] = set()
+        self._slot_freed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _claim(self, limit: int) -> List[ClaimedJob]:
+        async with AsyncSessionLocal() as session:
+            jobs = await claim(session, limit=limit, lease=self.lease)
+            await session.commit()
+        return jobs
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        started = time.perf_counter()
+        func = handlers.get(job.kind)
+        try:
+            if func is None:
+                raise LookupError(f"No handler for job kind {job.kind!r}")
+            if job.attempts > job.max_attempts:
+                # Its workers kept dying mid-run; don't start it again
+                raise RuntimeError("Lease expired on the last attempt")
+            async with AsyncSessionLocal() as session:
+                await asyncio.wait_for(func(session, job.payload), self.lease)
+                await complete(session, job.id)
+                await session.commit()
+            outcome = "done"
+        except asyncio.CancelledError:
+            # Shutting down; the lease runs out and another worker picks the job up
+            raise
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            final = func is None or job.attempts >= job.max_attempts
+            outcome = "failed" if final else "retried"
+            logger.warning("Job %s (%s) attempt %s %s: %s", job.id, job.kind, job.attempts, outcome, error)
+            try:
+                async with AsyncSessionLocal() as session:
+                    if final:
+                        await fail(session, job.id, error=error)
+                    else:
+                        await retry(session, job.id, delay=self.backoff(job.attempts), error=error)
+                    await session.commit()
+            except (OSError, DBAPIError, PoolTimeoutError) as record_exc:
+                logger.warning("Could not record the outcome of job %s: %s", job.id, record_exc)
+        JOBS.labels(job.kind, outcome).inc()
+        JOB_SECONDS.labels(job.kind).observe(time.perf_counter() - started)
+
+    def _done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._slot_freed.set()
+
+    async def _run(self) -> None:
+        get_async_engine()
+        while True:
+            free = self.concurrency - len(self._running)
+            if free <= 0:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+                continue
+            limit = min(free, self.batch_size)
+            try:
+                jobs = await self._claim(limit)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Anything escaping here would end the worker for good and leave the queue unserved
+                logger.exception("Claiming jobs failed")
+                jobs = []
+            for job in jobs:
+                task = asyncio.create_task(self._execute(job))
+                self._running.add(task)
+                task.add_done_callback(self._done)
+            # A full batch means more is probably due; otherwise the queue is drained for now
+            if len(jobs) < limit:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, grace: float = 10.0) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._running:
+            # Let jobs in flight finish, then cancel the stragglers
+            _, pending = await asyncio.wait(set(self._running), timeout=grace)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+job_worker = JobWorker(
+    concurrency=int(os.getenv("JOB_WORKER_CONCURRENCY", "4")),
+    batch_size=int(os.getenv("JOB_BATCH_SIZE", "32")),
+    poll_interval=float(os.getenv("JOB_POLL_INTERVAL", "1")),
+    lease=float(os.getenv("JOB_LEASE_SECONDS", "60")),
+    backoff_base=float(os.getenv("JOB_BACKOFF_BASE", "2")),
+    backoff_max=float(os.getenv("JOB_BACKOFF_MAX", "600")),
+)
+
+
+async def _serve() -> None:
+    from app.db import dispose_engines
+
+    job_worker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await job_worker.stop()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    # A dedicated worker process: python -m app.jobs.worker
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
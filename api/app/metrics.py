@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, generate_latest
+from prometheus_client import Histogram as PrometheusHistogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.tracing import current_trace, end_trace, start_trace, trace_exporter
+
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, in seconds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            running += count
+            cumulative[bound] = running
+        return {"count": self.count, "sum": self.sum, "buckets": cumulative}
+
+
+REQUEST_SECONDS = PrometheusHistogram(
+    "booking_api_request_duration_seconds", "HTTP request latency by route", ["method", "route"]
+)
+REQUESTS = Counter("booking_api_requests_total", "HTTP requests by route and status", ["method", "route", "status"])
+IN_FLIGHT = Gauge("booking_api_requests_in_flight", "HTTP requests currently being handled")
+REQUEST_DB_SECONDS = PrometheusHistogram(
+    "booking_api_request_db_seconds", "Time spent in database queries per request", ["route"]
+)
+DB_QUERY_SECONDS = PrometheusHistogram("booking_api_db_query_seconds", "Database query latency")
+JWT_DECODE_SECONDS = PrometheusHistogram(
+    "booking_api_jwt_decode_seconds",
+    "decode_token latency, cache hits included",
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01),
+)
+JOBS = Counter("booking_api_jobs_total", "Background jobs run, by kind and outcome", ["kind", "outcome"])
+JOB_SECONDS = PrometheusHistogram("booking_api_job_duration_seconds", "Background job run time", ["kind"])
+HOLDS_EXPIRED = Counter("booking_api_holds_expired_total", "Seat holds released by the sweeper after expiring")
+REVOKED_TOKENS = Gauge("booking_api_revoked_tokens", "Revoked token and session ids held in the in-process denylist")
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every cursor execution on ``engine`` into the query histogram and the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        seconds = time.perf_counter() - conn.info["query_started"].pop()
+        DB_QUERY_SECONDS.observe(seconds)
+        trace = current_trace()
+        if trace is not None:
+            trace.db_seconds += seconds
+            trace.db_queries += 1
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and in-flight requests per route template."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self._routes: Optional[Dict[Any, str]] = None
+
+    def _route(self, scope: Dict[str, Any]) -> str:
+        if self._routes is None:
+            self._routes = {
+                route.endpoint: route.path for route in scope["app"].routes if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        token = start_trace()
+        trace = current_trace()
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            seconds = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            end_trace(token)
+            route, method = self._route(scope), scope["method"]
+            REQUEST_SECONDS.labels(method, route).observe(seconds)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            if trace is not None:
+                REQUEST_DB_SECONDS.labels(route).observe(trace.db_seconds)
+                if trace_exporter is not None:
+                    trace_exporter.export(
+                        trace, method=method, route=route, status=status_code, duration_ms=round(seconds * 1000, 3)
+                    )
+
+
+def _histogram_family(
+    name: str, documentation: str, snapshot: Dict[str, Any], labels: Dict[str, str]
+) -> HistogramMetricFamily:
+    family = HistogramMetricFamily(name, documentation, labels=list(labels))
+    family.add_metric(list(labels.values()), list(snapshot["buckets"].items()), snapshot["sum"])
+    return family
+
+
+class StatsCollector(Collector):
+    """Exposes the pools' and caches' own counters at scrape time."""
+
+    def describe(self) -> Iterator[Any]:
+        # Without this, registering would call collect() while app.db is still importing
+        return iter(())
+
+    def collect(self) -> Iterator[Any]:
+        from app.auth.deps import get_jwt_settings
+        from app.auth.hashing import hash_pool
+        from app.auth.principal import principal_cache
+        from app.db import pool_stats
+        from app.events.service import availability_cache
+
+        in_use = GaugeMetricFamily("booking_api_db_pool_in_use", "Checked-out connections", labels=["engine"])
+        overflow = GaugeMetricFamily("booking_api_db_pool_overflow", "Connections above pool size", labels=["engine"])
+        timeouts = CounterMetricFamily("booking_api_db_pool_timeouts", "Checkout timeouts", labels=["engine"])
+        for name, stats in pool_stats().items():
+            in_use.add_metric([name], stats["in_use"])
+            overflow.add_metric([name], stats["overflow"])
+            timeouts.add_metric([name], stats["timeouts"])
+            yield _histogram_family(
+                "booking_api_db_pool_checkout_wait_seconds",
+                "Time waiting for a pooled connection",
+                stats["checkout_wait_seconds"],
+                {"engine": name},
+            )
+        yield from (in_use, overflow, timeouts)
+
+        hashing = hash_pool.metrics.snapshot()
+        yield GaugeMetricFamily("booking_api_password_hash_queue_depth", "Hashes in flight", value=hashing["queue_depth"])
+        yield CounterMetricFamily(
+            "booking_api_password_hash_rejected", "Hashes rejected with 503", value=hashing["rejected"]
+        )
+        yield _histogram_family(
+            "booking_api_password_hash_seconds", "bcrypt latency including queueing", hashing["latency_seconds"], {}
+        )
+
+        hits = CounterMetricFamily("booking_api_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("booking_api_cache_misses", "Cache misses", labels=["cache"])
+        for name, cache in (
+            ("principal", principal_cache.local),
+            ("jwt", get_jwt_settings().token_cache),
+            ("availability", availability_cache),
+        ):
+            hits.add_metric([name], cache.hits)
+            misses.add_metric([name], cache.misses)
+        yield from (hits, misses)
+
+
+REGISTRY.register(StatsCollector())
+
+
+def render_metrics() -> bytes:
+    return generate_latest(REGISTRY)
+
+
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
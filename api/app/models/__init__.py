@@ -10,5 +10,10 @@ from .user import User, RoleEnum  # noqa: E402,F401
 from .resource import Resource  # noqa: E402,F401
 from .event import Event, EventStatusEnum  # noqa: E402,F401
 from .booking import Booking, BookingStatusEnum  # noqa: E402,F401
+from .series import EventSeries  # noqa: E402,F401
+from .job import Job, JobStatusEnum  # noqa: E402,F401
+from .waitlist import WaitlistEntry, WaitlistStatusEnum  # noqa: E402,F401
+from .idempotency import IdempotencyKey  # noqa: E402,F401
+from .revoked_token import RevokedToken  # noqa: E402,F401
 
 
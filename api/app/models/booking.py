@@ -4,7 +4,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import uuid4
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Integer, String, func, Index
+from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Integer, String, func, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,8 @@ from . import Base
 class BookingStatusEnum(str):
     ACTIVE = "active"
     CANCELED = "canceled"
+    # Seats reserved until expires_at, then released by the hold sweeper
+    HELD = "held"
 
 
 class Booking(Base):
@@ -23,7 +25,8 @@ class Booking(Base):
     event_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
     user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     seats: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
-    status: Mapped[str] = mapped_column(Enum(BookingStatusEnum.ACTIVE, BookingStatusEnum.CANCELED, name="booking_status_enum"), nullable=False, default=BookingStatusEnum.ACTIVE)
+    status: Mapped[str] = mapped_column(Enum(BookingStatusEnum.ACTIVE, BookingStatusEnum.CANCELED, BookingStatusEnum.HELD, name="booking_status_enum"), nullable=False, default=BookingStatusEnum.ACTIVE)
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
     # Relationships
@@ -32,8 +35,10 @@ class Booking(Base):
 
     __table_args__ = (
         CheckConstraint("seats >= 1", name="bookings_seats_pos_chk"),
+        CheckConstraint("(status = 'held') = (expires_at IS NOT NULL)", name="bookings_hold_expiry_chk"),
         Index("ix_bookings_event_status", "event_id", "status"),
         Index("ix_bookings_user_id", "user_id"),
+        Index("ix_bookings_held_expires_at", "expires_at", postgresql_where=text("status = 'held'")),
     )
 
     def __repr__(self) -> str:  # pragma: no cover
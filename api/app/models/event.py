@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional
 from uuid import uuid4
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Integer, String, func, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import CheckConstraint, Computed, DateTime, Enum, ForeignKey, Integer, String, func, Index, text
+from sqlalchemy.dialects.postgresql import TSTZRANGE, UUID, ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from . import Base
@@ -27,9 +27,17 @@ class Event(Base):
     ends_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     location: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     capacity: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Seats taken by active and held bookings, maintained by the bookings_seats_booked_* triggers
+    seats_booked: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     status: Mapped[str] = mapped_column(Enum(EventStatusEnum.DRAFT, EventStatusEnum.PUBLISHED, EventStatusEnum.CANCELED, name="event_status_enum"), nullable=False, default=EventStatusEnum.DRAFT)
     created_by: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     resource_id: Mapped[Optional[UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("resources.id"), nullable=True)
+    # Set on occurrences materialized from a recurring series
+    series_id: Mapped[Optional[UUID]] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("event_series.id", ondelete="CASCADE"), nullable=True
+    )
+    # [starts_at, ends_at), maintained by Postgres; backs the per-resource no-overlap constraint
+    during: Mapped[Any] = mapped_column(TSTZRANGE, Computed("tstzrange(starts_at, ends_at, '[)')", persisted=True))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
@@ -41,9 +49,20 @@ class Event(Base):
     __table_args__ = (
         CheckConstraint("starts_at < ends_at", name="events_time_order_chk"),
         CheckConstraint("capacity >= 0", name="events_capacity_nonneg_chk"),
+        CheckConstraint("seats_booked >= 0 AND seats_booked <= capacity", name="events_seats_booked_chk"),
         Index("ix_events_starts_at", "starts_at"),
         Index("ix_events_status", "status"),
         Index("ix_events_created_by", "created_by"),
+        Index("ix_events_status_starts_at_id", "status", "starts_at", "id"),
+        Index("ix_events_resource_starts_at_id", "resource_id", "starts_at", "id"),
+        Index("ux_events_series_starts_at", "series_id", "starts_at", unique=True, postgresql_where=text("series_id IS NOT NULL")),
+        ExcludeConstraint(
+            ("resource_id", "="),
+            ("during", "&&"),
+            using="gist",
+            where=text("resource_id IS NOT NULL AND status <> 'canceled'"),
+            name="events_resource_no_overlap",
+        ),
     )
 
     def __repr__(self) -> str:  # pragma: no cover
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Index, LargeBinary, SmallInteger, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+
+class IdempotencyKey(Base):
+    """The stored outcome of a write sent with an ``Idempotency-Key`` header."""
+
+    __tablename__ = "idempotency_keys"
+
+    key_hash: Mapped[bytes] = mapped_column(LargeBinary, primary_key=True)
+    fingerprint: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    status_code: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    content_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    response_body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_idempotency_keys_expires_at", "expires_at"),)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"IdempotencyKey(key_hash={self.key_hash.hex()}, status_code={self.status_code})"
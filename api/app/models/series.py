@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+
+class EventSeries(Base):
+    """A recurring event: an RRULE anchored at a wall-clock start in its resource's timezone."""
+
+    __tablename__ = "event_series"
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    resource_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("resources.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    rrule: Mapped[str] = mapped_column(String, nullable=False)
+    dtstart_local: Mapped[datetime] = mapped_column(DateTime(timezone=False), nullable=False)
+    duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
+    capacity: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_by: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    # Occurrences starting before this instant exist as events rows
+    materialized_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        CheckConstraint("duration_minutes > 0", name="event_series_duration_pos_chk"),
+        CheckConstraint("capacity >= 0", name="event_series_capacity_nonneg_chk"),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"EventSeries(id={self.id}, title={self.title}, rrule={self.rrule})"
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import BigInteger, CheckConstraint, DateTime, ForeignKey, Identity, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+
+class WaitlistStatusEnum(str):
+    WAITING = "waiting"
+    FULFILLED = "fulfilled"
+    CANCELED = "canceled"
+
+
+class WaitlistEntry(Base):
+    """A user's request for seats on a sold-out event, filled in ``position`` order.
+
+    Entries can be filled in several steps; each step books the seats granted
+    and lowers ``seats_remaining`` until it reaches zero.
+    """
+
+    __tablename__ = "waitlist_entries"
+
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    event_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("events.id", ondelete="CASCADE"), nullable=False)
+    user_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    position: Mapped[int] = mapped_column(BigInteger, Identity(), nullable=False)
+    seats_requested: Mapped[int] = mapped_column(Integer, nullable=False)
+    seats_remaining: Mapped[int] = mapped_column(Integer, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, server_default=WaitlistStatusEnum.WAITING)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        CheckConstraint("status IN ('waiting', 'fulfilled', 'canceled')", name="waitlist_entries_status_chk"),
+        CheckConstraint(
+            "seats_requested >= 1 AND seats_remaining BETWEEN 0 AND seats_requested"
+            " AND (status <> 'waiting' OR seats_remaining >= 1)",
+            name="waitlist_entries_seats_chk",
+        ),
+        Index("ix_waitlist_entries_queue", "event_id", "position", postgresql_where=text("status = 'waiting'")),
+        Index(
+            "ux_waitlist_entries_waiting_user",
+            "event_id",
+            "user_id",
+            unique=True,
+            postgresql_where=text("status = 'waiting'"),
+        ),
+        Index("ix_waitlist_entries_user_id", "user_id"),
+    )
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return (
+            f"WaitlistEntry(id={self.id}, event_id={self.event_id}, position={self.position}, "
+            f"seats_remaining={self.seats_remaining}, status={self.status})"
+        )
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from .service import resource_calendar
+
+
+router = APIRouter(prefix="/resources", tags=["resources"])
+
+MAX_WINDOW = timedelta(days=366)
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.get("/{resource_id}/calendar")
+async def get_resource_calendar(
+    resource_id: UUID,
+    window_from: datetime = Query(alias="from"),
+    window_to: datetime = Query(alias="to"),
+    limit: int = Query(default=500, ge=1, le=5000),
+    session: AsyncSession = Depends(get_async_session),
+):
+    window_from, window_to = _utc(window_from), _utc(window_to)
+    if window_to <= window_from or window_to - window_from > MAX_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="'to' must be after 'from' and within 366 days of it"
+        )
+
+    calendar = await resource_calendar(
+        session, resource_id, window_from=window_from, window_to=window_to, limit=limit
+    )
+    if calendar is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resource not found")
+    return ORJSONResponse({**calendar, "from": window_from, "to": window_to})
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_read_session
+from .service import free_slots, resource_exists
+
+
+router = APIRouter(prefix="/resources", tags=["resources"])
+
+MAX_WINDOW = timedelta(days=366)
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.get("/{resource_id}/free-slots")
+async def resource_free_slots(
+    resource_id: UUID,
+    window_from: datetime = Query(alias="from"),
+    window_to: datetime = Query(alias="to"),
+    duration: timedelta = Query(description="Minimum slot length as an ISO 8601 duration, e.g. PT30M"),
+    limit: int = Query(default=100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+):
+    window_from, window_to = _utc(window_from), _utc(window_to)
+    if window_to <= window_from or window_to - window_from > MAX_WINDOW:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="'to' must be after 'from' and within 366 days of it"
+        )
+    if duration <= timedelta(0):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="duration must be positive")
+
+    # An unknown resource has no events, so it would look entirely free
+    if not await resource_exists(session, resource_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resource not found")
+    slots = await free_slots(
+        session, resource_id, window_from=window_from, window_to=window_to, duration=duration, limit=limit
+    )
+    return ORJSONResponse(
+        {
+            "resource_id": resource_id,
+            "from": window_from,
+            "to": window_to,
+            "duration_seconds": int(duration.total_seconds()),
+            "data": slots,
+        }
+    )
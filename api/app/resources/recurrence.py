@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import calendar
+import math
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional, Tuple
+
+
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+GREGORIAN_CYCLE_MONTHS = 400 * 12
+
+
+class InvalidRule(ValueError):
+    pass
+
+
+class RecurrenceRule:
+    """The RFC 5545 RRULE subset we support: FREQ=DAILY|WEEKLY|MONTHLY with
+    INTERVAL, COUNT, UNTIL, BYDAY (weekly) and BYMONTHDAY (monthly).
+
+    Occurrences are produced in the series' local wall time, from ``dtstart``.
+    """
+
+    def __init__(
+        self,
+        *,
+        freq: str,
+        interval: int = 1,
+        count: Optional[int] = None,
+        until: Optional[datetime] = None,
+        by_day: Tuple[int, ...] = (),
+        by_month_day: Tuple[int, ...] = (),
+    ) -> None:
+        self.freq = freq
+        self.interval = interval
+        self.count = count
+        self.until = until
+        self.by_day = by_day
+        self.by_month_day = by_month_day
+
+    @classmethod
+    def parse(cls, raw: str) -> "RecurrenceRule":
+        parts = {}
+        for item in filter(None, raw.strip().upper().removeprefix("RRULE:").split(";")):
+            name, sep, value = item.partition("=")
+            if not sep or not value:
+                raise InvalidRule(f"Malformed rule part {item!r}")
+            parts[name] = value
+
+        freq = parts.pop("FREQ", None)
+        interval_raw = parts.pop("INTERVAL", "1")
+        count_raw = parts.pop("COUNT", None)
+        until_raw = parts.pop("UNTIL", None)
+        by_day_raw = parts.pop("BYDAY", None)
+        by_month_day_raw = parts.pop("BYMONTHDAY", None)
+        if parts:
+            raise InvalidRule(f"Unsupported rule parts: {', '.join(sorted(parts))}")
+        if freq not in FREQUENCIES:
+            raise InvalidRule(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+        try:
+            interval = int(interval_raw)
+            count = int(count_raw) if count_raw is not None else None
+            until = _parse_until(until_raw) if until_raw is not None else None
+            by_day = tuple(sorted({_weekday(day) for day in by_day_raw.split(",")})) if by_day_raw else ()
+            by_month_day = tuple(sorted({int(day) for day in by_month_day_raw.split(",")})) if by_month_day_raw else ()
+        except ValueError as exc:
+            raise InvalidRule(str(exc)) from exc
+
+        if interval < 1 or (count is not None and count < 1):
+            raise InvalidRule("INTERVAL and COUNT must be positive")
+        if count is not None and until is not None:
+            raise InvalidRule("COUNT and UNTIL are mutually exclusive")
+        if by_day and freq != "WEEKLY":
+            raise InvalidRule("BYDAY is only supported with FREQ=WEEKLY")
+        if by_month_day and (freq != "MONTHLY" or not all(1 <= day <= 31 for day in by_month_day)):
+            raise InvalidRule("BYMONTHDAY takes days 1-31 with FREQ=MONTHLY")
+        return cls(freq=freq, interval=interval, count=count, until=until, by_day=by_day, by_month_day=by_month_day)
+
+    def between(self, dtstart: datetime, start: datetime, end: datetime) -> Iterator[Tuple[int, datetime]]:
+        """Yield ``(ordinal, occurrence)`` for occurrences in ``[start, end)``, in order.
+
+        All values are naive local wall times. Expansion jumps straight to the
+        period containing ``start``, so the cost follows the size of the window,
+        not the length of the series before it.
+        """
+        periods = {"DAILY": self._daily, "WEEKLY": self._weekly, "MONTHLY": self._monthly}[self.freq]
+        for ordinal, occurrence in periods(dtstart, start):
+            if occurrence >= end or (self.count is not None and ordinal >= self.count):
+                return
+            if self.until is not None and occurrence > self.until:
+                return
+            if occurrence >= start:
+                yield ordinal, occurrence
+
+    def _daily(self, dtstart: datetime, start: datetime) -> Iterator[Tuple[int, datetime]]:
+        k = max(0, -(-(start - dtstart).days // self.interval) - 1)
+        while True:
+            yield k, dtstart + timedelta(days=k * self.interval)
+            k += 1
+
+    def _weekly(self, dtstart: datetime, start: datetime) -> Iterator[Tuple[int, datetime]]:
+        days = self.by_day or (dtstart.weekday(),)
+        week_zero = dtstart - timedelta(days=dtstart.weekday())
+        # The first week only has the days from dtstart on
+        first_week = [day for day in days if day >= dtstart.weekday()]
+        p = max(0, (start - week_zero).days // (7 * self.interval))
+        while True:
+            week = week_zero + timedelta(weeks=p * self.interval)
+            if p == 0:
+                for i, day in enumerate(first_week):
+                    yield i, week + timedelta(days=day)
+            else:
+                base = len(first_week) + (p - 1) * len(days)
+                for i, day in enumerate(days):
+                    yield base + i, week + timedelta(days=day)
+            p += 1
+
+    def _monthly(self, dtstart: datetime, start: datetime) -> Iterator[Tuple[int, datetime]]:
+        days = self.by_month_day or (dtstart.day,)
+        month_index = dtstart.year * 12 + dtstart.month - 1
+        p = 0
+        ordinal = 0
+        if self.count is None:
+            # Without COUNT ordinals don't matter, so skip the months before the window
+            p = max(0, (start.year * 12 + start.month - 1 - month_index) // self.interval)
+        # The Gregorian calendar repeats every 400 years, so if that many months pass without
+        # an occurrence (BYMONTHDAY=30 visiting only Februaries, say) none will ever come
+        empty_limit = math.lcm(self.interval, GREGORIAN_CYCLE_MONTHS) // self.interval
+        empty = 0
+        while empty < empty_limit:
+            year, month = divmod(month_index + p * self.interval, 12)
+            last_day = calendar.monthrange(year, month + 1)[1]
+            empty += 1
+            for day in days:
+                # Months without that day are skipped, as RFC 5545 specifies
+                if day > last_day:
+                    continue
+                occurrence = datetime.combine(date(year, month + 1, day), dtstart.time())
+                if occurrence < dtstart:
+                    continue
+                yield ordinal, occurrence
+                ordinal += 1
+                empty = 0
+            p += 1
+
+
+def _weekday(code: str) -> int:
+    if code not in WEEKDAYS:
+        raise InvalidRule(f"Unsupported BYDAY value {code!r}")
+    return WEEKDAYS.index(code)
+
+
+def _parse_until(raw: str) -> datetime:
+    # Compared against local wall times; a trailing Z is accepted but not converted
+    raw = raw.rstrip("Z")
+    if "T" in raw:
+        return datetime.strptime(raw, "%Y%m%dT%H%M%S")
+    return datetime.strptime(raw, "%Y%m%d").replace(hour=23, minute=59, second=59)
@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from app.auth.deps import get_current_user
+from app.auth.principal import Principal
+from app.models import EventSeries, Resource
+from .recurrence import InvalidRule, RecurrenceRule
+from .service import SERIES_HORIZON, materialize_series
+from .timezones import clock_for
+
+
+router = APIRouter(prefix="/resources", tags=["resources"])
+
+
+class SeriesBody(BaseModel):
+    title: str = Field(min_length=1)
+    description: Optional[str] = None
+    rrule: str = Field(min_length=1, description="RFC 5545 RRULE, e.g. FREQ=WEEKLY;BYDAY=MO,WE")
+    starts_at_local: datetime = Field(description="First occurrence in the resource's local time, without offset")
+    duration_minutes: int = Field(ge=1, le=24 * 60)
+    capacity: int = Field(ge=0)
+
+
+@router.post("/{resource_id}/series", status_code=status.HTTP_201_CREATED)
+async def create_series(
+    resource_id: UUID,
+    body: SeriesBody,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    if user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admins only")
+    try:
+        RecurrenceRule.parse(body.rrule)
+    except InvalidRule as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid rrule: {exc}")
+    resource = (await session.execute(select(Resource.timezone).where(Resource.id == resource_id))).first()
+    if resource is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resource not found")
+
+    series = EventSeries(
+        id=uuid4(),
+        resource_id=resource_id,
+        title=body.title,
+        description=body.description,
+        rrule=body.rrule,
+        dtstart_local=body.starts_at_local.replace(tzinfo=None),
+        duration_minutes=body.duration_minutes,
+        capacity=body.capacity,
+        created_by=UUID(user.id),
+    )
+    session.add(series)
+    await session.flush()
+    clock = clock_for(resource.timezone)
+    materialized = await materialize_series(session, series, clock, datetime.now(timezone.utc) + SERIES_HORIZON)
+    await session.commit()
+    return {
+        "id": series.id,
+        "resource_id": resource_id,
+        "timezone": clock.name,
+        "materialized": materialized,
+        "materialized_until": series.materialized_until,
+    }
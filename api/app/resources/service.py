@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from uuid import UUID, uuid4
+
+from sqlalchemy import select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import Event, EventSeries, Resource
+from .recurrence import RecurrenceRule
+from .timezones import ResourceClock, clock_for
+
+
+# Raised by events_resource_no_overlap when an event would double-book its resource
+EXCLUSION_VIOLATION = "23P01"
+
+
+def is_exclusion_violation(exc: DBAPIError) -> bool:
+    return getattr(exc.orig, "pgcode", None) == EXCLUSION_VIOLATION
+
+
+# The window minus the union of the resource's active events, split into its
+# gaps. The predicate matches the exclusion constraint's partial GiST index.
+_FREE_SLOTS_SQL = text(
+    """
+    SELECT lower(slot) AS starts_at, upper(slot) AS ends_at
+      FROM unnest(
+             tstzmultirange(tstzrange(:window_from, :window_to, '[)'))
+             - COALESCE(
+                 (SELECT range_agg(e.during)
+                    FROM events e
+                   WHERE e.resource_id = :resource_id
+                     AND e.status <> 'canceled'
+                     AND e.during && tstzrange(:window_from, :window_to, '[)')),
+                 '{}'::tstzmultirange
+               )
+           ) AS slot
+     WHERE upper(slot) - lower(slot) >= :duration
+     ORDER BY lower(slot)
+     LIMIT :limit
+    """
+)
+
+
+async def resource_exists(session: AsyncSession, resource_id: UUID) -> bool:
+    result = await session.execute(text("SELECT 1 FROM resources WHERE id = :id"), {"id": resource_id})
+    return result.first() is not None
+
+
+async def free_slots(
+    session: AsyncSession,
+    resource_id: UUID,
+    *,
+    window_from: datetime,
+    window_to: datetime,
+    duration: timedelta,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    """Gaps of at least ``duration`` in the resource's schedule within ``[window_from, window_to)``.
+
+    Computed by Postgres in one statement; only events overlapping the window are read.
+    """
+    params = {
+        "resource_id": resource_id,
+        "window_from": window_from,
+        "window_to": window_to,
+        "duration": duration,
+        "limit": limit,
+    }
+    rows = await session.execute(_FREE_SLOTS_SQL, params)
+    return [{"starts_at": row.starts_at, "ends_at": row.ends_at} for row in rows]
+
+
+# Series occurrences exist as bookable events rows up to this far ahead; later
+# ones are expanded on the fly when a calendar asks for them
+SERIES_HORIZON = timedelta(days=int(os.getenv("SERIES_HORIZON_DAYS", "90")))
+
+CALENDAR_FIELDS = (
+    Event.id,
+    Event.series_id,
+    Event.title,
+    Event.starts_at,
+    Event.ends_at,
+    Event.status,
+    Event.capacity,
+    Event.seats_booked,
+)
+
+
+def series_occurrences(
+    series: EventSeries, clock: ResourceClock, start: datetime, end: datetime
+) -> Iterator[Dict[str, Any]]:
+    """Occurrences of ``series`` starting in ``[start, end)``, lazily and in order.
+
+    Only the periods overlapping the range are expanded; see ``RecurrenceRule.between``.
+    """
+    rule = RecurrenceRule.parse(series.rrule)
+    duration = timedelta(minutes=series.duration_minutes)
+    for _, local_start in rule.between(series.dtstart_local, clock.to_local(start), clock.to_local(end) + duration):
+        starts_at = clock.to_utc(local_start)
+        if starts_at < start:
+            continue
+        if starts_at >= end:
+            return
+        yield {
+            "id": None,
+            "series_id": series.id,
+            "title": series.title,
+            "starts_at": starts_at,
+            "ends_at": starts_at + duration,
+            "status": "published",
+            "capacity": series.capacity,
+            "seats_booked": 0,
+        }
+
+
+_MATERIALIZE_SQL = text(
+    """
+    INSERT INTO events (id, title, description, starts_at, ends_at, capacity, status, created_by, resource_id, series_id)
+    VALUES (:id, :title, :description, :starts_at, :ends_at, :capacity, 'published', :created_by, :resource_id, :series_id)
+    ON CONFLICT DO NOTHING
+    """
+)
+
+
+async def materialize_series(
+    session: AsyncSession, series: EventSeries, clock: ResourceClock, until: datetime
+) -> int:
+    """Insert the series' occurrences from where the last run stopped up to ``until``.
+
+    Incremental and idempotent: only the new stretch is expanded, and occurrences
+    that already exist, or that would double-book the resource, are skipped by
+    ON CONFLICT DO NOTHING. Returns the number of occurrences expanded.
+    """
+    start = series.materialized_until or clock.to_utc(series.dtstart_local)
+    if start >= until:
+        return 0
+    rows = [
+        {
+            "id": uuid4(),
+            "title": series.title,
+            "description": series.description,
+            "starts_at": occurrence["starts_at"],
+            "ends_at": occurrence["ends_at"],
+            "capacity": series.capacity,
+            "created_by": series.created_by,
+            "resource_id": series.resource_id,
+            "series_id": series.id,
+        }
+        for occurrence in series_occurrences(series, clock, start, until)
+    ]
+    if rows:
+        await session.execute(_MATERIALIZE_SQL, rows)
+    await session.execute(
+        text(
+            "UPDATE event_series SET materialized_until = :until "
+            "WHERE id = :id AND (materialized_until IS NULL OR materialized_until < :until)"
+        ),
+        {"id": series.id, "until": until},
+    )
+    # Already written above; keep the ORM from issuing its own unconditional UPDATE
+    set_committed_value(series, "materialized_until", until)
+    return len(rows)
+
+
+async def resource_calendar(
+    session: AsyncSession,
+    resource_id: UUID,
+    *,
+    window_from: datetime,
+    window_to: datetime,
+    limit: int,
+) -> Optional[Dict[str, Any]]:
+    """Events of a resource overlapping ``[window_from, window_to)``, merged with
+    series occurrences beyond the materialized horizon. ``None`` if the resource
+    does not exist.
+    """
+    resource = (await session.execute(select(Resource.timezone).where(Resource.id == resource_id))).first()
+    if resource is None:
+        return None
+    clock = clock_for(resource.timezone)
+    series_list: Sequence[EventSeries] = (
+        (await session.execute(select(EventSeries).where(EventSeries.resource_id == resource_id))).scalars().all()
+    )
+
+    # Lazily roll each series' horizon forward as far as this window needs
+    horizon_end = min(window_to, datetime.now(timezone.utc) + SERIES_HORIZON)
+    stale = [series for series in series_list if (series.materialized_until or window_from) < horizon_end]
+    for series in stale:
+        await materialize_series(session, series, clock, horizon_end)
+    if stale:
+        await session.commit()
+
+    stored = await session.execute(
+        select(*CALENDAR_FIELDS)
+        .where(
+            Event.resource_id == resource_id,
+            Event.status != "canceled",
+            Event.starts_at < window_to,
+            Event.ends_at > window_from,
+        )
+        .order_by(Event.starts_at)
+        .limit(limit)
+    )
+    streams: List[Iterator[Dict[str, Any]]] = [(dict(row._mapping, materialized=True) for row in stored)]
+    for series in series_list:
+        duration = timedelta(minutes=series.duration_minutes)
+        start = max(window_from - duration, series.materialized_until or window_from)
+        streams.append(
+            dict(occurrence, materialized=False)
+            for occurrence in series_occurrences(series, clock, start, window_to)
+            if occurrence["ends_at"] > window_from
+        )
+    merged = itertools.islice(heapq.merge(*streams, key=lambda item: item["starts_at"]), limit)
+    data = [dict(item, local_starts_at=clock.to_local(item["starts_at"])) for item in merged]
+    return {"resource_id": resource_id, "timezone": clock.name, "data": data}
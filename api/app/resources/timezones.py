@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+UTC = timezone.utc
+# Wall-clock granularity of cached offsets; current-day transitions fall on quarter hours
+OFFSET_STEP = timedelta(minutes=15)
+MAX_CACHED_OFFSETS = 4096
+
+
+class ResourceClock:
+    """Converts between a resource's local wall time and UTC.
+
+    UTC offsets are memoized per quarter hour of wall time, so expanding a
+    series looks each distinct offset up once rather than once per occurrence.
+    Nonexistent local times (in a DST gap) resolve with the offset in effect
+    before the gap, i.e. they move forward; ambiguous ones take the first
+    (earlier) instant.
+    """
+
+    def __init__(self, name: str, zone: ZoneInfo) -> None:
+        self.name = name
+        self.zone = zone
+        self._offsets: Dict[datetime, timedelta] = {}
+
+    def _utcoffset(self, local: datetime) -> timedelta:
+        return local.replace(tzinfo=self.zone).utcoffset() or timedelta(0)
+
+    def _offset(self, local: datetime) -> timedelta:
+        bucket = local - (local - datetime.min) % OFFSET_STEP
+        offset = self._offsets.get(bucket)
+        if offset is not None:
+            return offset
+        offset = self._utcoffset(local)
+        # Only memoize quarter hours with no transition inside them
+        if self._utcoffset(bucket) == offset == self._utcoffset(bucket + OFFSET_STEP - timedelta(microseconds=1)):
+            if len(self._offsets) >= MAX_CACHED_OFFSETS:
+                self._offsets.clear()
+            self._offsets[bucket] = offset
+        return offset
+
+    def to_utc(self, local: datetime) -> datetime:
+        return (local - self._offset(local)).replace(tzinfo=UTC)
+
+    def to_local(self, instant: datetime) -> datetime:
+        return instant.astimezone(self.zone).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=1024)
+def clock_for(name: Optional[str]) -> ResourceClock:
+    """The clock for a ``Resource.timezone`` value.
+
+    The column is free-form: unknown or empty names fall back to UTC, and the
+    result of every name, valid or not, is cached.
+    """
+    key = (name or "").strip() or "UTC"
+    try:
+        return ResourceClock(key, ZoneInfo(key))
+    except (ZoneInfoNotFoundError, ValueError):
+        return ResourceClock("UTC", ZoneInfo("UTC"))
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+from uuid import uuid4
+
+
+class RequestTrace:
+    """Timings collected while one request is handled."""
+
+    __slots__ = ("trace_id", "started", "db_seconds", "db_queries", "spans")
+
+    def __init__(self) -> None:
+        self.trace_id = uuid4().hex
+        self.started = time.time()
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.spans: List[Dict[str, Any]] = []
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def current_trace() -> Optional[RequestTrace]:
+    return _current_trace.get()
+
+
+def start_trace() -> Any:
+    return _current_trace.set(RequestTrace())
+
+
+def end_trace(token: Any) -> None:
+    _current_trace.reset(token)
+
+
+def record_span(name: str, started: float, seconds: float) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.spans.append({"name": name, "start": started, "duration_ms": round(seconds * 1000, 3)})
+
+
+@contextmanager
+def span(name: str, observe: Optional[Callable[[float], None]] = None) -> Iterator[None]:
+    wall, started = time.time(), time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        if observe is not None:
+            observe(seconds)
+        record_span(name, wall, seconds)
+
+
+class JsonLinesExporter:
+    """Writes one JSON line per sampled request trace to stdout or a file."""
+
+    def __init__(self, target: str, sample_rate: float = 1.0) -> None:
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._stream: TextIO = sys.stdout if target == "stdout" else open(target.split(":", 1)[1], "a", buffering=1)
+
+    def export(self, trace: RequestTrace, **attributes: Any) -> None:
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        record = {
+            "trace_id": trace.trace_id,
+            "start": trace.started,
+            **attributes,
+            "db_ms": round(trace.db_seconds * 1000, 3),
+            "db_queries": trace.db_queries,
+            "spans": trace.spans,
+        }
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            self._stream.write(line + "\n")
+
+
+def _exporter_from_env() -> Optional[JsonLinesExporter]:
+    target = os.getenv("TRACE_EXPORT", "")
+    if target != "stdout" and not target.startswith("file:"):
+        return None
+    return JsonLinesExporter(target, float(os.getenv("TRACE_SAMPLE_RATE", "1.0")))
+
+
+# TRACE_EXPORT=stdout or TRACE_EXPORT=file:/path/traces.jsonl; unset disables trace export
+trace_exporter = _exporter_from_env()
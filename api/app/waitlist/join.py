@@ -0,0 +1,53 @@
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import get_async_session
+from app.auth.deps import get_current_user
+from app.auth.principal import Principal
+from app.bookings.service import EventNotBookable
+from app.events.service import invalidate_availability
+from .service import AlreadyWaiting, join_waitlist, leave_waitlist
+
+
+router = APIRouter(prefix="/events", tags=["waitlist"])
+
+
+class WaitlistBody(BaseModel):
+    seats: int = Field(default=1, ge=1)
+
+
+@router.post("/{event_id}/waitlist", status_code=status.HTTP_201_CREATED)
+async def join_event_waitlist(
+    event_id: UUID,
+    body: WaitlistBody,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    try:
+        entry = await join_waitlist(session, event_id=event_id, user_id=UUID(user.id), seats=body.seats)
+    except EventNotBookable:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event not found")
+    except AlreadyWaiting:
+        await session.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Already on the waitlist for this event")
+    await session.commit()
+    if entry["bookings"]:
+        invalidate_availability([event_id])
+    return entry
+
+
+@router.delete("/{event_id}/waitlist/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_event_waitlist(
+    event_id: UUID,
+    entry_id: UUID,
+    user: Principal = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_session),
+):
+    seats = await leave_waitlist(session, event_id=event_id, entry_id=entry_id, user_id=UUID(user.id))
+    if seats is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Waiting entry not found")
+    await session.commit()
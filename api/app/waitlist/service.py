@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bookings.jobs import WAITLIST_PROMOTED
+from app.bookings.service import EventNotBookable
+from app.jobs.queue import enqueue_many
+
+
+UNIQUE_VIOLATION = "23505"
+
+
+class AlreadyWaiting(Exception):
+    def __init__(self, event_id: UUID) -> None:
+        super().__init__(f"Already on the waitlist for event {event_id}")
+        self.event_id = event_id
+
+
+# Every write to an event's waitlist, and every promotion, holds the event row
+# lock first. Promotions therefore run one at a time per event, and because the
+# lock is taken in its own statement, the promotion statement's snapshot
+# already includes everything committed before it.
+_LOCK_EVENTS_SQL = text("SELECT id FROM events WHERE id = ANY(CAST(:event_ids AS uuid[])) ORDER BY id FOR UPDATE")
+
+# Fills free seats from the head of each event's queue in one statement. Each
+# waiting entry wants at least one seat, so no more than ``available`` entries
+# can be served: the lateral subquery reads only that many rows off
+# ix_waitlist_entries_queue, however long the queue is. The last entry served
+# may be filled partially and keeps its place.
+_PROMOTE_SQL = text(
+    """
+    WITH ev AS (
+        SELECT id, capacity - seats_booked AS available
+          FROM events
+         WHERE id = ANY(CAST(:event_ids AS uuid[]))
+           AND status = 'published'
+           AND capacity > seats_booked
+    ), head AS (
+        SELECT w.*, ev.available
+          FROM ev
+         CROSS JOIN LATERAL (
+                SELECT id, event_id, user_id, position, seats_remaining
+                  FROM waitlist_entries
+                 WHERE event_id = ev.id
+                   AND status = 'waiting'
+                 ORDER BY position
+                 LIMIT ev.available
+               ) w
+    ), granted AS (
+        SELECT id AS entry_id, event_id, user_id, gen_random_uuid() AS booking_id,
+               LEAST(
+                   seats_remaining,
+                   available - (SUM(seats_remaining) OVER (PARTITION BY event_id ORDER BY position) - seats_remaining)
+               ) AS seats
+          FROM head
+    ), served AS (
+        SELECT * FROM granted WHERE seats > 0
+    ), upd AS (
+        UPDATE waitlist_entries w
+           SET seats_remaining = w.seats_remaining - s.seats,
+               status = CASE WHEN w.seats_remaining = s.seats THEN 'fulfilled' ELSE 'waiting' END
+          FROM served s
+         WHERE w.id = s.entry_id
+    ), ins AS (
+        INSERT INTO bookings (id, event_id, user_id, seats, status)
+        SELECT booking_id, event_id, user_id, seats, 'active' FROM served
+        RETURNING id
+    )
+    SELECT s.entry_id, s.booking_id, s.event_id, s.user_id, s.seats
+      FROM served s
+      JOIN ins ON ins.id = s.booking_id
+    """
+)
+
+
+async def lock_events(session: AsyncSession, event_ids: Iterable[UUID]) -> None:
+    await session.execute(_LOCK_EVENTS_SQL, {"event_ids": sorted(set(event_ids))})
+
+
+async def promote_waitlist(session: AsyncSession, event_ids: Iterable[UUID]) -> List[Dict[str, Any]]:
+    """Book any free seats on ``event_ids`` for their waitlists, in queue order, in the caller's transaction.
+
+    Call this after anything that frees seats or raises capacity, and after
+    joining a waitlist. Returns one ``{entry_id, booking_id, event_id,
+    user_id, seats}`` per booking made and queues a notification for each.
+    """
+    event_ids = sorted(set(event_ids))
+    if not event_ids:
+        return []
+    await lock_events(session, event_ids)
+    rows = (await session.execute(_PROMOTE_SQL, {"event_ids": event_ids})).all()
+    promoted = [dict(row._mapping) for row in rows]
+    await enqueue_many(session, WAITLIST_PROMOTED, ({"booking_id": row["booking_id"]} for row in promoted))
+    return promoted
+
+
+_JOIN_SQL = text(
+    """
+    INSERT INTO waitlist_entries (id, event_id, user_id, seats_requested, seats_remaining, status)
+    SELECT CAST(:entry_id AS uuid), e.id, CAST(:user_id AS uuid), CAST(:seats AS int), CAST(:seats AS int), 'waiting'
+      FROM events e
+     WHERE e.id = :event_id
+       AND e.status = 'published'
+    RETURNING position
+    """
+)
+
+
+async def join_waitlist(session: AsyncSession, *, event_id: UUID, user_id: UUID, seats: int) -> Dict[str, Any]:
+    """Queue a request for ``seats`` and fill as much of it as is free right now.
+
+    Raises ``EventNotBookable`` or ``AlreadyWaiting``; the caller commits, or
+    rolls back on error.
+    """
+    entry_id = uuid4()
+    # Positions are handed out under the event lock, so they follow commit order
+    await lock_events(session, [event_id])
+    try:
+        result = await session.execute(
+            _JOIN_SQL, {"entry_id": entry_id, "event_id": event_id, "user_id": user_id, "seats": seats}
+        )
+    except DBAPIError as exc:
+        if getattr(exc.orig, "pgcode", None) == UNIQUE_VIOLATION:
+            raise AlreadyWaiting(event_id) from exc
+        raise
+    position = result.scalar_one_or_none()
+    if position is None:
+        raise EventNotBookable(event_id)
+
+    bookings = [row for row in await promote_waitlist(session, [event_id]) if row["entry_id"] == entry_id]
+    remaining = seats - sum(row["seats"] for row in bookings)
+    return {
+        "id": entry_id,
+        "event_id": event_id,
+        "position": position,
+        "seats_requested": seats,
+        "seats_remaining": remaining,
+        "status": "waiting" if remaining else "fulfilled",
+        "bookings": [{"id": row["booking_id"], "seats": row["seats"]} for row in bookings],
+    }
+
+
+async def leave_waitlist(session: AsyncSession, *, event_id: UUID, entry_id: UUID, user_id: UUID) -> Optional[int]:
+    """Drop the user's still-waiting entry. Returns the seats it was still waiting for, or ``None``."""
+    await lock_events(session, [event_id])
+    result = await session.execute(
+        text(
+            "UPDATE waitlist_entries SET status = 'canceled' "
+            "WHERE id = :entry_id AND event_id = :event_id AND user_id = :user_id AND status = 'waiting' "
+            "RETURNING seats_remaining"
+        ),
+        {"entry_id": entry_id, "event_id": event_id, "user_id": user_id},
+    )
+    return result.scalar_one_or_none()
@@ -0,0 +1,89 @@
+"""Cost of expanding one calendar window of a long-running series, without a database.
+
+Compares expanding only the requested window (what ``/resources/{id}/calendar``
+does) against walking the series from its first occurrence, and the cached
+``ResourceClock`` against converting every occurrence through zoneinfo.
+
+    python -m benchmarks.calendar_expansion --years 10 --window-days 7
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from app.models import EventSeries
+from app.resources.recurrence import RecurrenceRule
+from app.resources.service import series_occurrences
+from app.resources.timezones import ResourceClock, clock_for
+from benchmarks.common import percentile, print_results
+
+
+def _series(rrule: str, started: datetime) -> EventSeries:
+    return EventSeries(
+        id=uuid4(),
+        resource_id=uuid4(),
+        title="Standup",
+        rrule=rrule,
+        dtstart_local=started,
+        duration_minutes=30,
+        capacity=10,
+        created_by=uuid4(),
+    )
+
+
+def _windowed(series: EventSeries, clock: ResourceClock, start: datetime, end: datetime) -> int:
+    return sum(1 for _ in series_occurrences(series, clock, start, end))
+
+
+def _from_dtstart(series: EventSeries, clock: ResourceClock, start: datetime, end: datetime) -> int:
+    # Walk every occurrence since dtstart, converting each through zoneinfo
+    rule = RecurrenceRule.parse(series.rrule)
+    local_end = clock.to_local(end)
+    found = 0
+    for _, local in rule.between(series.dtstart_local, series.dtstart_local, local_end):
+        starts_at = local.replace(tzinfo=clock.zone).astimezone(timezone.utc)
+        if start <= starts_at < end:
+            found += 1
+    return found
+
+
+def _measure(expand: Callable[[], int], iterations: int) -> Dict[str, Any]:
+    samples: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        found = expand()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return {"p50_ms": round(percentile(samples, 50), 3), "p99_ms": round(percentile(samples, 99), 3), "occurrences": found}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rrule", default="FREQ=WEEKLY;BYDAY=MO,TU,WE,TH,FR")
+    parser.add_argument("--timezone", default="Europe/Berlin")
+    parser.add_argument("--years", type=int, default=10, help="how long the series has been running")
+    parser.add_argument("--window-days", type=int, default=7)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    clock = clock_for(args.timezone)
+    window_from = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    window_to = window_from + timedelta(days=args.window_days)
+    series = _series(args.rrule, clock.to_local(window_from).replace(hour=9) - timedelta(days=365 * args.years))
+
+    print_results(
+        {
+            "rrule": args.rrule,
+            "timezone": clock.name,
+            "series_years": args.years,
+            "window_days": args.window_days,
+            "windowed": _measure(lambda: _windowed(series, clock, window_from, window_to), args.iterations),
+            "from_dtstart": _measure(lambda: _from_dtstart(series, clock, window_from, window_to), args.iterations),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
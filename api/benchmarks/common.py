@@ -0,0 +1,126 @@
+"""Shared helpers for the API benchmarks.
+
+Run benchmarks from the ``api`` directory, e.g. ``python -m benchmarks.auth_me``,
+with ``DATABASE_URL`` pointing at a local Postgres that has the migrations applied.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+import uvicorn
+
+
+def percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    ms = [value * 1000.0 for value in latencies]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+    }
+
+
+@contextmanager
+def serve(app: Any, host: str = "127.0.0.1", port: int = 8765) -> Iterator[str]:
+    config = uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        yield f"http://{host}:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+async def _load(
+    url: str,
+    *,
+    method: str,
+    concurrency: int,
+    duration: float,
+    cookies: Optional[Dict[str, str]],
+    json_body: Optional[Dict[str, Any]],
+    json_bodies: Optional[Sequence[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    sent = 0
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(cookies=cookies, limits=limits, timeout=30.0) as client:
+
+        async def worker() -> None:
+            nonlocal errors, sent
+            while time.perf_counter() < deadline:
+                body = json_body
+                if json_bodies:
+                    body = json_bodies[sent % len(json_bodies)]
+                    sent += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.request(method, url, json=body)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return summarize(latencies, errors, elapsed)
+
+
+def run_load(
+    url: str,
+    *,
+    method: str = "GET",
+    concurrency: int = 64,
+    duration: float = 10.0,
+    cookies: Optional[Dict[str, str]] = None,
+    json_body: Optional[Dict[str, Any]] = None,
+    json_bodies: Optional[Sequence[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Drive ``url`` from ``concurrency`` clients for ``duration`` seconds.
+
+    ``json_bodies`` are sent round-robin across all clients, e.g. one login per user.
+    """
+    return asyncio.run(
+        _load(
+            url,
+            method=method,
+            concurrency=concurrency,
+            duration=duration,
+            cookies=cookies,
+            json_body=json_body,
+            json_bodies=json_bodies,
+        )
+    )
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,102 @@
+"""Cost of Idempotency-Key handling on POST /bookings, and duplicate suppression under retry storms.
+
+``plain`` books without the header, ``unique_keys`` sends a fresh key per
+request (one extra INSERT and UPDATE each), and ``retry_storm`` fires
+``--duplicates`` concurrent copies of each request with the same key. Every
+storm must produce exactly one booking per key, with the copies replayed.
+
+    python -m benchmarks.idempotency --requests 2000 --duplicates 8
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import httpx
+from sqlalchemy import text
+
+from app.db import get_engine
+from benchmarks.common import print_results, serve, summarize
+from benchmarks.suite import _create_fixtures, _login
+
+
+async def _post(
+    client: httpx.AsyncClient, url: str, body: Dict[str, Any], key: Optional[str], latencies: List[float]
+) -> httpx.Response:
+    started = time.perf_counter()
+    response = await client.post(url, json=body, headers={"Idempotency-Key": key} if key else None)
+    latencies.append(time.perf_counter() - started)
+    return response
+
+
+async def _scenario(
+    base_url: str, cookies: Dict[str, str], event_id: str, *, requests: int, concurrency: int, duplicates: int, keyed: bool
+) -> Dict[str, Any]:
+    url = f"{base_url}/bookings"
+    body = {"event_id": event_id, "seats": 1}
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    replayed = 0
+    pending = iter(range(requests))
+    limits = httpx.Limits(max_connections=concurrency * duplicates)
+
+    async with httpx.AsyncClient(cookies=cookies, limits=limits, timeout=30.0) as client:
+
+        async def worker() -> None:
+            nonlocal replayed
+            for _ in pending:
+                key = str(uuid.uuid4()) if keyed else None
+                responses = await asyncio.gather(*(_post(client, url, body, key, latencies) for _ in range(duplicates)))
+                for response in responses:
+                    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                    replayed += response.headers.get("idempotent-replayed") == "true"
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    errors = sum(count for status, count in statuses.items() if status >= 400)
+    result = summarize(latencies, errors, elapsed)
+    result["statuses"] = {str(status): count for status, count in sorted(statuses.items())}
+    result["replayed"] = replayed
+    return result
+
+
+def _bookings(event_id: str) -> int:
+    with get_engine().connect() as conn:
+        return conn.execute(text("SELECT count(*) FROM bookings WHERE event_id = :id"), {"id": event_id}).scalar_one()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="distinct requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duplicates", type=int, default=8, help="concurrent copies per request in retry_storm")
+    parser.add_argument("--password", default="suite-password")
+    args = parser.parse_args()
+
+    fixtures = _create_fixtures(1, args.password)
+    event_id = fixtures["event_id"]
+    os.environ.setdefault("RATELIMIT_ENABLED", "false")
+    from main import app
+
+    results: Dict[str, Any] = {}
+    with serve(app) as base_url:
+        cookies = {"access_token": _login(base_url, fixtures["emails"][0], args.password)["access_token"]}
+        load = {"requests": args.requests, "concurrency": args.concurrency}
+        for name, duplicates, keyed in (("plain", 1, False), ("unique_keys", 1, True), ("retry_storm", args.duplicates, True)):
+            before = _bookings(event_id)
+            results[name] = asyncio.run(
+                _scenario(base_url, cookies, event_id, duplicates=duplicates, keyed=keyed, **load)
+            )
+            results[name]["bookings_created"] = _bookings(event_id) - before
+        results["retry_storm"]["one_booking_per_key"] = results["retry_storm"]["bookings_created"] == args.requests
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Micro-benchmark of token encode/decode per JWT backend and verified-token cache hit rate.
+
+    python -m benchmarks.jwt_tokens --iterations 20000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from app.auth.security import JWT_BACKENDS, JWTSettings, create_access_token, decode_token
+from benchmarks.common import print_results
+
+HIT_RATES = (0.0, 0.5, 0.9, 0.99)
+
+
+def _bench_encode(settings: JWTSettings, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        create_access_token(settings, str(i))
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _bench_decode(backend: str, iterations: int, hit_rate: float) -> float:
+    settings = JWTSettings(secret_key="bench-secret", backend=backend, token_cache_size=iterations + 1)
+    hot = [create_access_token(settings, f"hot-{i}") for i in range(100)]
+    for token in hot:
+        decode_token(settings, token)
+    rng = random.Random(42)
+    tokens = [
+        rng.choice(hot) if rng.random() < hit_rate else create_access_token(settings, f"cold-{i}")
+        for i in range(iterations)
+    ]
+    started = time.perf_counter()
+    for token in tokens:
+        decode_token(settings, token)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = {}
+    for backend in JWT_BACKENDS:
+        settings = JWTSettings(secret_key="bench-secret", backend=backend)
+        results[backend] = {
+            "encode_us": round(_bench_encode(settings, args.iterations), 2),
+            **{
+                f"decode_us_hit_{int(rate * 100)}": round(_bench_decode(backend, args.iterations, rate), 2)
+                for rate in HIT_RATES
+            },
+        }
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
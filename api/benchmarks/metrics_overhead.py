@@ -0,0 +1,47 @@
+"""Per-request cost of MetricsMiddleware (and trace export, if TRACE_EXPORT is set) on ``GET /health``.
+
+Serves the real app twice in-process, once without the middleware, and
+drives both over HTTP with the same load.
+
+    python -m benchmarks.metrics_overhead --concurrency 32 --duration 10
+"""
+from __future__ import annotations
+
+import argparse
+
+from fastapi import FastAPI
+
+from app.metrics import MetricsMiddleware
+from benchmarks.common import print_results, run_load, serve
+
+
+def _without_metrics(app: FastAPI) -> FastAPI:
+    app.user_middleware = [m for m in app.user_middleware if m.cls is not MetricsMiddleware]
+    app.middleware_stack = app.build_middleware_stack()
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    from main import app
+
+    results = {}
+    with serve(app) as base_url:
+        run_load(base_url + "/health", concurrency=8, duration=1.0)  # warm-up
+        results["with_metrics"] = run_load(base_url + "/health", concurrency=args.concurrency, duration=args.duration)
+    with serve(_without_metrics(app)) as base_url:
+        run_load(base_url + "/health", concurrency=8, duration=1.0)
+        results["without_metrics"] = run_load(
+            base_url + "/health", concurrency=args.concurrency, duration=args.duration
+        )
+    baseline, instrumented = results["without_metrics"]["rps"], results["with_metrics"]["rps"]
+    results["throughput_overhead_pct"] = round((baseline - instrumented) / baseline * 100, 2) if baseline else None
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Per-request cost of the slowapi limiter with the configured storage.
+
+Drives two minimal in-process apps, one route limited and one not, through
+httpx's ASGI transport and reports the difference per request. Set
+RATELIMIT_STORAGE_URI to measure a shared store, e.g. redis://localhost:6379/0.
+
+    python -m benchmarks.ratelimit_overhead --requests 20000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from slowapi.middleware import SlowAPIMiddleware
+
+from app.auth.ratelimit import RATELIMIT_STORAGE_URI, RATELIMIT_STRATEGY, limiter
+from benchmarks.common import print_results
+
+
+def _build_app() -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_middleware(SlowAPIMiddleware)
+
+    @app.get("/plain")
+    async def plain(request: Request):
+        return {"ok": True}
+
+    @app.get("/limited")
+    @limiter.limit("1000000/minute")
+    async def limited(request: Request):
+        return {"ok": True}
+
+    return app
+
+
+async def _time(client: httpx.AsyncClient, path: str, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def _main(requests: int) -> dict:
+    transport = httpx.ASGITransport(app=_build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await _time(client, "/limited", 100)  # warm-up
+        plain_us = await _time(client, "/plain", requests)
+        limited_us = await _time(client, "/limited", requests)
+    return {
+        "storage": RATELIMIT_STORAGE_URI.split("@")[-1],
+        "strategy": RATELIMIT_STRATEGY,
+        "plain_us": round(plain_us, 2),
+        "limited_us": round(limited_us, 2),
+        "overhead_us": round(limited_us - plain_us, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    print_results(asyncio.run(_main(args.requests)))
+
+
+if __name__ == "__main__":
+    main()
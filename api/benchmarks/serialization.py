@@ -0,0 +1,93 @@
+"""Serialization cost of one events page, without a database or HTTP round trip.
+
+Compares the old default (``jsonable_encoder`` plus stdlib json), validating
+through the ``EventPage`` response model, and handing the rows to orjson as they are.
+
+    python -m benchmarks.serialization --rows 500 --iterations 2000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.events.list import EventPage
+from app.events.service import DEFAULT_EVENT_FIELDS
+from benchmarks.common import percentile, print_results
+
+
+def _page(rows: int) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    creator = uuid4()
+    data = []
+    for i in range(rows):
+        starts_at = now + timedelta(hours=i)
+        row = {
+            "id": uuid4(),
+            "title": f"Event {i}",
+            "starts_at": starts_at,
+            "ends_at": starts_at + timedelta(hours=1),
+            "location": "Main hall",
+            "capacity": 100,
+            "seats_booked": i % 100,
+            "status": "published",
+            "created_by": creator,
+            "resource_id": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        data.append({name: row[name] for name in DEFAULT_EVENT_FIELDS})
+    return {"data": data, "pagination": {"limit": rows, "next_cursor": None}}
+
+
+def _stdlib(payload: Dict[str, Any]) -> bytes:
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+def _response_model(payload: Dict[str, Any]) -> bytes:
+    return EventPage.model_validate(payload).model_dump_json(exclude_unset=True).encode()
+
+
+def _orjson(payload: Dict[str, Any]) -> bytes:
+    return ORJSONResponse(payload).body
+
+
+def _measure(render: Callable[[Dict[str, Any]], bytes], payload: Dict[str, Any], iterations: int) -> Dict[str, Any]:
+    for _ in range(min(50, iterations)):
+        render(payload)
+    samples: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        body = render(payload)
+        samples.append((time.perf_counter() - started) * 1000.0)
+    return {
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "bytes": len(body),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    payload = _page(args.rows)
+    print_results(
+        {
+            "rows": args.rows,
+            "stdlib_jsonable_encoder": _measure(_stdlib, payload, args.iterations),
+            "pydantic_response_model": _measure(_response_model, payload, args.iterations),
+            "orjson_direct": _measure(_orjson, payload, args.iterations),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
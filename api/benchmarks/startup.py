@@ -0,0 +1,101 @@
+"""Cold-start cost: ``import main`` profiled with ``-X importtime``, and time to first request served.
+
+Each run starts a fresh ``uvicorn main:app`` process and polls ``/health``
+until it answers; uvicorn only accepts connections once the lifespan
+startup (engine, bcrypt backend, DB warm-up) has finished. Exits non-zero
+when the median of either measurement is over its budget.
+
+    python -m benchmarks.startup --runs 5 --import-budget-ms 1500 --first-request-budget-ms 3000
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+from benchmarks.common import print_results
+
+
+def _import_profile(module: str) -> Tuple[float, List[Dict[str, Any]]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        entries.append({"module": name, "self_ms": int(self_us) / 1000.0, "cumulative_ms": int(cumulative_us) / 1000.0})
+        if name == module:
+            total_us = int(cumulative_us)
+    entries.sort(key=lambda entry: entry["self_ms"], reverse=True)
+    return total_us / 1000.0, entries
+
+
+def _time_to_first_request(port: int, timeout: float) -> float:
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < timeout:
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                        return (time.perf_counter() - started) * 1000.0
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"server did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--import-budget-ms", type=float, default=1500.0)
+    parser.add_argument("--first-request-budget-ms", type=float, default=3000.0)
+    args = parser.parse_args()
+
+    import_ms = []
+    for _ in range(args.runs):
+        total, entries = _import_profile("main")
+        import_ms.append(total)
+    first_request_ms = [_time_to_first_request(args.port, timeout=30.0) for _ in range(args.runs)]
+
+    results = {
+        "import_main_ms": round(statistics.median(import_ms), 1),
+        "first_request_ms": round(statistics.median(first_request_ms), 1),
+        "budgets_ms": {"import_main": args.import_budget_ms, "first_request": args.first_request_budget_ms},
+        "slowest_imports": [
+            {key: round(value, 1) if isinstance(value, float) else value for key, value in entry.items()}
+            for entry in entries[: args.top]
+        ],
+    }
+    print_results(results)
+
+    over = []
+    if results["import_main_ms"] > args.import_budget_ms:
+        over.append(f"import main {results['import_main_ms']} ms > {args.import_budget_ms} ms")
+    if results["first_request_ms"] > args.first_request_budget_ms:
+        over.append(f"first request {results['first_request_ms']} ms > {args.first_request_budget_ms} ms")
+    if over:
+        sys.exit("Startup budget exceeded: " + "; ".join(over))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""End-to-end load scenarios with JSON results and a regression check against a baseline.
+
+Scenarios: ``login`` (a storm of logins across many users), ``me`` (steady
+``/auth/me`` with one token), ``refresh`` and ``booking`` (every client booking
+seats on the same event). Results are written as JSON; with a baseline file
+present, any scenario whose throughput or latency is worse than the baseline by
+more than ``--tolerance`` fails the run with exit status 1.
+
+Start Postgres (``docker-compose up -d db`` or a local binary), apply the
+migrations and, for realistic table sizes, load data with ``make db/seed-bulk``.
+Then, from ``api/``:
+
+    python -m benchmarks.suite --save-baseline      # on the reference commit
+    python -m benchmarks.suite                      # on the change, compared to it
+
+Without ``--url`` the app is served in-process with rate limiting off. When
+pointing at a running server, start it with ``RATELIMIT_ENABLED=false``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import uuid
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import httpx
+from sqlalchemy import text
+
+from app.auth.security import hash_password
+from app.db import get_engine
+from benchmarks.common import print_results, run_load, serve
+
+SCENARIOS = ("login", "me", "refresh", "booking")
+RESULTS_DIR = Path(__file__).parent / "results"
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+# Capacity of the contention event; far more than a run can book
+BOOKING_CAPACITY = 10_000_000
+
+
+def _create_fixtures(users: int, password: str) -> Dict[str, Any]:
+    run = uuid.uuid4().hex[:8]
+    password_hash = hash_password(password)
+    rows = [
+        {"id": uuid.uuid4(), "email": f"suite-{run}-{i}@example.com", "password_hash": password_hash}
+        for i in range(users)
+    ]
+    event_id = uuid.uuid4()
+    starts = datetime.now(timezone.utc) + timedelta(days=1)
+    with get_engine().begin() as conn:
+        conn.execute(
+            text("INSERT INTO users (id, email, password_hash, role) VALUES (:id, :email, :password_hash, 'user')"),
+            rows,
+        )
+        conn.execute(
+            text(
+                "INSERT INTO events (id, title, starts_at, ends_at, capacity, status, created_by) "
+                "VALUES (:id, 'Suite contention', :starts, :ends, :capacity, 'published', :user_id)"
+            ),
+            {
+                "id": event_id,
+                "starts": starts,
+                "ends": starts + timedelta(hours=2),
+                "capacity": BOOKING_CAPACITY,
+                "user_id": rows[0]["id"],
+            },
+        )
+    return {"emails": [row["email"] for row in rows], "event_id": str(event_id)}
+
+
+def _login(base_url: str, email: str, password: str) -> Dict[str, str]:
+    response = httpx.post(f"{base_url}/auth/login", json={"email": email, "password": password}, timeout=30.0)
+    response.raise_for_status()
+    return {name: response.cookies[name] for name in ("access_token", "refresh_token")}
+
+
+def run_scenarios(base_url: str, fixtures: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    cookies = _login(base_url, fixtures["emails"][0], args.password)
+    access = {"access_token": cookies["access_token"]}
+    load = {"concurrency": args.concurrency, "duration": args.duration}
+    scenarios: Dict[str, Callable[[], Dict[str, Any]]] = {
+        "login": lambda: run_load(
+            f"{base_url}/auth/login",
+            method="POST",
+            json_bodies=[{"email": email, "password": args.password} for email in fixtures["emails"]],
+            **load,
+        ),
+        "me": lambda: run_load(f"{base_url}/auth/me", cookies=access, **load),
+        "refresh": lambda: run_load(
+            f"{base_url}/auth/refresh", method="POST", cookies={"refresh_token": cookies["refresh_token"]}, **load
+        ),
+        "booking": lambda: run_load(
+            f"{base_url}/bookings",
+            method="POST",
+            cookies=access,
+            json_body={"event_id": fixtures["event_id"], "seats": 1},
+            **load,
+        ),
+    }
+    results = {}
+    for name in args.scenarios:
+        print(f"running {name} ...", file=sys.stderr)
+        results[name] = scenarios[name]()
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    """Regressions of ``results`` against ``baseline``, one message each."""
+    regressions = []
+    for name, base in baseline.get("scenarios", {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{name}: rps {current['rps']} < baseline {base['rps']}")
+        for key in ("p50_ms", "p99_ms"):
+            if current[key] - base[key] > max(base[key] * tolerance, min_delta_ms):
+                regressions.append(f"{name}: {key} {current[key]} > baseline {base[key]}")
+        base_error_rate = base["errors"] / max(base["requests"] + base["errors"], 1)
+        error_rate = current["errors"] / max(current["requests"] + current["errors"], 1)
+        if error_rate > base_error_rate + 0.01:
+            regressions.append(f"{name}: error rate {error_rate:.1%} > baseline {base_error_rate:.1%}")
+    return regressions
+
+
+def _git_revision() -> str:
+    try:
+        completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return completed.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="benchmark an already running API instead of serving it in-process")
+    parser.add_argument("--scenarios", type=lambda raw: raw.split(","), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=200, help="users created for the login storm")
+    parser.add_argument("--password", default="suite-password")
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/suite-<time>.json)")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression (default: 15%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="ignore latency changes smaller than this")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    fixtures = _create_fixtures(args.users, args.password)
+    if args.url:
+        server = nullcontext(args.url.rstrip("/"))
+    else:
+        os.environ.setdefault("RATELIMIT_ENABLED", "false")
+        from main import app
+
+        server = serve(app)
+    with server as base_url:
+        scenarios = run_scenarios(base_url, fixtures, args)
+
+    started_at = datetime.now(timezone.utc)
+    results = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "users": args.users,
+        },
+        "scenarios": scenarios,
+    }
+    output = args.output or RESULTS_DIR / f"suite-{started_at:%Y%m%dT%H%M%SZ}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print_results(results)
+    print(f"results written to {output}", file=sys.stderr)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return
+    if not args.baseline.exists():
+        print("no baseline to compare against; run with --save-baseline first", file=sys.stderr)
+        return
+    regressions = compare(results["scenarios"], json.loads(args.baseline.read_text()), args.tolerance, args.min_delta_ms)
+    if regressions:
+        sys.exit("Regressions against baseline:\n  " + "\n  ".join(regressions))
+    print("no regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Per-request cost of the revoked-token check, against the denylist size.
+
+Each size reports the in-process ``is_revoked`` lookup for a live token (the
+common case) and a revoked one, next to a cached ``decode_token`` for scale.
+With ``--db`` it also times the alternative the denylist replaces: a primary
+key lookup in ``revoked_tokens`` per request (needs Postgres and the migrations).
+
+    python -m benchmarks.token_revocation --iterations 200000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.auth.revocation import TokenDenylist
+from app.auth.security import JWTSettings, create_access_token, decode_token
+from benchmarks.common import print_results
+
+SIZES = (0, 10_000, 100_000, 1_000_000)
+
+
+def _per_call_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _bench_db(iterations: int) -> float:
+    from app.db import get_engine
+
+    query = text("SELECT EXISTS (SELECT 1 FROM revoked_tokens WHERE id IN (:jti, :sid))")
+    params = {"jti": uuid.uuid4(), "sid": uuid.uuid4()}
+    with get_engine().connect() as conn:
+        return _per_call_us(lambda: conn.execute(query, params).scalar_one(), iterations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200_000)
+    parser.add_argument("--db", action="store_true", help="also time a revoked_tokens query per request")
+    args = parser.parse_args()
+
+    settings = JWTSettings(secret_key="bench-secret")
+    token = create_access_token(settings, str(uuid.uuid4()), claims={"sid": str(uuid.uuid4())})
+    live = decode_token(settings, token)
+    expires_at = time.time() + 3600
+
+    results = {"decode_token_cached_us": round(_per_call_us(lambda: decode_token(settings, token), args.iterations), 3)}
+    for size in SIZES:
+        denylist = TokenDenylist()
+        revoked_ids = [str(uuid.uuid4()) for _ in range(size)]
+        started = time.perf_counter()
+        # Spread over the hour, as real revocations expire
+        for i, revoked_id in enumerate(revoked_ids):
+            denylist.add(revoked_id, expires_at + i * 3600 / max(size, 1))
+        load_s = time.perf_counter() - started
+        revoked = {"jti": revoked_ids[-1]} if revoked_ids else live
+        results[f"denylist_{size}"] = {
+            "live_us": round(_per_call_us(lambda: denylist.is_revoked(live), args.iterations), 3),
+            "revoked_us": round(_per_call_us(lambda: denylist.is_revoked(revoked), args.iterations), 3),
+            "add_us": round(load_s / max(size, 1) * 1e6, 3),
+        }
+        started = time.perf_counter()
+        denylist.prune(now=expires_at + 3600)
+        results[f"denylist_{size}"]["prune_us"] = round((time.perf_counter() - started) / max(size, 1) * 1e6, 3)
+    if args.db:
+        results["db_lookup_us"] = round(_bench_db(min(args.iterations, 5000)), 1)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,119 @@
 from fastapi import FastAPI
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.metrics import METRICS_CONTENT_TYPE, MetricsMiddleware, render_metrics
+from app.db import READ_YOUR_WRITES_SECONDS, ReadYourWritesMiddleware, dispose_engines, get_async_engine, replicas
+from app.fastpath import FastPathMiddleware
+from app.health import ReadinessProbe
+from app.idempotency import IdempotencyMiddleware, IdempotencyPurger, make_store
 from contextlib import asynccontextmanager
+import logging
 import os
 "Просто текст ради теста фетча"
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     print("Starting up FastAPI application...")
+    from app.auth.hashing import hash_pool
+    from app.auth.deps import get_jwt_settings
+    from app.auth.security import warm_password_backend
+    from app.auth.revocation import revocation_sync
+    from app.events.notifier import availability_hub, availability_listener
+    from app.jobs.worker import job_worker
+    from app.bookings.sweeper import hold_sweeper
+    # Build and warm everything the first request would otherwise pay for
+    get_async_engine()
+    warm_password_backend()
+    hash_pool.warm()
+    get_jwt_settings()
+    await readiness.is_ready()
+    # Reads stay on the primary until a replica has passed a check
+    await replicas.check()
+    replicas.start()
+    # Load the revoked tokens before serving, so no request is checked against an empty denylist
+    await revocation_sync.refresh()
+    revocation_sync.start()
+    availability_hub.start()
+    if os.getenv("AVAILABILITY_LISTEN", "true").lower() in ("1", "true", "yes"):
+        availability_listener.start()
+    if job_worker.concurrency > 0:
+        job_worker.start()
+    if os.getenv("HOLD_SWEEPER", "true").lower() in ("1", "true", "yes"):
+        hold_sweeper.start()
+    idempotency_purger.start()
     yield
     # Shutdown
     print("Shutting down FastAPI application...")
+    await idempotency_purger.stop()
+    await revocation_sync.stop()
+    await hold_sweeper.stop()
+    await job_worker.stop()
+    await availability_listener.stop()
+    await availability_hub.stop()
+    await replicas.stop()
+    await dispose_engines()
+    hash_pool.shutdown()
 
 app = FastAPI(
     title="Booking API",
     description="A booking system API",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Retried writes with an Idempotency-Key get the first response back. Added first, so
+# it sits innermost and replays still pass through CORS, rate limiting and metrics
+idempotency_store = make_store(os.getenv("IDEMPOTENCY_STORE", "postgres"))
+idempotency_purger = IdempotencyPurger(
+    idempotency_store,
+    interval=float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL", "60")),
+    batch_size=int(os.getenv("IDEMPOTENCY_PURGE_BATCH", "1000")),
+)
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency_store,
+    routes=[
+        ("POST", "/auth/register"),
+        ("POST", "/bookings"),
+        ("POST", "/bookings:batch"),
+        ("POST", "/bookings:hold"),
+    ],
+    ttl=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+    lease=float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "30")),
+    wait=float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "10")),
+)
+
+# Read-only routes use replicas when configured; clients that just wrote are pinned to the primary
+if replicas.urls and READ_YOUR_WRITES_SECONDS > 0:
+    app.add_middleware(ReadYourWritesMiddleware, seconds=READ_YOUR_WRITES_SECONDS)
+
 # Configure CORS
 frontend_origin = os.getenv("FRONTEND_ORIGIN", "http://localhost:3000")
 allowed_origins = [frontend_origin, "http://web:3000"]
+# Off unless a deployment opts in: with credentials allowed, a broad pattern such as every
+# *.app.github.dev origin would let other people's sites make authenticated requests
+allowed_origin_regex = os.getenv("FRONTEND_ORIGIN_REGEX") or None
+cors_max_age = int(os.getenv("CORS_MAX_AGE", "600"))
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
-    allow_origin_regex=os.getenv("FRONTEND_ORIGIN_REGEX", r"^https://.*\\.app\\.github\\.dev$"),
+    allow_origin_regex=allowed_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=cors_max_age,
 )
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to Booking API"}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(render_metrics(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "service": "api"}
@@ -45,30 +123,103 @@ async def health_check():
 async def cors_preflight(rest_of_path: str):
     return Response(status_code=204)
 
-# Routers
+# Routers. Imported eagerly on purpose: they must be registered before uvicorn accepts
+# connections, so deferring them to the lifespan would move their import cost, not remove
+# it. Almost all of `import main` is FastAPI, pydantic and SQLAlchemy, which the app needs
+# anyway; see benchmarks/startup.py for the breakdown and the time-to-first-request budget
 from app.auth.register import router as register_router  # noqa: E402
 from app.auth.login import router as login_router  # noqa: E402
 from app.auth.logout import router as logout_router  # noqa: E402
 from app.auth.me import router as me_router  # noqa: E402
 from app.auth.refresh import router as refresh_router  # noqa: E402
-from app.auth.ratelimit import limiter  # noqa: E402
+from app.bookings.create import router as bookings_router  # noqa: E402
+from app.bookings.batch import router as bookings_batch_router  # noqa: E402
+from app.bookings.cancel import router as bookings_cancel_router  # noqa: E402
+from app.bookings.hold import router as bookings_hold_router  # noqa: E402
+from app.events.list import router as events_router  # noqa: E402
+from app.events.availability import router as availability_router  # noqa: E402
+from app.events.capacity import router as capacity_router  # noqa: E402
+from app.waitlist.join import router as waitlist_router  # noqa: E402
+from app.resources.free_slots import router as free_slots_router  # noqa: E402
+from app.resources.calendar import router as calendar_router  # noqa: E402
+from app.resources.series import router as series_router  # noqa: E402
+from app.resources.service import is_exclusion_violation  # noqa: E402
+from app.auth.ratelimit import RATELIMIT_STORAGE_URI, limiter  # noqa: E402
+from slowapi import _rate_limit_exceeded_handler  # noqa: E402
 from slowapi.errors import RateLimitExceeded  # noqa: E402
 from slowapi.middleware import SlowAPIMiddleware  # noqa: E402
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError  # noqa: E402
+
+# statement_timeout expired
+QUERY_CANCELED = "57014"
 
 app.include_router(register_router)
 app.include_router(login_router)
 app.include_router(logout_router)
 app.include_router(me_router)
 app.include_router(refresh_router)
+app.include_router(bookings_router)
+app.include_router(bookings_batch_router)
+app.include_router(bookings_cancel_router)
+app.include_router(bookings_hold_router)
+app.include_router(events_router)
+app.include_router(availability_router)
+app.include_router(capacity_router)
+app.include_router(waitlist_router)
+app.include_router(free_slots_router)
+app.include_router(calendar_router)
+app.include_router(series_router)
 
 # Rate limiting
 app.state.limiter = limiter
 app.add_middleware(SlowAPIMiddleware)
 
+# Wraps everything but the fast path below and times the whole request
+app.add_middleware(MetricsMiddleware)
+
+# Probes and preflights are answered before any other middleware runs
+readiness = ReadinessProbe(
+    get_async_engine,
+    cache_seconds=float(os.getenv("READINESS_CACHE_SECONDS", "2")),
+    timeout=float(os.getenv("READINESS_TIMEOUT", "1")),
+)
+app.add_middleware(
+    FastPathMiddleware,
+    allow_origins=allowed_origins,
+    allow_origin_regex=allowed_origin_regex,
+    max_age=cors_max_age,
+    readiness=readiness,
+)
+
 @app.exception_handler(RateLimitExceeded)
 async def ratelimit_handler(request, exc):
-    return await limiter._rate_limit_exceeded_handler(request, exc)
+    return _rate_limit_exceeded_handler(request, exc)
+
+# Fail fast when the database is saturated instead of letting requests pile up
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request, exc):
+    return JSONResponse({"detail": "Database busy, try again shortly"}, status_code=503, headers={"Retry-After": "1"})
+
+@app.exception_handler(DBAPIError)
+async def dbapi_error_handler(request, exc):
+    if getattr(exc.orig, "pgcode", None) == QUERY_CANCELED:
+        return JSONResponse({"detail": "Database query timed out"}, status_code=503, headers={"Retry-After": "1"})
+    if is_exclusion_violation(exc):
+        return JSONResponse({"detail": "Resource is already booked for that time"}, status_code=409)
+    raise exc
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    if workers > 1 and RATELIMIT_STORAGE_URI.startswith("memory://"):
+        logging.getLogger(__name__).warning("Rate limits are per worker; set RATELIMIT_STORAGE_URI to share them")
+    uvicorn.run(
+        # An import string lets uvicorn spawn worker processes
+        "main:app",
+        host=os.getenv("API_HOST", "0.0.0.0"),
+        port=int(os.getenv("API_PORT", "8000")),
+        workers=workers,
+        backlog=int(os.getenv("API_BACKLOG", "2048")),
+        timeout_keep_alive=int(os.getenv("API_KEEPALIVE", "5")),
+    )
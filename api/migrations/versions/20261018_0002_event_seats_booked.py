@@ -0,0 +1,151 @@
+"""maintained seats_booked counter on events
+
+Replaces the prevent_overbooking() trigger, which locked the event row and
+summed every active booking on each write, with a counter that is moved by a
+single conditional UPDATE per booking write.
+
+Revision ID: 20261018_0002
+Revises: 20251018_0001
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0002"
+down_revision: Union[str, None] = "20251018_0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("seats_booked", sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute(sa.text("DROP TRIGGER IF EXISTS bookings_prevent_overbooking_upd ON bookings;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS bookings_prevent_overbooking_ins ON bookings;"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS prevent_overbooking();"))
+
+    # Backfill while writers are blocked, so the counter matches the bookings it summarizes
+    op.execute(sa.text("LOCK TABLE bookings IN SHARE ROW EXCLUSIVE MODE;"))
+    op.execute(
+        sa.text(
+            """
+            UPDATE events e
+               SET seats_booked = b.active_seats
+              FROM (
+                SELECT event_id, SUM(seats) AS active_seats
+                  FROM bookings
+                 WHERE status = 'active'
+                 GROUP BY event_id
+              ) b
+             WHERE b.event_id = e.id;
+            """
+        )
+    )
+    op.create_check_constraint(
+        "events_seats_booked_chk", "events", "seats_booked >= 0 AND seats_booked <= capacity"
+    )
+
+    op.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION bookings_maintain_seats_booked() RETURNS TRIGGER AS $$
+            DECLARE
+              old_seats int := 0;
+              new_seats int := 0;
+              target_event uuid;
+              delta int;
+            BEGIN
+              IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.status = 'active' THEN
+                  old_seats := OLD.seats;
+                END IF;
+                target_event := OLD.event_id;
+              END IF;
+              IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.status = 'active' THEN
+                  new_seats := NEW.seats;
+                END IF;
+                IF TG_OP = 'UPDATE' AND NEW.event_id <> OLD.event_id THEN
+                  UPDATE events SET seats_booked = seats_booked - old_seats WHERE id = OLD.event_id;
+                  old_seats := 0;
+                END IF;
+                target_event := NEW.event_id;
+              END IF;
+
+              delta := new_seats - old_seats;
+              IF delta > 0 THEN
+                UPDATE events
+                   SET seats_booked = seats_booked + delta
+                 WHERE id = target_event
+                   AND seats_booked + delta <= capacity;
+                IF NOT FOUND THEN
+                  RAISE EXCEPTION 'Capacity exceeded for event %', target_event USING ERRCODE = '23514';
+                END IF;
+              ELSIF delta < 0 THEN
+                UPDATE events SET seats_booked = seats_booked + delta WHERE id = target_event;
+              END IF;
+
+              IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+              END IF;
+              RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER bookings_maintain_seats_booked
+            BEFORE INSERT OR UPDATE OR DELETE ON bookings
+            FOR EACH ROW EXECUTE FUNCTION bookings_maintain_seats_booked();
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP TRIGGER IF EXISTS bookings_maintain_seats_booked ON bookings;"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS bookings_maintain_seats_booked();"))
+    op.drop_constraint("events_seats_booked_chk", "events", type_="check")
+    op.drop_column("events", "seats_booked")
+
+    op.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION prevent_overbooking() RETURNS TRIGGER AS $$
+            DECLARE
+              current_capacity int;
+              active_booked int;
+            BEGIN
+              PERFORM 1 FROM events WHERE id = NEW.event_id FOR UPDATE;
+
+              SELECT capacity INTO current_capacity FROM events WHERE id = NEW.event_id;
+
+              SELECT COALESCE(SUM(seats), 0) INTO active_booked
+                FROM bookings
+               WHERE event_id = NEW.event_id
+                 AND status = 'active'
+                 AND (TG_OP <> 'UPDATE' OR id <> NEW.id);
+
+              IF (NEW.status = 'active') THEN
+                IF (active_booked + NEW.seats) > current_capacity THEN
+                  RAISE EXCEPTION 'Capacity exceeded for event %: %/% seats', NEW.event_id, active_booked + NEW.seats, current_capacity USING ERRCODE = '23514';
+                END IF;
+              END IF;
+
+              RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER bookings_prevent_overbooking_ins
+            BEFORE INSERT ON bookings
+            FOR EACH ROW EXECUTE FUNCTION prevent_overbooking();
+
+            CREATE TRIGGER bookings_prevent_overbooking_upd
+            BEFORE UPDATE ON bookings
+            FOR EACH ROW EXECUTE FUNCTION prevent_overbooking();
+            """
+        )
+    )
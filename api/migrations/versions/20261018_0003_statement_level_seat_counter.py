@@ -0,0 +1,151 @@
+"""statement-level seats_booked maintenance
+
+Moves counter maintenance from a per-row trigger to per-statement triggers
+over transition tables, so a multi-row booking INSERT moves each event's
+counter with one UPDATE. Capacity is enforced by events_seats_booked_chk,
+which raises the same SQLSTATE 23514 as before.
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0003"
+down_revision: Union[str, None] = "20261018_0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(sa.text("DROP TRIGGER IF EXISTS bookings_maintain_seats_booked ON bookings;"))
+
+    op.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION bookings_apply_seat_deltas() RETURNS TRIGGER AS $$
+            BEGIN
+              IF TG_OP = 'INSERT' THEN
+                UPDATE events e
+                   SET seats_booked = e.seats_booked + d.delta
+                  FROM (
+                    SELECT event_id, SUM(seats) AS delta
+                      FROM new_rows
+                     WHERE status = 'active'
+                     GROUP BY event_id
+                  ) d
+                 WHERE e.id = d.event_id;
+              ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE events e
+                   SET seats_booked = e.seats_booked + d.delta
+                  FROM (
+                    SELECT event_id, SUM(delta) AS delta
+                      FROM (
+                        SELECT event_id, seats AS delta FROM new_rows WHERE status = 'active'
+                        UNION ALL
+                        SELECT event_id, -seats FROM old_rows WHERE status = 'active'
+                      ) changes
+                     GROUP BY event_id
+                    HAVING SUM(delta) <> 0
+                  ) d
+                 WHERE e.id = d.event_id;
+              ELSE
+                UPDATE events e
+                   SET seats_booked = e.seats_booked - d.delta
+                  FROM (
+                    SELECT event_id, SUM(seats) AS delta
+                      FROM old_rows
+                     WHERE status = 'active'
+                     GROUP BY event_id
+                  ) d
+                 WHERE e.id = d.event_id;
+              END IF;
+              RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER bookings_seats_booked_ins
+            AFTER INSERT ON bookings
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bookings_apply_seat_deltas();
+
+            CREATE TRIGGER bookings_seats_booked_upd
+            AFTER UPDATE ON bookings
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bookings_apply_seat_deltas();
+
+            CREATE TRIGGER bookings_seats_booked_del
+            AFTER DELETE ON bookings
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION bookings_apply_seat_deltas();
+            """
+        )
+    )
+    op.execute(sa.text("DROP FUNCTION IF EXISTS bookings_maintain_seats_booked();"))
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP TRIGGER IF EXISTS bookings_seats_booked_del ON bookings;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS bookings_seats_booked_upd ON bookings;"))
+    op.execute(sa.text("DROP TRIGGER IF EXISTS bookings_seats_booked_ins ON bookings;"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS bookings_apply_seat_deltas();"))
+
+    op.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION bookings_maintain_seats_booked() RETURNS TRIGGER AS $$
+            DECLARE
+              old_seats int := 0;
+              new_seats int := 0;
+              target_event uuid;
+              delta int;
+            BEGIN
+              IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                IF OLD.status = 'active' THEN
+                  old_seats := OLD.seats;
+                END IF;
+                target_event := OLD.event_id;
+              END IF;
+              IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                IF NEW.status = 'active' THEN
+                  new_seats := NEW.seats;
+                END IF;
+                IF TG_OP = 'UPDATE' AND NEW.event_id <> OLD.event_id THEN
+                  UPDATE events SET seats_booked = seats_booked - old_seats WHERE id = OLD.event_id;
+                  old_seats := 0;
+                END IF;
+                target_event := NEW.event_id;
+              END IF;
+
+              delta := new_seats - old_seats;
+              IF delta > 0 THEN
+                UPDATE events
+                   SET seats_booked = seats_booked + delta
+                 WHERE id = target_event
+                   AND seats_booked + delta <= capacity;
+                IF NOT FOUND THEN
+                  RAISE EXCEPTION 'Capacity exceeded for event %', target_event USING ERRCODE = '23514';
+                END IF;
+              ELSIF delta < 0 THEN
+                UPDATE events SET seats_booked = seats_booked + delta WHERE id = target_event;
+              END IF;
+
+              IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+              END IF;
+              RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER bookings_maintain_seats_booked
+            BEFORE INSERT OR UPDATE OR DELETE ON bookings
+            FOR EACH ROW EXECUTE FUNCTION bookings_maintain_seats_booked();
+            """
+        )
+    )
@@ -0,0 +1,42 @@
+"""composite indexes backing keyset pagination of events
+
+Revision ID: 20261018_0004
+Revises: 20261018_0003
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0004"
+down_revision: Union[str, None] = "20261018_0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_events_status_starts_at_id",
+            "events",
+            ["status", "starts_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_events_resource_starts_at_id",
+            "events",
+            ["resource_id", "starts_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_events_resource_starts_at_id", table_name="events", postgresql_concurrently=True)
+        op.drop_index("ix_events_status_starts_at_id", table_name="events", postgresql_concurrently=True)
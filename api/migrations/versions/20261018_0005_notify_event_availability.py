@@ -0,0 +1,52 @@
+"""NOTIFY event_availability when an event's seat counts change
+
+Revision ID: 20261018_0005
+Revises: 20261018_0004
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0005"
+down_revision: Union[str, None] = "20261018_0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Delivered at commit, once per distinct payload per transaction
+    op.execute(
+        sa.text(
+            """
+            CREATE OR REPLACE FUNCTION events_notify_availability() RETURNS TRIGGER AS $$
+            BEGIN
+              PERFORM pg_notify(
+                'event_availability',
+                json_build_object(
+                  'event_id', NEW.id,
+                  'capacity', NEW.capacity,
+                  'seats_booked', NEW.seats_booked
+                )::text
+              );
+              RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            CREATE TRIGGER events_notify_availability
+            AFTER UPDATE OF seats_booked, capacity ON events
+            FOR EACH ROW
+            WHEN (OLD.seats_booked IS DISTINCT FROM NEW.seats_booked OR OLD.capacity IS DISTINCT FROM NEW.capacity)
+            EXECUTE FUNCTION events_notify_availability();
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP TRIGGER IF EXISTS events_notify_availability ON events;"))
+    op.execute(sa.text("DROP FUNCTION IF EXISTS events_notify_availability();"))
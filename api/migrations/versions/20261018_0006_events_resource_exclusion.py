@@ -0,0 +1,47 @@
+"""no overlapping events per resource: tstzrange column and GiST exclusion constraint
+
+The GiST index behind the constraint also serves overlap lookups of a
+resource's schedule (``resource_id = ? AND during && ?``). Adding the
+generated column rewrites the events table, and the constraint fails to
+build if overlapping active events already exist.
+
+Revision ID: 20261018_0006
+Revises: 20261018_0005
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0006"
+down_revision: Union[str, None] = "20261018_0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Provides GiST support for "resource_id WITH ="
+    op.execute(sa.text("CREATE EXTENSION IF NOT EXISTS btree_gist;"))
+    op.execute(
+        sa.text(
+            """
+            ALTER TABLE events
+              ADD COLUMN during tstzrange
+              GENERATED ALWAYS AS (tstzrange(starts_at, ends_at, '[)')) STORED;
+
+            ALTER TABLE events
+              ADD CONSTRAINT events_resource_no_overlap
+              EXCLUDE USING gist (resource_id WITH =, during WITH &&)
+              WHERE (resource_id IS NOT NULL AND status <> 'canceled');
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(sa.text("ALTER TABLE events DROP CONSTRAINT IF EXISTS events_resource_no_overlap;"))
+    op.execute(sa.text("ALTER TABLE events DROP COLUMN IF EXISTS during;"))
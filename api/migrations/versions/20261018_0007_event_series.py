@@ -0,0 +1,68 @@
+"""recurring event series, materialized into events up to a rolling horizon
+
+Revision ID: 20261018_0007
+Revises: 20261018_0006
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0007"
+down_revision: Union[str, None] = "20261018_0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_series",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column(
+            "resource_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("resources.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("rrule", sa.String(), nullable=False),
+        sa.Column("dtstart_local", sa.DateTime(timezone=False), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("capacity", sa.Integer(), nullable=False),
+        sa.Column("created_by", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("materialized_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+    op.create_index("ix_event_series_resource_id", "event_series", ["resource_id"])
+    op.create_check_constraint("event_series_duration_pos_chk", "event_series", "duration_minutes > 0")
+    op.create_check_constraint("event_series_capacity_nonneg_chk", "event_series", "capacity >= 0")
+
+    op.add_column(
+        "events",
+        sa.Column(
+            "series_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("event_series.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+    # Makes materialization idempotent: re-expanding a range inserts nothing twice
+    op.create_index(
+        "ux_events_series_starts_at",
+        "events",
+        ["series_id", "starts_at"],
+        unique=True,
+        postgresql_where=sa.text("series_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ux_events_series_starts_at", table_name="events")
+    op.drop_column("events", "series_id")
+    op.drop_table("event_series")
@@ -0,0 +1,49 @@
+"""jobs table: a transactional outbox consumed with SELECT ... FOR UPDATE SKIP LOCKED
+
+Revision ID: 20261018_0008
+Revises: 20261018_0007
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0008"
+down_revision: Union[str, None] = "20261018_0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.BigInteger(), sa.Identity(), primary_key=True, nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("payload", postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("status", sa.String(), nullable=False, server_default="queued"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="10"),
+        # Next time the job may be picked: its retry time while queued, its lease expiry while running
+        sa.Column("run_after", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+    op.create_check_constraint("jobs_status_chk", "jobs", "status IN ('queued', 'running', 'failed')")
+    # Finished jobs are deleted, so this only covers pending work and stays small
+    op.create_index(
+        "ix_jobs_pending",
+        "jobs",
+        ["run_after", "id"],
+        postgresql_where=sa.text("status IN ('queued', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_jobs_pending", table_name="jobs")
+    op.drop_table("jobs")
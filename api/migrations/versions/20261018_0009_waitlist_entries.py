@@ -0,0 +1,86 @@
+"""waitlist_entries: per-event FIFO of seat requests, filled as seats free up
+
+Revision ID: 20261018_0009
+Revises: 20261018_0008
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0009"
+down_revision: Union[str, None] = "20261018_0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "waitlist_entries",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column(
+            "event_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("events.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        # Queue order; a sequence keeps it monotonic without reading the tail of the queue
+        sa.Column("position", sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column("seats_requested", sa.Integer(), nullable=False),
+        sa.Column("seats_remaining", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False, server_default="waiting"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+    )
+    op.create_check_constraint(
+        "waitlist_entries_status_chk", "waitlist_entries", "status IN ('waiting', 'fulfilled', 'canceled')"
+    )
+    op.create_check_constraint(
+        "waitlist_entries_seats_chk",
+        "waitlist_entries",
+        "seats_requested >= 1 AND seats_remaining BETWEEN 0 AND seats_requested"
+        " AND (status <> 'waiting' OR seats_remaining >= 1)",
+    )
+    # Promotion reads the head of one event's queue: an index range scan of as many rows as seats freed
+    op.create_index(
+        "ix_waitlist_entries_queue",
+        "waitlist_entries",
+        ["event_id", "position"],
+        postgresql_where=sa.text("status = 'waiting'"),
+    )
+    op.create_index(
+        "ux_waitlist_entries_waiting_user",
+        "waitlist_entries",
+        ["event_id", "user_id"],
+        unique=True,
+        postgresql_where=sa.text("status = 'waiting'"),
+    )
+    op.create_index("ix_waitlist_entries_user_id", "waitlist_entries", ["user_id"])
+    op.execute(
+        sa.text(
+            """
+            CREATE TRIGGER waitlist_entries_set_updated_at
+            BEFORE UPDATE ON waitlist_entries
+            FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.execute(sa.text("DROP TRIGGER IF EXISTS waitlist_entries_set_updated_at ON waitlist_entries;"))
+    op.drop_index("ix_waitlist_entries_user_id", table_name="waitlist_entries")
+    op.drop_index("ux_waitlist_entries_waiting_user", table_name="waitlist_entries")
+    op.drop_index("ix_waitlist_entries_queue", table_name="waitlist_entries")
+    op.drop_table("waitlist_entries")
@@ -0,0 +1,94 @@
+"""held bookings: seats reserved until expires_at, counted against capacity
+
+Revision ID: 20261018_0010
+Revises: 20261018_0009
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0010"
+down_revision: Union[str, None] = "20261018_0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _seat_deltas_function(counted: str) -> str:
+    # Same statement-level function as 20261018_0003, counting bookings whose status is in ``counted``
+    return f"""
+    CREATE OR REPLACE FUNCTION bookings_apply_seat_deltas() RETURNS TRIGGER AS $$
+    BEGIN
+      IF TG_OP = 'INSERT' THEN
+        UPDATE events e
+           SET seats_booked = e.seats_booked + d.delta
+          FROM (
+            SELECT event_id, SUM(seats) AS delta
+              FROM new_rows
+             WHERE status IN ({counted})
+             GROUP BY event_id
+          ) d
+         WHERE e.id = d.event_id;
+      ELSIF TG_OP = 'UPDATE' THEN
+        UPDATE events e
+           SET seats_booked = e.seats_booked + d.delta
+          FROM (
+            SELECT event_id, SUM(delta) AS delta
+              FROM (
+                SELECT event_id, seats AS delta FROM new_rows WHERE status IN ({counted})
+                UNION ALL
+                SELECT event_id, -seats FROM old_rows WHERE status IN ({counted})
+              ) changes
+             GROUP BY event_id
+            HAVING SUM(delta) <> 0
+          ) d
+         WHERE e.id = d.event_id;
+      ELSE
+        UPDATE events e
+           SET seats_booked = e.seats_booked - d.delta
+          FROM (
+            SELECT event_id, SUM(seats) AS delta
+              FROM old_rows
+             WHERE status IN ({counted})
+             GROUP BY event_id
+          ) d
+         WHERE e.id = d.event_id;
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+
+def upgrade() -> None:
+    # A new enum value can't be used in the transaction that adds it
+    with op.get_context().autocommit_block():
+        op.execute(sa.text("ALTER TYPE booking_status_enum ADD VALUE IF NOT EXISTS 'held'"))
+
+    op.add_column("bookings", sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_check_constraint(
+        "bookings_hold_expiry_chk", "bookings", "(status = 'held') = (expires_at IS NOT NULL)"
+    )
+    # The sweeper reads expired holds off this index, oldest first; it holds only outstanding holds
+    op.create_index(
+        "ix_bookings_held_expires_at",
+        "bookings",
+        ["expires_at"],
+        postgresql_where=sa.text("status = 'held'"),
+    )
+    # Holds take seats like active bookings, so confirming one (held -> active)
+    # leaves seats_booked alone and never touches the event row
+    op.execute(sa.text(_seat_deltas_function("'active', 'held'")))
+
+
+def downgrade() -> None:
+    # Postgres can't drop an enum value; 'held' stays in booking_status_enum, unused
+    op.execute(sa.text("DELETE FROM bookings WHERE status = 'held'"))
+    op.execute(sa.text(_seat_deltas_function("'active'")))
+    op.drop_index("ix_bookings_held_expires_at", table_name="bookings")
+    op.drop_constraint("bookings_hold_expiry_chk", "bookings", type_="check")
+    op.drop_column("bookings", "expires_at")
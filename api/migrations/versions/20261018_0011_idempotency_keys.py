@@ -0,0 +1,41 @@
+"""idempotency_keys: responses of writes retried with the same Idempotency-Key
+
+Revision ID: 20261018_0011
+Revises: 20261018_0010
+Create Date: 2026-10-18
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0011"
+down_revision: Union[str, None] = "20261018_0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_keys",
+        # sha256 of the caller and the key, so raw client keys are never stored
+        sa.Column("key_hash", sa.LargeBinary(), primary_key=True, nullable=False),
+        # sha256 of method, path, query and body
+        sa.Column("fingerprint", sa.LargeBinary(), nullable=False),
+        # NULL while the first request is still running
+        sa.Column("status_code", sa.SmallInteger(), nullable=True),
+        sa.Column("content_type", sa.String(), nullable=True),
+        sa.Column("response_body", sa.LargeBinary(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        # Lease expiry while running, retention deadline once completed
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_idempotency_keys_expires_at", "idempotency_keys", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_idempotency_keys_expires_at", table_name="idempotency_keys")
+    op.drop_table("idempotency_keys")
@@ -1,13 +1,43 @@
+"""Seed the database.
+
+Without arguments, inserts a small sample: an admin, a user, one event and two bookings.
+
+With ``--users`` it generates load-test data instead and streams it through
+``COPY FROM STDIN``:
+
+    python scripts/seed.py --users 1000000 --resources 100 --events 100000 \\
+        --bookings 10000000 --hot-events 20 --hot-share 0.3 --workers 8 --fast
+
+Every generated value is a pure function of its index and the run id, so
+workers partition the work by index range without sharing state, and memory
+stays bounded by one COPY buffer. Bookings never exceed capacity: each
+event's capacity is derived from the seats generated for it (hot events are
+sold out exactly). ``--fast`` drops the secondary indexes and disables the
+user triggers on events and bookings while loading, writes ``seats_booked``
+directly, then rebuilds everything. Run it against an otherwise idle
+database. Counters are checked against the bookings at the end either way.
+"""
+import argparse
 import os
+import secrets
+import sys
+import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
 from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Tuple
 
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
 
 
-def main() -> None:
-    database_url = os.getenv("DATABASE_URL", "postgresql://booking_user:booking_password@db:5432/booking_db")
-    engine = create_engine(database_url)
+def _database_url() -> str:
+    return os.getenv("DATABASE_URL", "postgresql://booking_user:booking_password@db:5432/booking_db")
+
+
+def seed_sample() -> None:
+    engine = create_engine(_database_url())
 
     admin_id = str(uuid.uuid4())
     event_id = str(uuid.uuid4())
@@ -83,7 +113,305 @@ def main() -> None:
     print("Seed completed.")
 
 
-if __name__ == "__main__":
-    main()
+USER_KIND, RESOURCE_KIND, EVENT_KIND, BOOKING_KIND = 1, 2, 3, 4
+# Minutes over which events without a resource are spread, starting tomorrow
+EVENT_SPREAD_MINUTES = 90 * 24 * 60
+
+
+class SeedPlan:
+    """Deterministic description of one generated data set."""
+
+    def __init__(
+        self,
+        *,
+        users: int,
+        resources: int,
+        events: int,
+        bookings: int,
+        hot_events: int,
+        hot_share: float,
+        max_seats: int,
+        canceled_share: float,
+        password_hash: str,
+        fast: bool,
+    ) -> None:
+        self.users = users
+        self.resources = resources
+        self.events = events
+        self.bookings = bookings
+        self.hot_events = min(hot_events, events)
+        if self.hot_events == events:
+            self.hot_total = bookings
+        else:
+            self.hot_total = int(bookings * hot_share) if self.hot_events else 0
+        self.cold_total = bookings - self.hot_total
+        self.max_seats = max_seats
+        self.canceled_per_mille = int(canceled_share * 1000)
+        self.password_hash = password_hash
+        self.fast = fast
+        # Ids are "<run prefix>-8<kind>-<index>", valid uuid text that any worker can compute
+        self.run = secrets.token_hex(4)
+        self.prefix = f"{self.run}-{secrets.token_hex(2)}-4{secrets.token_hex(2)[:3]}"
+        self.starts_base = datetime.now(timezone.utc).replace(second=0, microsecond=0) + timedelta(days=1)
+
+    def id(self, kind: int, index: int) -> str:
+        return f"{self.prefix}-8{kind:03x}-{index:012x}"
+
+    def booking_range(self, event: int) -> Tuple[int, int]:
+        """Global index of the event's first booking and its number of bookings."""
+        if event < self.hot_events:
+            split, parts, k, base = self.hot_total, self.hot_events, event, 0
+        else:
+            split, parts, k, base = self.cold_total, self.events - self.hot_events, event - self.hot_events, self.hot_total
+        start, end = k * split // parts, (k + 1) * split // parts
+        return base + start, end - start
+
+    def seats(self, booking: int) -> int:
+        return 1 + ((booking * 2654435761) >> 7) % self.max_seats
+
+    def is_canceled(self, booking: int) -> bool:
+        return (booking * 40503 >> 5) % 1000 < self.canceled_per_mille
+
+    def seats_booked(self, event: int) -> int:
+        first, count = self.booking_range(event)
+        return sum(self.seats(b) for b in range(first, first + count) if not self.is_canceled(b))
+
+    def capacity(self, event: int, booked: int) -> int:
+        if event < self.hot_events:
+            return max(booked, 1)
+        return booked + 10 + event % 50
+
+    def start_minute(self, event: int) -> int:
+        if not self.resources:
+            return (event * 7919) % EVENT_SPREAD_MINUTES
+        # Each resource's events take consecutive three-hour blocks, so they never overlap
+        # (events_resource_no_overlap); two-hour events start 0-59 minutes into their block
+        return (event // self.resources) * 180 + (event * 7919) % 60
+
+    def user_rows(self, lo: int, hi: int) -> Iterator[str]:
+        for i in range(lo, hi):
+            yield f"{self.id(USER_KIND, i)}\tload-{self.run}-{i}@example.com\t{self.password_hash}\tuser\n"
+
+    def resource_rows(self) -> Iterator[str]:
+        for i in range(self.resources):
+            yield f"{self.id(RESOURCE_KIND, i)}\tload-{self.run}-{i}\tUTC\n"
+
+    def event_rows(self, lo: int, hi: int) -> Iterator[str]:
+        for e in range(lo, hi):
+            booked = self.seats_booked(e)
+            starts_at = self.starts_base + timedelta(minutes=self.start_minute(e))
+            resource = self.id(RESOURCE_KIND, e % self.resources) if self.resources else "\\N"
+            yield (
+                f"{self.id(EVENT_KIND, e)}\tLoad event {e}\t{starts_at.isoformat()}\t"
+                f"{(starts_at + timedelta(hours=2)).isoformat()}\tHall {e % 20}\t{self.capacity(e, booked)}\t"
+                f"{booked if self.fast else 0}\tpublished\t{self.id(USER_KIND, e % self.users)}\t{resource}\n"
+            )
+
+    def booking_rows(self, lo: int, hi: int) -> Iterator[str]:
+        for e in range(lo, hi):
+            event_id = self.id(EVENT_KIND, e)
+            first, count = self.booking_range(e)
+            for b in range(first, first + count):
+                status = "canceled" if self.is_canceled(b) else "active"
+                user_id = self.id(USER_KIND, (b * 1000003) % self.users)
+                yield f"{self.id(BOOKING_KIND, b)}\t{event_id}\t{user_id}\t{self.seats(b)}\t{status}\n"
+
+
+class _RowStream:
+    """Read-only file over generated COPY lines, holding at most one read() worth of data."""
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        parts, length = [self._buffer], len(self._buffer)
+        for line in self._lines:
+            parts.append(line)
+            length += len(line)
+            if 0 <= size <= length:
+                break
+        data = "".join(parts)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+    readline = read
+
 
+COPY_BUFFER = 1 << 20
+USERS_COPY = "COPY users (id, email, password_hash, role) FROM STDIN"
+RESOURCES_COPY = "COPY resources (id, name, timezone) FROM STDIN"
+EVENTS_COPY = (
+    "COPY events (id, title, starts_at, ends_at, location, capacity, seats_booked, status, created_by, resource_id)"
+    " FROM STDIN"
+)
+BOOKINGS_COPY = "COPY bookings (id, event_id, user_id, seats, status) FROM STDIN"
 
+
+def _copy(cursor, sql: str, lines: Iterator[str]) -> None:  # type: ignore[no-untyped-def]
+    cursor.copy_expert(sql, _RowStream(lines), size=COPY_BUFFER)
+
+
+def _ranges(total: int, parts: int, chunk: int) -> List[Tuple[int, int]]:
+    step = max(1, min(chunk, -(-total // max(parts, 1))))
+    return [(lo, min(lo + step, total)) for lo in range(0, total, step)]
+
+
+def _load_users(plan: SeedPlan, lo: int, hi: int) -> int:
+    engine = create_engine(_database_url(), poolclass=NullPool)
+    conn = engine.raw_connection()
+    try:
+        with closing(conn.cursor()) as cursor:
+            _copy(cursor, USERS_COPY, plan.user_rows(lo, hi))
+        conn.commit()
+    finally:
+        conn.close()
+    return hi - lo
+
+
+def _load_events(plan: SeedPlan, lo: int, hi: int) -> int:
+    """Events ``[lo, hi)`` and their bookings, committed together."""
+    engine = create_engine(_database_url(), poolclass=NullPool)
+    conn = engine.raw_connection()
+    try:
+        with closing(conn.cursor()) as cursor:
+            _copy(cursor, EVENTS_COPY, plan.event_rows(lo, hi))
+            _copy(cursor, BOOKINGS_COPY, plan.booking_rows(lo, hi))
+        conn.commit()
+    finally:
+        conn.close()
+    first, _ = plan.booking_range(lo)
+    last, count = plan.booking_range(hi - 1)
+    return last + count - first
+
+
+SECONDARY_INDEXES_SQL = text(
+    """
+    SELECT i.indexname, i.indexdef
+      FROM pg_indexes i
+     WHERE i.schemaname = current_schema()
+       AND i.tablename IN ('events', 'bookings')
+       AND i.indexdef NOT LIKE 'CREATE UNIQUE %'
+       AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname)
+    """
+)
+
+COUNTER_MISMATCHES_SQL = text(
+    """
+    SELECT count(*)
+      FROM events e
+      LEFT JOIN (
+        SELECT event_id, SUM(seats) AS seats
+          FROM bookings
+         WHERE status IN ('active', 'held')
+         GROUP BY event_id
+      ) b ON b.event_id = e.id
+     WHERE e.id::text LIKE :prefix
+       AND (e.seats_booked <> COALESCE(b.seats, 0) OR e.seats_booked > e.capacity)
+    """
+)
+
+
+def _timed(label: str, rows: int, started: float) -> None:
+    elapsed = time.perf_counter() - started
+    print(f"{label}: {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+
+
+def seed_bulk(plan: SeedPlan, *, workers: int, chunk_rows: int) -> None:
+    engine = create_engine(_database_url(), poolclass=NullPool)
+    indexes = []
+    if plan.fast:
+        with engine.begin() as conn:
+            indexes = list(conn.execute(SECONDARY_INDEXES_SQL))
+            for name, _ in indexes:
+                conn.execute(text(f'DROP INDEX "{name}"'))
+            conn.execute(text("ALTER TABLE events DISABLE TRIGGER USER"))
+            conn.execute(text("ALTER TABLE bookings DISABLE TRIGGER USER"))
+        print(f"Dropped {len(indexes)} indexes and disabled triggers on events and bookings")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            started = time.perf_counter()
+            futures = [pool.submit(_load_users, plan, lo, hi) for lo, hi in _ranges(plan.users, workers, chunk_rows)]
+            _timed("users", sum(future.result() for future in futures), started)
+
+            started = time.perf_counter()
+            raw = engine.raw_connection()
+            try:
+                with closing(raw.cursor()) as cursor:
+                    _copy(cursor, RESOURCES_COPY, plan.resource_rows())
+                raw.commit()
+            finally:
+                raw.close()
+            _timed("resources", plan.resources, started)
+
+            # Size event slices so each transaction carries about chunk_rows bookings
+            events_per_chunk = max(1, chunk_rows * plan.events // max(plan.bookings, 1))
+            started = time.perf_counter()
+            futures = [
+                pool.submit(_load_events, plan, lo, hi) for lo, hi in _ranges(plan.events, workers, events_per_chunk)
+            ]
+            _timed(f"events ({plan.events}) and bookings", sum(future.result() for future in futures), started)
+    finally:
+        if plan.fast:
+            started = time.perf_counter()
+            with engine.begin() as conn:
+                conn.execute(text("ALTER TABLE events ENABLE TRIGGER USER"))
+                conn.execute(text("ALTER TABLE bookings ENABLE TRIGGER USER"))
+                for _, definition in indexes:
+                    conn.execute(text(definition))
+            print(f"Rebuilt {len(indexes)} indexes and re-enabled triggers in {time.perf_counter() - started:.1f}s")
+
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE users"))
+        conn.execute(text("ANALYZE events"))
+        conn.execute(text("ANALYZE bookings"))
+        mismatches = conn.execute(COUNTER_MISMATCHES_SQL, {"prefix": f"{plan.prefix}-%"}).scalar_one()
+    if mismatches:
+        sys.exit(f"{mismatches} seeded events have seats_booked out of line with their bookings")
+    print(f"Seed completed (run {plan.run}); users log in as load-{plan.run}-<n>@example.com")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=0, help="generate this many users (enables bulk mode)")
+    parser.add_argument("--resources", type=int, default=10)
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--hot-events", type=int, default=10, help="events that get --hot-share of all bookings")
+    parser.add_argument("--hot-share", type=float, default=0.2)
+    parser.add_argument("--max-seats", type=int, default=4, help="seats per booking are 1..max-seats")
+    parser.add_argument("--canceled-share", type=float, default=0.05)
+    parser.add_argument("--password", default="password", help="password of every generated user")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-rows", type=int, default=200000, help="rows per COPY transaction")
+    parser.add_argument("--fast", action="store_true", help="load without secondary indexes and triggers")
+    args = parser.parse_args()
+
+    if not args.users:
+        seed_sample()
+        return
+    if args.events < 1 or args.max_seats < 1:
+        parser.error("--events and --max-seats must be at least 1")
+
+    from passlib.hash import bcrypt
+
+    plan = SeedPlan(
+        users=args.users,
+        resources=args.resources,
+        events=args.events,
+        bookings=args.bookings,
+        hot_events=args.hot_events,
+        hot_share=args.hot_share,
+        max_seats=args.max_seats,
+        canceled_share=args.canceled_share,
+        password_hash=bcrypt.hash(args.password),
+        fast=args.fast,
+    )
+    seed_bulk(plan, workers=args.workers, chunk_rows=args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import uuid
+
+import pytest
+import pytest_asyncio
+
+from app.auth.security import JWTSettings
+
+
+@pytest.fixture
+def jwt_settings() -> JWTSettings:
+    return JWTSettings(secret_key="test-secret")
+
+
+@pytest.fixture
+def pg():
+    """A sync connection to ``DATABASE_URL`` with the migrations applied; skips the test without one."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import OperationalError
+
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        pytest.skip("DATABASE_URL is not set")
+    engine = create_engine(url, connect_args={"connect_timeout": 2})
+    try:
+        connection = engine.connect()
+    except OperationalError as exc:
+        pytest.skip(f"Postgres is not reachable: {exc}")
+    try:
+        yield connection
+    finally:
+        connection.close()
+        engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def db_session(pg):
+    """An ``AsyncSession`` on ``DATABASE_URL`` whose work is rolled back after the test."""
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.db import _get_async_database_url
+
+    engine = create_async_engine(_get_async_database_url())
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        # Commits inside the code under test become savepoints of the outer transaction
+        async with AsyncSession(bind=connection, join_transaction_mode="create_savepoint") as session:
+            yield session
+        await transaction.rollback()
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def make_event(db_session):
+    """Creates a published event (and its owner) inside the test transaction."""
+    from sqlalchemy import text
+
+    async def make(*, capacity: int = 10, resource_id=None):
+        user_id, event_id = uuid.uuid4(), uuid.uuid4()
+        await db_session.execute(
+            text("INSERT INTO users (id, email, password_hash, role) VALUES (:id, :email, 'x', 'user')"),
+            {"id": user_id, "email": f"test-{user_id}@example.com"},
+        )
+        await db_session.execute(
+            text(
+                "INSERT INTO events (id, title, starts_at, ends_at, capacity, status, created_by, resource_id) "
+                "VALUES (:id, 'Test', now() + interval '1 day', now() + interval '1 day 2 hours', "
+                ":capacity, 'published', :user_id, :resource_id)"
+            ),
+            {"id": event_id, "capacity": capacity, "user_id": user_id, "resource_id": resource_id},
+        )
+        return user_id, event_id
+
+    return make
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from app.events.notifier import CHANNEL, AvailabilityHub, PostgresListener
+
+
+class FakeConnection:
+    def __init__(self):
+        self.listeners = {}
+        self.on_terminate = None
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def close(self):
+        pass
+
+    def notify(self, event_id, seats_booked):
+        payload = json.dumps({"event_id": str(event_id), "capacity": 10, "seats_booked": seats_booked})
+        self.listeners[CHANNEL](self, 1, CHANNEL, payload)
+
+    def drop(self):
+        self.on_terminate(self)
+
+
+class FlakyServer:
+    """Hands out connections, failing the attempts listed in ``failures`` with their exception."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.attempts = 0
+        self.connections = asyncio.Queue()
+
+    async def connect(self, dsn):
+        self.attempts += 1
+        failure = self.failures.get(self.attempts)
+        if failure is not None:
+            raise failure
+        connection = FakeConnection()
+        await self.connections.put(connection)
+        return connection
+
+
+async def _next_push(subscriber, hub):
+    hub.flush()
+    return await subscriber.next(timeout=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failure", [asyncio.TimeoutError(), RuntimeError("connection does not exist")])
+async def test_pushes_resume_after_the_connection_drops(failure):
+    hub = AvailabilityHub(interval=60)
+    event_id = uuid.uuid4()
+    subscriber = hub.subscribe(event_id)
+    server = FlakyServer({2: failure})
+    listener = PostgresListener(hub, "dsn", reconnect_delay=0.01, connect=server.connect)
+    listener.start()
+    try:
+        first = await asyncio.wait_for(server.connections.get(), 1)
+        first.notify(event_id, 3)
+        assert (await _next_push(subscriber, hub))["seats_booked"] == 3
+
+        first.drop()
+        # The second attempt fails with something other than a Postgres error; the third gets through
+        second = await asyncio.wait_for(server.connections.get(), 1)
+        second.notify(event_id, 4)
+        assert (await _next_push(subscriber, hub))["seats_booked"] == 4
+        assert server.attempts == 3
+    finally:
+        await listener.stop()
@@ -0,0 +1,34 @@
+import pytest
+
+from app.bookings.service import reserve_batch
+
+
+@pytest.mark.asyncio
+async def test_best_effort_books_a_small_item_after_a_rejected_large_one(db_session, make_event):
+    user_id, event_id = await make_event(capacity=5)
+
+    results = await reserve_batch(db_session, user_id=user_id, items=[(event_id, 10), (event_id, 2)], all_or_nothing=False)
+
+    assert [r["status"] for r in results] == ["rejected", "booked"]
+    assert results[0]["reason"] == "capacity_exceeded"
+
+
+@pytest.mark.asyncio
+async def test_best_effort_admits_items_in_order_against_what_is_left(db_session, make_event):
+    user_id, event_id = await make_event(capacity=5)
+
+    results = await reserve_batch(
+        db_session, user_id=user_id, items=[(event_id, 3), (event_id, 3), (event_id, 2)], all_or_nothing=False
+    )
+
+    assert [r["status"] for r in results] == ["booked", "rejected", "booked"]
+
+
+@pytest.mark.asyncio
+async def test_all_or_nothing_books_nothing_when_one_item_does_not_fit(db_session, make_event):
+    user_id, event_id = await make_event(capacity=5)
+
+    results = await reserve_batch(db_session, user_id=user_id, items=[(event_id, 10), (event_id, 2)], all_or_nothing=True)
+
+    assert [r["status"] for r in results] == ["rejected", "rejected"]
+    assert [r["reason"] for r in results] == ["capacity_exceeded", "batch_aborted"]
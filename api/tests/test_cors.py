@@ -0,0 +1,33 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+def _preflight(origin: str):
+    # No `with`, so the lifespan (and its database warm-up) doesn't run
+    client = TestClient(main.app)
+    return client.options(
+        "/bookings", headers={"Origin": origin, "Access-Control-Request-Method": "POST"}
+    )
+
+
+@pytest.mark.skipif("FRONTEND_ORIGIN_REGEX" in os.environ, reason="a pattern is configured")
+def test_no_origin_pattern_is_allowed_by_default():
+    assert main.allowed_origin_regex is None
+
+
+@pytest.mark.skipif("FRONTEND_ORIGIN_REGEX" in os.environ, reason="a pattern is configured")
+def test_arbitrary_codespaces_origin_gets_no_credentialed_cors():
+    response = _preflight("https://someone-else-3000.app.github.dev")
+
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_configured_frontend_origin_is_allowed():
+    response = _preflight(main.frontend_origin)
+
+    assert response.headers["access-control-allow-origin"] == main.frontend_origin
+    assert response.headers["access-control-allow-credentials"] == "true"
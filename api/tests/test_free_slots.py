@@ -0,0 +1,40 @@
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.db import get_read_session
+from app.resources import free_slots as endpoint
+
+
+class EmptyResult:
+    def first(self):
+        return None
+
+
+class NoRowsSession:
+    """Every query finds nothing, as for a resource id that doesn't exist."""
+
+    async def execute(self, *args, **kwargs):
+        return EmptyResult()
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(endpoint.router)
+    app.dependency_overrides[get_read_session] = NoRowsSession
+    return TestClient(app)
+
+
+def test_unknown_resource_is_404_not_an_empty_calendar(monkeypatch):
+    async def fail(*args, **kwargs):
+        raise AssertionError("slots computed for a resource that doesn't exist")
+
+    monkeypatch.setattr(endpoint, "free_slots", fail)
+    response = _client().get(
+        f"/resources/{uuid.uuid4()}/free-slots",
+        params={"from": "2026-11-01T09:00:00Z", "to": "2026-11-01T17:00:00Z", "duration": "PT30M"},
+    )
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Resource not found"
@@ -0,0 +1,130 @@
+import asyncio
+import contextlib
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from app.auth.deps import get_current_user
+from app.auth.principal import Principal
+from app.bookings import hold as hold_routes, sweeper as sweeper_module
+from app.bookings.service import CapacityExceeded, HoldExpired, confirm_hold, hold_seats, reserve_seats
+from app.bookings.sweeper import HoldSweeper
+from app.db import get_async_session
+
+
+async def _seats_booked(session, event_id) -> int:
+    return (await session.execute(text("SELECT seats_booked FROM events WHERE id = :id"), {"id": event_id})).scalar_one()
+
+
+async def _expire(session, booking_id) -> None:
+    await session.execute(
+        text("UPDATE bookings SET expires_at = now() - interval '1 second' WHERE id = :id"), {"id": booking_id}
+    )
+
+
+async def _status(session, booking_id):
+    return (await session.execute(text("SELECT status FROM bookings WHERE id = :id"), {"id": booking_id})).scalar()
+
+
+@pytest.mark.asyncio
+async def test_hold_counts_against_capacity(db_session, make_event):
+    user_id, event_id = await make_event(capacity=5)
+
+    await hold_seats(db_session, event_id=event_id, user_id=user_id, seats=3, ttl=600)
+
+    assert await _seats_booked(db_session, event_id) == 3
+    with pytest.raises(CapacityExceeded):
+        async with db_session.begin_nested():
+            await reserve_seats(db_session, event_id=event_id, user_id=user_id, seats=3)
+    await reserve_seats(db_session, event_id=event_id, user_id=user_id, seats=2)
+    assert await _seats_booked(db_session, event_id) == 5
+
+
+@pytest.mark.asyncio
+async def test_confirm_before_expiry_activates_the_hold(db_session, make_event):
+    user_id, event_id = await make_event(capacity=5)
+    booking_id, _ = await hold_seats(db_session, event_id=event_id, user_id=user_id, seats=2, ttl=600)
+
+    assert await confirm_hold(db_session, booking_id=booking_id, user_id=user_id) == event_id
+    assert await _status(db_session, booking_id) == "active"
+    assert await _seats_booked(db_session, event_id) == 2
+    # Someone else's id, or a hold already confirmed, is not found
+    assert await confirm_hold(db_session, booking_id=booking_id, user_id=user_id) is None
+    assert await confirm_hold(db_session, booking_id=uuid.uuid4(), user_id=user_id) is None
+
+
+@pytest.mark.asyncio
+async def test_confirm_after_expiry_raises(db_session, make_event):
+    user_id, event_id = await make_event(capacity=5)
+    booking_id, _ = await hold_seats(db_session, event_id=event_id, user_id=user_id, seats=2, ttl=600)
+    await _expire(db_session, booking_id)
+
+    with pytest.raises(HoldExpired):
+        await confirm_hold(db_session, booking_id=booking_id, user_id=user_id)
+    assert await _status(db_session, booking_id) == "held"
+
+
+@pytest.mark.asyncio
+async def test_confirm_route_answers_410_for_an_expired_hold(db_session, make_event):
+    user_id, event_id = await make_event(capacity=5)
+    booking_id, _ = await hold_seats(db_session, event_id=event_id, user_id=user_id, seats=2, ttl=600)
+    await _expire(db_session, booking_id)
+    await db_session.commit()
+
+    app = FastAPI()
+    app.include_router(hold_routes.router)
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=str(user_id), email="ada@example.com", role="user")
+    app.dependency_overrides[get_async_session] = lambda: db_session
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as client:
+        response = await client.post(f"/bookings/{booking_id}:confirm")
+
+    assert response.status_code == 410
+    assert response.json()["detail"] == "Hold has expired"
+
+
+@pytest.mark.asyncio
+async def test_sweeper_releases_only_expired_holds(db_session, make_event, monkeypatch):
+    user_id, event_id = await make_event(capacity=10)
+    expired_id, _ = await hold_seats(db_session, event_id=event_id, user_id=user_id, seats=3, ttl=600)
+    live_id, _ = await hold_seats(db_session, event_id=event_id, user_id=user_id, seats=2, ttl=600)
+    active_id = await reserve_seats(db_session, event_id=event_id, user_id=user_id, seats=1)
+    await _expire(db_session, expired_id)
+    assert await _seats_booked(db_session, event_id) == 6
+
+    @contextlib.asynccontextmanager
+    async def test_session():
+        yield db_session
+
+    monkeypatch.setattr(sweeper_module, "AsyncSessionLocal", test_session)
+    released = await HoldSweeper(interval=1, batch_size=100).sweep()
+
+    assert released >= 1
+    assert await _status(db_session, expired_id) is None
+    assert await _status(db_session, live_id) == "held"
+    assert await _status(db_session, active_id) == "active"
+    assert await _seats_booked(db_session, event_id) == 3
+
+
+@pytest.mark.asyncio
+async def test_sweeper_survives_unexpected_errors(monkeypatch):
+    sweeper = HoldSweeper(interval=0.01, batch_size=10)
+    calls = 0
+    swept_again = asyncio.Event()
+
+    async def sweep():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("driver bug")
+        swept_again.set()
+        return 0
+
+    monkeypatch.setattr(sweeper, "sweep", sweep)
+    sweeper.start()
+    try:
+        await asyncio.wait_for(swept_again.wait(), 1)
+    finally:
+        await sweeper.stop()
@@ -0,0 +1,206 @@
+import asyncio
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.auth import deps
+from app.auth.security import create_access_token
+from app.idempotency import IdempotencyMiddleware, IdempotencyPurger, MemoryIdempotencyStore
+
+
+class Orders:
+    """A write endpoint that counts how many times it actually ran."""
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.gate: Optional[asyncio.Event] = None
+        self.started = asyncio.Event()
+
+    def app(self, *, wait: float = 5.0) -> FastAPI:
+        app = FastAPI()
+
+        @app.post("/orders")
+        async def create_order(payload: dict):
+            self.runs += 1
+            self.started.set()
+            if self.gate is not None:
+                await self.gate.wait()
+            status_code = payload.get("status", 201)
+            return JSONResponse({"run": self.runs, "item": payload.get("item")}, status_code=status_code)
+
+        @app.post("/other")
+        async def other():
+            self.runs += 1
+            return {"run": self.runs}
+
+        app.add_middleware(
+            IdempotencyMiddleware,
+            store=MemoryIdempotencyStore(),
+            routes=[("POST", "/orders")],
+            ttl=60,
+            lease=30,
+            wait=wait,
+        )
+        return app
+
+
+def _post(client: TestClient, key: str, payload: dict, **kwargs) -> httpx.Response:
+    return client.post("/orders", json=payload, headers={"Idempotency-Key": key, **kwargs.pop("headers", {})}, **kwargs)
+
+
+def test_replay_returns_the_first_response():
+    orders = Orders()
+    client = TestClient(orders.app())
+
+    first = _post(client, "k1", {"item": "a"})
+    second = _post(client, "k1", {"item": "a"})
+
+    assert first.status_code == second.status_code == 201
+    assert first.json() == second.json() == {"run": 1, "item": "a"}
+    assert "idempotent-replayed" not in first.headers
+    assert second.headers["idempotent-replayed"] == "true"
+    assert second.headers["content-type"] == "application/json"
+    assert orders.runs == 1
+
+
+def test_same_key_with_a_different_body_is_rejected():
+    orders = Orders()
+    client = TestClient(orders.app())
+
+    _post(client, "k1", {"item": "a"})
+    response = _post(client, "k1", {"item": "b"})
+
+    assert response.status_code == 422
+    assert orders.runs == 1
+
+
+def test_requests_without_a_key_or_off_route_run_every_time():
+    orders = Orders()
+    client = TestClient(orders.app())
+
+    client.post("/orders", json={"item": "a"})
+    client.post("/orders", json={"item": "a"})
+    client.post("/other", headers={"Idempotency-Key": "k1"})
+    client.post("/other", headers={"Idempotency-Key": "k1"})
+
+    assert orders.runs == 4
+
+
+def test_oversized_key_is_rejected():
+    orders = Orders()
+    response = _post(TestClient(orders.app()), "k" * 256, {"item": "a"})
+
+    assert response.status_code == 400
+    assert orders.runs == 0
+
+
+@pytest.mark.parametrize("status_code", [500, 503, 401, 408, 429])
+def test_failed_or_refused_responses_are_not_stored(status_code):
+    orders = Orders()
+    client = TestClient(orders.app())
+
+    first = _post(client, "k1", {"item": "a", "status": status_code})
+    retry = _post(client, "k1", {"item": "a", "status": status_code})
+
+    assert first.status_code == retry.status_code == status_code
+    assert "idempotent-replayed" not in retry.headers
+    assert orders.runs == 2
+
+
+def test_client_errors_are_stored():
+    orders = Orders()
+    client = TestClient(orders.app())
+
+    _post(client, "k1", {"item": "a", "status": 409})
+    retry = _post(client, "k1", {"item": "a", "status": 409})
+
+    assert retry.status_code == 409
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert orders.runs == 1
+
+
+def test_keys_are_scoped_per_caller(monkeypatch, jwt_settings):
+    monkeypatch.setattr(deps, "get_jwt_settings", lambda: jwt_settings)
+    orders = Orders()
+    client = TestClient(orders.app())
+
+    def as_user(user_id: str) -> dict:
+        return {"cookie": f"access_token={create_access_token(jwt_settings, user_id)}"}
+
+    alice = _post(client, "k1", {"item": "a"}, headers=as_user("alice"))
+    bob = _post(client, "k1", {"item": "a"}, headers=as_user("bob"))
+    anonymous = _post(client, "k1", {"item": "a"})
+    alice_again = _post(client, "k1", {"item": "a"}, headers=as_user("alice"))
+
+    assert [alice.json()["run"], bob.json()["run"], anonymous.json()["run"]] == [1, 2, 3]
+    assert alice_again.json() == alice.json()
+    assert orders.runs == 3
+
+
+def _send(client: httpx.AsyncClient) -> "asyncio.Task[httpx.Response]":
+    return asyncio.create_task(client.post("/orders", json={"item": "a"}, headers={"Idempotency-Key": "k1"}))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_waits_and_replays():
+    orders = Orders()
+    orders.gate = asyncio.Event()
+    transport = httpx.ASGITransport(app=orders.app(wait=5))
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        first = _send(client)
+        await asyncio.wait_for(orders.started.wait(), 1)
+        duplicate = _send(client)
+        await asyncio.sleep(0.05)
+        assert not duplicate.done()
+
+        orders.gate.set()
+        first_response, duplicate_response = await asyncio.gather(first, duplicate)
+
+    assert first_response.json() == duplicate_response.json() == {"run": 1, "item": "a"}
+    assert duplicate_response.headers["idempotent-replayed"] == "true"
+    assert orders.runs == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicate_gets_409_after_waiting():
+    orders = Orders()
+    orders.gate = asyncio.Event()
+    transport = httpx.ASGITransport(app=orders.app(wait=0.1))
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        first = _send(client)
+        await asyncio.wait_for(orders.started.wait(), 1)
+        duplicate_response = await asyncio.wait_for(_send(client), 1)
+        orders.gate.set()
+        first_response = await first
+
+    assert duplicate_response.status_code == 409
+    assert duplicate_response.headers["retry-after"] == "1"
+    assert first_response.status_code == 201
+    assert orders.runs == 1
+
+
+@pytest.mark.asyncio
+async def test_purger_survives_unexpected_errors(monkeypatch):
+    store = MemoryIdempotencyStore()
+    purger = IdempotencyPurger(store, interval=0.01, batch_size=10)
+    calls = 0
+    purged_again = asyncio.Event()
+
+    async def purge_expired(limit):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("driver bug")
+        purged_again.set()
+        return 0
+
+    monkeypatch.setattr(store, "purge_expired", purge_expired)
+    purger.start()
+    try:
+        await asyncio.wait_for(purged_again.wait(), 1)
+    finally:
+        await purger.stop()
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from app.jobs import worker as worker_module
+from app.jobs.worker import JobWorker
+
+
+@pytest.mark.asyncio
+async def test_claim_loop_survives_unexpected_errors(monkeypatch):
+    monkeypatch.setattr(worker_module, "get_async_engine", lambda: None)
+    worker = JobWorker(concurrency=2, batch_size=2, poll_interval=0.01, lease=60, backoff_base=1, backoff_max=1)
+    calls = 0
+    claimed_again = asyncio.Event()
+
+    async def claim(limit):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("driver bug")
+        claimed_again.set()
+        return []
+
+    monkeypatch.setattr(worker, "_claim", claim)
+    worker.start()
+    try:
+        await asyncio.wait_for(claimed_again.wait(), 1)
+    finally:
+        await worker.stop()
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from limits.strategies import STRATEGIES
+
+from app.auth.ratelimit import RATELIMIT_STRATEGY, build_limiter, limiter
+from main import RateLimitExceeded, ratelimit_handler
+
+
+def _worker(shared_limiter) -> TestClient:
+    """One app instance, as a separate worker would run it, limited by ``shared_limiter``."""
+    app = FastAPI()
+    app.state.limiter = shared_limiter
+
+    @app.post("/auth/login")
+    @shared_limiter.limit("3/minute")
+    async def login(request: Request):
+        return {"ok": True}
+
+    app.add_exception_handler(RateLimitExceeded, ratelimit_handler)
+    return TestClient(app)
+
+
+def _share_storage(source, target) -> None:
+    # memory:// builds a new store per Limiter; point the second one at the first's, as
+    # two workers on one Redis would be
+    target._storage = source._storage
+    target._limiter = STRATEGIES[target._strategy](source._storage)
+
+
+def test_module_limiter_uses_the_configured_strategy():
+    assert isinstance(limiter._limiter, STRATEGIES[RATELIMIT_STRATEGY])
+
+
+@pytest.mark.parametrize("strategy", ["moving-window", "fixed-window", "sliding-window-counter"])
+def test_limit_applies_across_limiters_on_one_storage(strategy):
+    if strategy not in STRATEGIES:
+        pytest.skip(f"{strategy} needs a newer limits release")
+    first, second = (build_limiter(storage_uri="memory://", strategy=strategy, enabled=True) for _ in range(2))
+    _share_storage(first, second)
+    assert isinstance(second._limiter, STRATEGIES[strategy])
+    workers = [_worker(first), _worker(second)]
+
+    statuses = [workers[i % 2].post("/auth/login").status_code for i in range(4)]
+
+    assert statuses == [200, 200, 200, 429]
+
+
+def test_separate_memory_storages_do_not_share_counts():
+    workers = [_worker(build_limiter(storage_uri="memory://", enabled=True)) for _ in range(2)]
+
+    statuses = [workers[i % 2].post("/auth/login").status_code for i in range(4)]
+
+    assert statuses == [200, 200, 200, 200]
@@ -0,0 +1,119 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import db
+
+
+def _engine(host):
+    # Never connects: the tests only look at which engine a session is bound to
+    return create_async_engine(f"postgresql+asyncpg://booking@{host}/booking_db")
+
+
+class FakeReplicaSet(db.ReplicaSet):
+    """Replicas whose health check reports the given lag, or raises the given error."""
+
+    def __init__(self, lags, *, max_lag=5.0):
+        super().__init__([f"postgresql://replica{i}" for i in range(len(lags))], interval=60, max_lag=max_lag, timeout=1)
+        self.lags = lags
+        self._engines = [_engine(f"replica{i}") for i in range(len(lags))]
+
+    async def _lag(self, engine):
+        lag = self.lags[int(engine.url.host.removeprefix("replica"))]
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+
+PRIMARY = _engine("primary")
+
+
+def _app(monkeypatch, replicas) -> TestClient:
+    monkeypatch.setattr(db, "replicas", replicas)
+    monkeypatch.setattr(db, "get_async_engine", lambda: PRIMARY)
+    app = FastAPI()
+    app.add_middleware(db.ReadYourWritesMiddleware, seconds=5)
+
+    @app.get("/events")
+    async def read(session=Depends(db.get_read_session)):
+        return {"engine": session.bind.url.host}
+
+    @app.post("/bookings")
+    async def write():
+        return {"ok": True}
+
+    # https, so the Secure pin cookie comes back the way a browser would send it
+    return TestClient(app, base_url="https://testserver")
+
+
+@pytest.mark.asyncio
+async def test_reads_go_round_robin_to_healthy_replicas(monkeypatch):
+    replicas = FakeReplicaSet([0.0, 0.5])
+    assert await replicas.check() == 2
+    client = _app(monkeypatch, replicas)
+
+    assert [client.get("/events").json()["engine"] for _ in range(4)] == ["replica0", "replica1"] * 2
+
+
+@pytest.mark.asyncio
+async def test_read_after_a_write_goes_to_the_primary(monkeypatch):
+    replicas = FakeReplicaSet([0.0])
+    await replicas.check()
+    client = _app(monkeypatch, replicas)
+
+    written = client.post("/bookings")
+    assert "Max-Age=5" in written.headers["set-cookie"]
+    assert client.get("/events").json()["engine"] == "primary"
+
+    # Once the cookie expires the client is back on the replica
+    client.cookies.clear()
+    assert client.get("/events").json()["engine"] == "replica0"
+
+
+def test_reads_and_failed_writes_do_not_pin(monkeypatch):
+    client = _app(monkeypatch, FakeReplicaSet([0.0]))
+
+    assert "set-cookie" not in client.get("/events").headers
+    assert "set-cookie" not in client.post("/missing").headers
+
+
+@pytest.mark.asyncio
+async def test_lagging_or_down_replicas_get_no_reads(monkeypatch):
+    replicas = FakeReplicaSet([6.0, OSError("connection refused"), 1.0], max_lag=5.0)
+    assert await replicas.check() == 1
+    client = _app(monkeypatch, replicas)
+
+    assert {client.get("/events").json()["engine"] for _ in range(3)} == {"replica2"}
+
+    # Caught up again: it rejoins on the next check
+    replicas.lags[0] = 0.0
+    await replicas.check()
+    assert {client.get("/events").json()["engine"] for _ in range(4)} == {"replica0", "replica2"}
+
+
+@pytest.mark.asyncio
+async def test_no_healthy_replica_falls_back_to_the_primary(monkeypatch):
+    replicas = FakeReplicaSet([60.0])
+    await replicas.check()
+    client = _app(monkeypatch, replicas)
+
+    assert client.get("/events").json()["engine"] == "primary"
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_report_replicas_without_creating_engines():
+    replicas = db.ReplicaSet(
+        ["postgresql://booking@replica0/booking_db", "postgresql://booking@replica1/booking_db"],
+        interval=60,
+        max_lag=5,
+        timeout=1,
+    )
+    assert replicas.pool_stats() == {}
+
+    replicas.engines()
+    try:
+        assert set(replicas.pool_stats()) == {"replica0", "replica1"}
+    finally:
+        await replicas.dispose()
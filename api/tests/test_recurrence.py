@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.resources.recurrence import InvalidRule, RecurrenceRule
+
+
+def _all(rule: str, dtstart: datetime, start: datetime, end: datetime):
+    return [occurrence for _, occurrence in RecurrenceRule.parse(rule).between(dtstart, start, end)]
+
+
+def test_month_day_that_never_occurs_ends_the_series():
+    # Every twelfth month from February is always February, which never has a 30th
+    dtstart, start, end = datetime(2025, 2, 1, 9), datetime(2025, 1, 1), datetime(2125, 1, 1)
+
+    assert _all("FREQ=MONTHLY;INTERVAL=12;BYMONTHDAY=30", dtstart, start, end) == []
+    assert _all("FREQ=MONTHLY;INTERVAL=12;BYMONTHDAY=30;COUNT=3", dtstart, start, end) == []
+
+
+def test_leap_day_only_series_still_recurs():
+    occurrences = _all(
+        "FREQ=MONTHLY;INTERVAL=12;BYMONTHDAY=29", datetime(2025, 2, 1, 9), datetime(2025, 1, 1), datetime(2037, 1, 1)
+    )
+
+    assert occurrences == [datetime(2028, 2, 29, 9), datetime(2032, 2, 29, 9), datetime(2036, 2, 29, 9)]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "",
+        "FREQ=YEARLY",
+        "FREQ=DAILY;INTERVAL=0",
+        "FREQ=DAILY;COUNT=0",
+        "FREQ=DAILY;COUNT=2;UNTIL=20261231",
+        "FREQ=DAILY;BYDAY=MO",
+        "FREQ=WEEKLY;BYDAY=XX",
+        "FREQ=WEEKLY;BYMONTHDAY=1",
+        "FREQ=MONTHLY;BYMONTHDAY=32",
+        "FREQ=MONTHLY;BYMONTHDAY=0",
+        "FREQ=DAILY;BYSETPOS=1",
+        "FREQ=DAILY;INTERVAL",
+        "FREQ=DAILY;INTERVAL=two",
+        "FREQ=DAILY;UNTIL=tomorrow",
+    ],
+)
+def test_parse_rejects(raw):
+    with pytest.raises(InvalidRule):
+        RecurrenceRule.parse(raw)
+
+
+def test_parse_accepts_rrule_prefix_and_lower_case():
+    rule = RecurrenceRule.parse("RRULE:freq=weekly;byday=fr,mo;interval=2")
+
+    assert (rule.freq, rule.interval, rule.by_day) == ("WEEKLY", 2, (0, 4))
+
+
+def test_weekly_ordinals_start_in_the_partial_first_week():
+    # 2026-10-14 is a Wednesday, so the first week only has Wednesday and Friday
+    dtstart = datetime(2026, 10, 14, 18)
+    rule = RecurrenceRule.parse("FREQ=WEEKLY;BYDAY=MO,WE,FR;COUNT=4")
+
+    assert list(rule.between(dtstart, dtstart, datetime(2027, 1, 1))) == [
+        (0, datetime(2026, 10, 14, 18)),
+        (1, datetime(2026, 10, 16, 18)),
+        (2, datetime(2026, 10, 19, 18)),
+        (3, datetime(2026, 10, 21, 18)),
+    ]
+
+
+def test_count_cuts_off_a_window_starting_after_the_last_occurrence():
+    dtstart = datetime(2026, 10, 14, 18)
+    rule = RecurrenceRule.parse("FREQ=WEEKLY;BYDAY=MO,WE,FR;COUNT=4")
+
+    assert list(rule.between(dtstart, datetime(2026, 10, 20), datetime(2027, 1, 1))) == [(3, datetime(2026, 10, 21, 18))]
+    assert list(rule.between(dtstart, datetime(2026, 10, 22), datetime(2027, 1, 1))) == []
+
+
+def test_until_is_inclusive_and_a_bare_date_covers_the_whole_day():
+    dtstart, end = datetime(2026, 10, 1, 9), datetime(2027, 1, 1)
+
+    assert _all("FREQ=DAILY;UNTIL=20261003T090000", dtstart, dtstart, end)[-1] == datetime(2026, 10, 3, 9)
+    assert _all("FREQ=DAILY;UNTIL=20261003", dtstart, dtstart, end)[-1] == datetime(2026, 10, 3, 9)
+    assert _all("FREQ=DAILY;UNTIL=20261003T085959Z", dtstart, dtstart, end)[-1] == datetime(2026, 10, 2, 9)
+
+
+def test_months_without_the_day_are_skipped():
+    occurrences = _all(
+        "FREQ=MONTHLY;BYMONTHDAY=31;COUNT=4", datetime(2026, 1, 31, 9), datetime(2026, 1, 1), datetime(2027, 1, 1)
+    )
+
+    assert occurrences == [
+        datetime(2026, 1, 31, 9), datetime(2026, 3, 31, 9), datetime(2026, 5, 31, 9), datetime(2026, 7, 31, 9)
+    ]
+
+
+def test_monthly_skips_days_before_dtstart_in_the_first_month():
+    occurrences = _all(
+        "FREQ=MONTHLY;BYMONTHDAY=1,15;COUNT=3", datetime(2026, 10, 10, 9), datetime(2026, 1, 1), datetime(2027, 1, 1)
+    )
+
+    assert occurrences == [datetime(2026, 10, 15, 9), datetime(2026, 11, 1, 9), datetime(2026, 11, 15, 9)]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        "FREQ=DAILY",
+        "FREQ=DAILY;INTERVAL=3",
+        "FREQ=DAILY;INTERVAL=5;COUNT=40",
+        "FREQ=WEEKLY",
+        "FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH,SU",
+        "FREQ=WEEKLY;INTERVAL=3;BYDAY=TU,SA;COUNT=25",
+        "FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=5,31",
+        "FREQ=MONTHLY;BYMONTHDAY=30;COUNT=15",
+    ],
+)
+@pytest.mark.parametrize("offset_days", [0, 1, 6, 17, 45, 200])
+def test_window_jump_matches_a_full_walk(raw, offset_days):
+    rule = RecurrenceRule.parse(raw)
+    dtstart = datetime(2026, 1, 14, 7, 30)
+    start = dtstart + timedelta(days=offset_days, hours=5)
+    end = start + timedelta(days=60)
+
+    walked = [occurrence for _, occurrence in rule.between(dtstart, dtstart, end) if occurrence >= start]
+
+    assert [occurrence for _, occurrence in rule.between(dtstart, start, end)] == walked
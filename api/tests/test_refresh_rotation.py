@@ -0,0 +1,110 @@
+import uuid
+from typing import Dict, Tuple
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from app.auth import deps, refresh
+from app.auth.principal import Principal
+from app.auth.ratelimit import limiter
+from app.auth.revocation import TokenDenylist
+from app.auth.security import create_refresh_token, decode_token
+from app.db import get_async_session
+
+
+class FakeSession:
+    async def commit(self) -> None:
+        pass
+
+
+class RevocationTable:
+    """Stands in for ``revoked_tokens``: an insert of an existing id reports a conflict."""
+
+    def __init__(self) -> None:
+        self.rows: Dict[str, Tuple[str, float]] = {}
+
+    async def revoke(self, session, revoked_id, *, kind, user_id, expires_at) -> bool:
+        if revoked_id in self.rows:
+            return False
+        self.rows[revoked_id] = (kind, expires_at)
+        return True
+
+
+@pytest.fixture
+def table(monkeypatch) -> RevocationTable:
+    table = RevocationTable()
+    monkeypatch.setattr(refresh, "revoke", table.revoke)
+    return table
+
+
+@pytest.fixture
+def denylist(monkeypatch) -> TokenDenylist:
+    denylist = TokenDenylist()
+    monkeypatch.setattr(refresh, "token_denylist", denylist)
+    monkeypatch.setattr(deps, "token_denylist", denylist)
+    return denylist
+
+
+@pytest.fixture
+def client(monkeypatch, jwt_settings, table, denylist) -> TestClient:
+    async def load_principal(session, user_id):
+        return Principal(id=user_id, email="ada@example.com", role="admin")
+
+    monkeypatch.setattr(refresh, "load_principal", load_principal)
+    monkeypatch.setattr(limiter, "enabled", False)
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.include_router(refresh.router)
+    app.dependency_overrides[get_async_session] = FakeSession
+    app.dependency_overrides[deps.get_jwt_settings] = lambda: jwt_settings
+    return TestClient(app)
+
+
+def _login(jwt_settings) -> str:
+    return create_refresh_token(jwt_settings, str(uuid.uuid4()), claims={"sid": str(uuid.uuid4())})
+
+
+def _refresh(client: TestClient, token: str):
+    return client.post("/auth/refresh", headers={"Cookie": f"refresh_token={token}"})
+
+
+async def _authenticate(jwt_settings, access_token: str) -> None:
+    await deps._authenticate(FakeSession(), jwt_settings, access_token)
+
+
+def test_rotation_issues_a_new_pair(client, jwt_settings):
+    old = _login(jwt_settings)
+    response = _refresh(client, old)
+    assert response.status_code == 200
+    assert response.cookies["refresh_token"] != old
+    access = decode_token(jwt_settings, response.cookies["access_token"])
+    # The same claims login issues, so PRINCIPAL_FROM_CLAIMS keeps working after a refresh
+    assert (access["email"], access["role"]) == ("ada@example.com", "admin")
+    assert access["sid"] == decode_token(jwt_settings, old)["sid"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("other_worker", [False, True])
+async def test_replayed_refresh_token_revokes_the_session(client, jwt_settings, denylist, other_worker):
+    old = _login(jwt_settings)
+    rotated = _refresh(client, old)
+    new_refresh, new_access = rotated.cookies["refresh_token"], rotated.cookies["access_token"]
+    if other_worker:
+        # The replay lands on a worker that hasn't synced the rotation yet; the table still has it
+        denylist._expires.clear()
+
+    replay = _refresh(client, old)
+    assert replay.status_code == 401
+    assert replay.json()["detail"] == "Refresh token reuse detected"
+
+    assert _refresh(client, new_refresh).status_code == 401
+    with pytest.raises(HTTPException) as rejected:
+        await _authenticate(jwt_settings, new_access)
+    assert rejected.value.detail == "Token revoked"
+
+
+def test_legacy_refresh_token_without_session_is_refused(client, jwt_settings):
+    legacy = create_refresh_token(jwt_settings, str(uuid.uuid4()))
+    assert _refresh(client, legacy).status_code == 401
+
@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from app.auth.revocation import RevocationSync, TokenDenylist
+
+
+@pytest.mark.asyncio
+async def test_sync_loop_survives_unexpected_errors(monkeypatch):
+    sync = RevocationSync(TokenDenylist(), interval=0.01, overlap=10, purge_interval=300, purge_batch=100)
+    calls = 0
+    synced_again = asyncio.Event()
+
+    async def fake_sync():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("driver bug")
+        synced_again.set()
+        return 0
+
+    monkeypatch.setattr(sync, "sync", fake_sync)
+    monkeypatch.setattr(sync, "purge", lambda: asyncio.sleep(0, result=0))
+    sync.start()
+    try:
+        await asyncio.wait_for(synced_again.wait(), 1)
+    finally:
+        await sync.stop()
@@ -0,0 +1,34 @@
+from datetime import datetime, timezone
+
+from app.resources.timezones import clock_for
+
+
+def test_nonexistent_local_time_moves_forward_across_the_gap():
+    clock = clock_for("America/New_York")
+
+    # 02:30 doesn't exist on 2026-03-08; the pre-gap offset (-05:00) puts it at 03:30 EDT
+    assert clock.to_utc(datetime(2026, 3, 8, 2, 30)) == datetime(2026, 3, 8, 7, 30, tzinfo=timezone.utc)
+    assert clock.to_local(datetime(2026, 3, 8, 7, 30, tzinfo=timezone.utc)) == datetime(2026, 3, 8, 3, 30)
+
+
+def test_ambiguous_local_time_takes_the_earlier_instant():
+    clock = clock_for("America/New_York")
+
+    # 01:30 happens twice on 2026-11-01; the first is still EDT (-04:00)
+    assert clock.to_utc(datetime(2026, 11, 1, 1, 30)) == datetime(2026, 11, 1, 5, 30, tzinfo=timezone.utc)
+    assert clock.to_utc(datetime(2026, 11, 1, 2, 30)) == datetime(2026, 11, 1, 7, 30, tzinfo=timezone.utc)
+
+
+def test_cached_offsets_do_not_leak_across_a_transition():
+    clock = clock_for("Europe/Berlin")
+
+    assert clock.to_utc(datetime(2026, 3, 29, 1, 50)) == datetime(2026, 3, 29, 0, 50, tzinfo=timezone.utc)
+    assert clock.to_utc(datetime(2026, 3, 29, 1, 59)) == datetime(2026, 3, 29, 0, 59, tzinfo=timezone.utc)
+    assert clock.to_utc(datetime(2026, 3, 29, 3, 0)) == datetime(2026, 3, 29, 1, 0, tzinfo=timezone.utc)
+    assert clock.to_utc(datetime(2026, 3, 29, 3, 10)) == datetime(2026, 3, 29, 1, 10, tzinfo=timezone.utc)
+
+
+def test_unknown_zone_falls_back_to_utc():
+    assert clock_for("Mars/Olympus_Mons").name == "UTC"
+    assert clock_for("").name == clock_for(None).name == "UTC"
+    assert clock_for("Nowhere").to_utc(datetime(2026, 6, 1, 12)) == datetime(2026, 6, 1, 12, tzinfo=timezone.utc)
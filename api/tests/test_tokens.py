@@ -0,0 +1,69 @@
+import hashlib
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.auth.principal import Principal, PrincipalCache
+from app.auth.security import JWT_BACKENDS, JWTSettings, _create_token, create_access_token, decode_token
+from app.cache import InMemoryBackend
+
+
+def _cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+@pytest.mark.parametrize("backend", sorted(JWT_BACKENDS))
+def test_token_signed_with_a_previous_kid_still_verifies(backend):
+    old = JWTSettings(secret_key="old-secret", kid="2025", backend=backend)
+    token = create_access_token(old, "user-1")
+    rotated = JWTSettings(secret_key="new-secret", kid="2026", verification_keys={"2025": "old-secret"}, backend=backend)
+
+    assert decode_token(rotated, token)["sub"] == "user-1"
+    assert decode_token(rotated, create_access_token(rotated, "user-2"))["sub"] == "user-2"
+
+
+@pytest.mark.parametrize("backend", sorted(JWT_BACKENDS))
+def test_token_with_an_unknown_kid_is_rejected(backend):
+    retired = JWTSettings(secret_key="old-secret", kid="2024", backend=backend)
+    current = JWTSettings(secret_key="new-secret", kid="2026", verification_keys={"2025": "other"}, backend=backend)
+
+    assert decode_token(current, create_access_token(retired, "user-1")) is None
+
+
+def test_backends_are_interchangeable():
+    jose, pyjwt = (JWTSettings(secret_key="secret", backend=name) for name in ("jose", "pyjwt"))
+
+    assert decode_token(pyjwt, create_access_token(jose, "user-1"))["sub"] == "user-1"
+    assert decode_token(jose, create_access_token(pyjwt, "user-2"))["sub"] == "user-2"
+
+
+def test_verified_token_is_cached_no_longer_than_its_exp(jwt_settings, monkeypatch):
+    token = _create_token(jwt_settings, "user-1", timedelta(seconds=30), "access")
+    assert decode_token(jwt_settings, token)["sub"] == "user-1"
+    assert jwt_settings.token_cache.get(_cache_key(token)) is not None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+    assert jwt_settings.token_cache.get(_cache_key(token)) is None
+
+
+def test_cache_does_not_mask_a_bad_signature(jwt_settings):
+    token = create_access_token(jwt_settings, "user-1")
+    decode_token(jwt_settings, token)
+    header, payload, signature = token.split(".")
+
+    assert decode_token(jwt_settings, f"{header}.{payload}.{signature[::-1]}") is None
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_is_seen_by_other_workers_until_invalidated():
+    shared = InMemoryBackend()
+    first, second = (PrincipalCache(local_ttl=30, local_maxsize=10, shared=shared) for _ in range(2))
+    await first.set(Principal(id="user-1", email="ada@example.com", role="user"))
+
+    assert (await second.get("user-1")).email == "ada@example.com"
+    assert second.stats()["shared_hits"] == 1
+
+    await second.invalidate("user-1")
+    assert await PrincipalCache(local_ttl=30, local_maxsize=10, shared=shared).get("user-1") is None
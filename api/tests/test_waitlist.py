@@ -0,0 +1,91 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app.bookings.service import cancel_booking, reserve_seats
+from app.waitlist import service
+
+
+class Result:
+    def __init__(self, value=None):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+    def all(self):
+        return []
+
+
+class RecordingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(statement)
+        return Result(1 if statement is service._JOIN_SQL else None)
+
+
+@pytest.mark.asyncio
+async def test_join_takes_the_event_lock_before_inserting():
+    session = RecordingSession()
+
+    entry = await service.join_waitlist(session, event_id=uuid.uuid4(), user_id=uuid.uuid4(), seats=2)
+
+    assert entry["position"] == 1
+    assert session.statements.index(service._LOCK_EVENTS_SQL) < session.statements.index(service._JOIN_SQL)
+
+
+async def _user(session):
+    user_id = uuid.uuid4()
+    await session.execute(
+        text("INSERT INTO users (id, email, password_hash, role) VALUES (:id, :email, 'x', 'user')"),
+        {"id": user_id, "email": f"test-{user_id}@example.com"},
+    )
+    return user_id
+
+
+@pytest.mark.asyncio
+async def test_cancel_promotes_the_head_of_the_queue_in_order(db_session, make_event):
+    owner_id, event_id = await make_event(capacity=5)
+    await reserve_seats(db_session, event_id=event_id, user_id=owner_id, seats=2)
+    freed_id = await reserve_seats(db_session, event_id=event_id, user_id=owner_id, seats=3)
+    waiting = [await _user(db_session) for _ in range(4)]
+    entries = []
+    for user_id, seats in zip(waiting, (2, 2, 1, 1)):
+        entry = await service.join_waitlist(db_session, event_id=event_id, user_id=user_id, seats=seats)
+        assert entry["bookings"] == []
+        entries.append(entry["id"])
+
+    await cancel_booking(db_session, booking_id=freed_id, user_id=owner_id)
+    promoted = await service.promote_waitlist(db_session, [event_id])
+
+    # Three seats: the first entry is filled, the second gets what's left and keeps its place
+    assert [(row["entry_id"], row["user_id"], row["seats"]) for row in promoted] == [
+        (entries[0], waiting[0], 2),
+        (entries[1], waiting[1], 1),
+    ]
+    rows = (
+        await db_session.execute(
+            text("SELECT id, status, seats_remaining FROM waitlist_entries WHERE event_id = :id"), {"id": event_id}
+        )
+    ).all()
+    assert {row.id: (row.status, row.seats_remaining) for row in rows} == {
+        entries[0]: ("fulfilled", 0),
+        entries[1]: ("waiting", 1),
+        entries[2]: ("waiting", 1),
+        entries[3]: ("waiting", 1),
+    }
+    booked = (
+        await db_session.execute(
+            text("SELECT user_id, seats FROM bookings WHERE event_id = :id AND status = 'active' AND user_id <> :owner"),
+            {"id": event_id, "owner": owner_id},
+        )
+    ).all()
+    assert sorted((row.user_id, row.seats) for row in booked) == sorted([(waiting[0], 2), (waiting[1], 1)])
+    seats_booked = await db_session.execute(text("SELECT seats_booked FROM events WHERE id = :id"), {"id": event_id})
+    assert seats_booked.scalar_one() == 5
+
+    # Nothing left to give: promoting again is a no-op
+    assert await service.promote_waitlist(db_session, [event_id]) == []
@@ -24,6 +24,21 @@ export const PaginatedResponseSchema = z.object({
   pagination: PaginationSchema,
 })
 
+// Keyset pagination: pass next_cursor back as ?cursor= until it is null
+export const CursorPaginationSchema = z.object({
+  limit: z.number().positive().max(100),
+  next_cursor: z.string().nullable(),
+  total: z.number().nonnegative().optional(),
+  total_is_estimate: z.boolean().optional(),
+})
+
+export const CursorPaginatedResponseSchema = z.object({
+  data: z.array(z.any()),
+  pagination: CursorPaginationSchema,
+})
+
 export type ApiResponse = z.infer<typeof ApiResponseSchema>
 export type Pagination = z.infer<typeof PaginationSchema>
 export type PaginatedResponse = z.infer<typeof PaginatedResponseSchema>
+export type CursorPagination = z.infer<typeof CursorPaginationSchema>
+export type CursorPaginatedResponse = z.infer<typeof CursorPaginatedResponseSchema>